@@ -1,16 +1,27 @@
 import streamlit as st
 import pandas as pd
-from io import BytesIO
-import zipfile
 import os
+import tempfile
+import uuid
+from pathlib import Path
 from dotenv import load_dotenv
 
 # ===== 모듈 import =====
-from modules.loader import load_uploaded_files
-from modules.quality_checker import summarize_dataframe
-from modules.ai_agent import init_azure_client, run_ai_report, run_data_processing
-from modules.cleaner import preprocess_dataframe
+from modules.loader import STREAM_CHUNK_ROWS, load_uploaded_files, read_csv_head, split_large_uploads
+from modules.parse_cache import hash_stream, parse_cache
+from modules.quality_checker import summarize_csv_stream, summarize_dataframe
+from modules.relation_finder import discover_relations
+from modules.ai_agent import init_async_azure_client, init_azure_client, run_ai_report, run_data_processing
+from modules.async_report import run_ai_report_async
+from modules.llm_cache import llm_cache
+from modules.sandbox import get_sandbox_pool
+from modules.batch_cleaner import clean_tables
+from modules.chunked_cleaner import clean_csv_chunked
 from modules.blob_uploader import upload_to_azure_blob
+from modules.exporters import EXPORT_FORMATS
+from modules.export_archive import open_export_archive
+from modules.table_store import TableStore, global_store_stats
+from modules.table_history import TableHistory
 
 # ===== 환경 설정 =====
 load_dotenv()
@@ -28,6 +39,8 @@ for key, default in {
     "qa_history": [],
     "ai_history": [],
     "cleaned_results": None,
+    "table_history": {},
+    "streamed_results": {},
     "uploaded_file_names": [],
 }.items():
     if key not in st.session_state:
@@ -38,13 +51,14 @@ client = init_azure_client()
 
 # ===== 1️⃣ 파일 업로드 =====
 uploaded_files = st.file_uploader(
-    "📦 CSV / XLSX / TXT / XML / JSON / ZIP 업로드",
-    type=["csv", "xlsx", "txt", "xml", "json", "zip"],
+    "📦 CSV / XLSX / TXT / XML / JSON(NDJSON) / ZIP 업로드",
+    type=["csv", "xlsx", "txt", "xml", "json", "jsonl", "ndjson", "zip"],
     accept_multiple_files=True,
     key="file_uploader_main"
 )
 
 dfs = {}
+large_files = {}  # 대용량 CSV/TXT: 파일명 → 업로드 파일 (DataFrame으로 올리지 않고 청크 단위 처리)
 
 if uploaded_files:
     current_file_names = [f.name for f in uploaded_files]
@@ -53,26 +67,68 @@ if uploaded_files:
         st.session_state["preload_quality_report"] = None
         st.session_state["qa_history"] = []
 
-    dfs = load_uploaded_files(uploaded_files)
-    st.success(f"✅ 총 {len(dfs)}개의 데이터셋 로드 완료")
+    regular_files, large_files = split_large_uploads(uploaded_files)
+    dfs = load_uploaded_files(regular_files)
+    st.success(f"✅ 총 {len(dfs) + len(large_files)}개의 데이터셋 로드 완료")
+    if large_files:
+        st.info(
+            f"🌊 대용량 파일 {len(large_files)}개({', '.join(large_files)})는 메모리에 올리지 않고 "
+            f"{STREAM_CHUNK_ROWS:,}행 단위 청크로 요약·전처리합니다."
+        )
+    cache_stats = parse_cache.stats()
+    st.caption(
+        f"🗃️ 파싱 캐시: hit {cache_stats['hits']} / miss {cache_stats['misses']} "
+        f"(적중률 {cache_stats['hit_rate']:.0%}, {cache_stats['bytes'] / 1024 ** 2:.1f}MB 사용)"
+    )
 
     st.markdown("### 📊 업로드된 데이터 미리보기")
     for name, df in dfs.items():
         with st.expander(f"🔍 {name} 미리보기"):
             st.dataframe(df.head(), width="stretch")
+    for name, file in large_files.items():
+        with st.expander(f"🔍 {name} 미리보기 (청크 스트리밍)"):
+            st.dataframe(read_csv_head(file), width="stretch")  # 앞부분만 파싱
 
 # ===== 2️⃣ 품질 점검 리포트 + Q&A =====
-if dfs:
+if dfs or large_files:
     st.markdown("---")
     st.subheader("🧠 데이터 품질 점검 보고서")
 
     table_summaries = {name: summarize_dataframe(df, name) for name, df in dfs.items()}
+    for name, file in large_files.items():
+        table_summaries[name] = summarize_csv_stream(file, name, hash_stream(file))
+    relations = discover_relations(dfs)  # 대용량 파일은 PK/FK 탐색 대상에서 제외
+
+    if relations:
+        with st.expander(f"🔗 PK/FK 후보 {len(relations)}건"):
+            st.dataframe(pd.DataFrame(relations), width="stretch")
+
+    per_table_report = st.checkbox(
+        "테이블별 동시 생성 (실시간 스트리밍)", value=len(table_summaries) > 1,
+        help="테이블마다 보고서 요청을 동시에 보내고 도착하는 내용을 바로 표시한 뒤 7개 섹션으로 합칩니다."
+    )
 
     if st.button("보고서 생성하기"):
-        with st.spinner("AI가 데이터 품질 점검 중입니다..."):
-            ai_report = run_ai_report(client, table_summaries)
+        if per_table_report:
+            live = {name: st.empty() for name in table_summaries}
+
+            def show_partial(name, text, done):
+                live[name].markdown(f"{'✅' if done else '⏳'} **{name}**\n\n{text}")
+
+            ai_report = run_ai_report_async(init_async_azure_client, table_summaries, relations, show_partial)
+            for placeholder in live.values():
+                placeholder.empty()
             st.session_state["preload_quality_report"] = ai_report
+        else:
+            with st.spinner("AI가 데이터 품질 점검 중입니다..."):
+                ai_report = run_ai_report(client, table_summaries, relations)
+                st.session_state["preload_quality_report"] = ai_report
         st.success("✅ 품질 점검 리포트가 생성되었습니다.")
+        llm_stats = llm_cache.stats()
+        st.caption(
+            f"🧠 AI 응답 캐시: hit {llm_stats['hits']} / miss {llm_stats['misses']} "
+            f"(적중률 {llm_stats['hit_rate']:.0%}, 병합 {llm_stats['merged']}건, {llm_stats['entries']}개 보관)"
+        )
 
     if st.session_state["preload_quality_report"]:
         st.markdown(st.session_state["preload_quality_report"])
@@ -94,14 +150,20 @@ mode = st.radio(
     index=0
 )
 
-if dfs:
+if dfs or large_files:
     target_table_name = None
     if mode == "선택한 파일만 처리":
-        target_table_name = st.multiselect("전처리할 파일 선택", list(dfs.keys()))
+        target_table_name = st.multiselect("전처리할 파일 선택", list(dfs.keys()) + list(large_files))
 
     st.markdown("#### 전처리 옵션 선택")
     fillna_opt = st.checkbox("fillna_zero : 결측치 값 채우기", value=False)
     dropdup_opt = st.checkbox("drop_duplicates : 중복행 제거", value=False)
+    dedup_keep, dedup_mode = "first", "exact"
+    if dropdup_opt:
+        keep_label = st.selectbox("중복 중 남길 행", ["첫 번째 행", "마지막 행", "모두 제거"], index=0)
+        dedup_keep = {"첫 번째 행": "first", "마지막 행": "last", "모두 제거": False}[keep_label]
+        mode_label = st.selectbox("중복 판정 방식", ["정확히 같은 행", "근사 중복 (MinHash)"], index=0)
+        dedup_mode = "near" if mode_label.startswith("근사") else "exact"
     strip_opt = st.checkbox("strip_strings : 문자열 앞뒤 공백 제거", value=False)
     case_norm = st.selectbox("문자열 대소문자 정규화", ["변경 안 함", "소문자로 통일", "대문자로 통일"], index=0)
     convert_dates_opt = st.checkbox("convert_dates : 문자열 날짜 → datetime 변환", value=False)
@@ -118,6 +180,8 @@ if dfs:
         base_opts = {
             "fillna_zero": fillna_opt,
             "drop_duplicates": dropdup_opt,
+            "dedup_keep": dedup_keep,
+            "dedup_mode": dedup_mode,
             "strip_strings": strip_opt,
             "normalize_case": normalize_case_val,
             "convert_dates": convert_dates_opt,
@@ -125,42 +189,57 @@ if dfs:
             "drop_empty_cols": drop_empty_cols_opt,
         }
 
-        results_summary = []
-        cleaned_results = {}
-        targets = target_table_name if mode == "선택한 파일만 처리" else list(dfs.keys())
-
-        for t in targets:
-            before = dfs[t].copy()
-            after = preprocess_dataframe(before, base_opts)
-            cleaned_results[t] = after
-
-            changed_types = []
-            dtypes_before = before.dtypes.astype(str).to_dict()
-            dtypes_after = after.dtypes.astype(str).to_dict()
-            for col in after.columns:
-                if dtypes_before.get(col) != dtypes_after.get(col):
-                    changed_types.append(f"{col}: {dtypes_before.get(col)} -> {dtypes_after.get(col)}")
-
-            results_summary.append({
-                "table": t,
-                "rows_before": len(before),
-                "rows_after": len(after),
-                "nulls_before": int(before.isna().sum().sum()),
-                "nulls_after": int(after.isna().sum().sum()),
-                "changed_types": changed_types
-            })
-
-        st.session_state["cleaned_results"] = cleaned_results
+        targets = target_table_name if mode == "선택한 파일만 처리" else list(dfs.keys()) + list(large_files)
+        stream_targets = [t for t in targets if t in large_files]
+
+        # 대용량 CSV/TXT는 메모리에 올리지 않고 2패스 청크 전처리 → 결과 CSV를 임시 파일에 기록
+        for old in st.session_state["streamed_results"].values():
+            if os.path.exists(old["path"]):
+                os.remove(old["path"])
+        streamed_results = {}
+        if stream_targets and dropdup_opt and (dedup_keep != "first" or dedup_mode != "exact"):
+            st.warning("🌊 대용량 파일은 '정확히 같은 행 / 첫 번째 행 유지' 방식으로만 중복을 제거합니다.")
+        for t in stream_targets:
+            stream_status = st.empty()
+            dest = os.path.join(tempfile.gettempdir(), f"dq_streamed_{uuid.uuid4().hex}.csv")
+            streamed_results[t] = clean_csv_chunked(
+                large_files[t], dest, base_opts,
+                on_progress=lambda step, rows, t=t: stream_status.caption(f"🌊 {t} {step}차 패스: {rows:,}행 처리"),
+            )
+            streamed_results[t]["path"] = dest
+            stream_status.empty()
+        st.session_state["streamed_results"] = streamed_results
+
+        # 테이블 여러 개는 프로세스 풀에서 병렬 처리 (요약 지표도 워커에서 계산)
+        progress = st.progress(0.0, text="전처리 준비 중...")
+        cleaned_results, results_summary = clean_tables(
+            {t: dfs[t] for t in targets if t in dfs},
+            base_opts,
+            on_progress=lambda done, total, t: progress.progress(done / total, text=f"✅ {t} 완료 ({done}/{total})"),
+            notify=st.info,
+        )
+
+        # 세션 메모리 한도를 넘는 테이블은 디스크로 내려가고 접근 시 자동 복원
+        st.session_state["cleaned_results"] = TableStore(cleaned_results)
+        st.session_state["table_history"] = {}
         st.session_state["results_summary"] = results_summary
         st.success("✅ 전처리 완료! AI 기반 추가 전처리를 이어서 수행할 수 있습니다.")
 
 # ===== 전처리 결과 표시 =====
 if st.session_state.get("cleaned_results") and st.session_state.get("results_summary"):
     st.markdown("### 📊 전처리 결과 미리보기")
+    cleaned_store = st.session_state["cleaned_results"]
+    store_stats, global_stats = cleaned_store.stats(), global_store_stats()
+    st.caption(
+        f"💾 테이블 저장소: 메모리 {store_stats['resident']}개 ({store_stats['resident_bytes'] / 1024 ** 2:.1f}MB"
+        f" / 세션 한도 {store_stats['session_budget'] / 1024 ** 2:.0f}MB, 버전 기록 {store_stats['history_bytes'] / 1024 ** 2:.1f}MB 포함)"
+        f", 디스크 {store_stats['spilled']}개"
+        f" · 전체 세션 {global_stats['resident_bytes'] / 1024 ** 2:.1f}MB / {global_stats['global_budget'] / 1024 ** 2:.0f}MB"
+    )
 
     for s in st.session_state["results_summary"]:
         table_name = s["table"]
-        if table_name not in dfs or table_name not in st.session_state["cleaned_results"]:
+        if table_name not in dfs or table_name not in cleaned_store:
             continue
 
         st.markdown(f"#### ▶ {table_name} 처리 결과")
@@ -170,25 +249,55 @@ if st.session_state.get("cleaned_results") and st.session_state.get("results_sum
             st.dataframe(dfs[table_name].head(), width="stretch")
         with colR:
             st.markdown("**후(after)**")
-            st.dataframe(st.session_state["cleaned_results"][table_name].head(), width="stretch")
-
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for name, df in st.session_state["cleaned_results"].items():
-            csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
-            zf.writestr(f"processed_{name.replace('/', '_')}.csv", csv_bytes)
-    zip_buffer.seek(0)
+            st.dataframe(cleaned_store.head(table_name), width="stretch")  # 디스크에 있으면 앞부분만 읽음
+
+        cleaned_attrs = cleaned_store.attrs(table_name)
+        if cleaned_attrs.get("clean_plan"):
+            with st.expander(f"🧭 {table_name} 전처리 실행 계획 / 단계별 소요 시간"):
+                st.text(cleaned_attrs["clean_plan"])
+                st.json(cleaned_attrs.get("clean_timings", {}))
+        if cleaned_attrs.get("duplicate_report", {}).get("cluster_count"):
+            with st.expander(f"🧬 {table_name} 중복 행 클러스터"):
+                st.json(cleaned_attrs["duplicate_report"])
+
+    export_fmt = st.selectbox(
+        "📦 다운로드 형식", list(EXPORT_FORMATS), index=0,
+        format_func=lambda f: EXPORT_FORMATS[f].label, key="zip_export_format",
+        help="Parquet/Arrow는 정제된 dtype을 그대로 보존하고 CSV보다 작고 빠릅니다."
+    )
+    # ZIP은 다운로드 클릭 시에만 (별도 스레드에서) 만들고, 테이블 지문이 같으면 캐시된 결과 재사용
     st.download_button(
         label="📥 데이터 ZIP 다운로드",
-        data=zip_buffer,
+        data=lambda: open_export_archive(cleaned_store, export_fmt),  # 디스크에 있는 테이블은 다시 올리지 않고 하나씩 읽음
         file_name="processed_datasets.zip",
         mime="application/zip"
     )
 
+# ===== 대용량 파일 전처리 결과 (청크 스트리밍) =====
+for name, result in st.session_state["streamed_results"].items():
+    if name not in large_files or not os.path.exists(result["path"]):
+        continue
+    st.markdown(f"#### ▶ {name} 처리 결과 (청크 스트리밍)")
+    st.caption(
+        f"행 {result['rows_in']:,} → {result['rows_out']:,} (중복 {result['duplicates_removed']:,}건 제거)"
+        + (f" · 삭제 컬럼: {', '.join(result['dropped_columns'])}" if result["dropped_columns"] else "")
+    )
+    st.dataframe(pd.read_csv(result["path"], nrows=5), width="stretch")  # 결과 파일 앞부분만 읽음
+    with st.expander(f"🧭 {name} 컬럼별 처리 방식 / 패스별 소요 시간"):
+        st.json({"column_kinds": result["column_kinds"], "timings": result["timings"]})
+    st.download_button(
+        label=f"📥 {name} 전처리 결과 CSV 다운로드",
+        data=lambda path=result["path"]: Path(path).read_bytes(),
+        file_name=f"processed_{os.path.splitext(name)[0]}.csv",
+        mime="text/csv",
+        key=f"streamed_download_{name}",
+    )
+
 # ===== 4️⃣ AI 명령 기반 추가 전처리 =====
 if st.session_state.get("cleaned_results"):
     st.markdown("---")
     st.subheader("🤖 AI 명령 기반 후속 전처리")
+    get_sandbox_pool()  # 명령 입력 전에 실행 워커를 미리 기동 (프로세스 전역, 한 번만)
 
     for user_q, ai_a in st.session_state["ai_history"]:
         with st.chat_message("user"):
@@ -202,7 +311,7 @@ if st.session_state.get("cleaned_results"):
         ai_submitted = st.form_submit_button("명령 실행")
 
     if ai_submitted and ai_command:
-        df_before = st.session_state["cleaned_results"][ai_target].copy()
+        df_before = st.session_state["cleaned_results"][ai_target]  # 샌드박스가 복사본에서 실행하므로 원본 유지
 
         with st.chat_message("user"):
             st.markdown(f"**{ai_command}**")
@@ -213,6 +322,12 @@ if st.session_state.get("cleaned_results"):
         st.session_state["ai_history"].append((ai_command, status))
 
         if isinstance(processed_df, pd.DataFrame):
+            histories = st.session_state["table_history"]
+            if ai_target not in histories:
+                histories[ai_target] = TableHistory(df_before)
+                st.session_state["cleaned_results"].attach_history(ai_target, histories[ai_target])  # 기록도 메모리 한도에 포함
+            # 바뀐 컬럼만 새로 보관하고 나머지 컬럼은 이전 버전과 버퍼 공유
+            processed_df = histories[ai_target].commit(processed_df, ai_command)
             st.session_state["cleaned_results"][ai_target] = processed_df
             with st.chat_message("assistant"):
                 st.success(status)
@@ -228,23 +343,55 @@ if st.session_state.get("cleaned_results"):
                 st.dataframe(processed_df.head(), width="stretch")
         else:
             with st.chat_message("assistant"):
-                st.warning(processed_df)
+                st.warning(status)
+
+    # 명령 단계별 버전 기록: 실행 취소 / 다시 실행 / 임의 버전 이동
+    if st.session_state["table_history"]:
+        st.markdown("#### 🕰️ 명령 단계별 버전")
+        histories = st.session_state["table_history"]
+        history_target = st.selectbox("버전 기록 테이블", list(histories))
+        history = histories[history_target]
+        versions, history_stats = history.versions(), history.stats()
+        st.caption(
+            f"버전 {history_stats['versions']}개 · 보관 {history_stats['stored_bytes'] / 1024 ** 2:.1f}MB"
+            f" (버전마다 전체 복사 시 {history_stats['full_copy_bytes'] / 1024 ** 2:.1f}MB)"
+        )
+        picked = st.selectbox(
+            "버전 선택", range(len(versions)), index=history.cursor,
+            format_func=lambda i: f"{'✅ ' if i == history.cursor else ''}v{i} {versions[i].label} — {versions[i].summary()}",
+        )
+        col_undo, col_redo, col_goto = st.columns(3)
+        moved = None
+        if col_undo.button("↩️ 실행 취소", disabled=not history.can_undo):
+            moved = history.undo()
+        if col_redo.button("↪️ 다시 실행", disabled=not history.can_redo):
+            moved = history.redo()
+        if col_goto.button("📌 이 버전으로 이동", disabled=picked == history.cursor):
+            moved = history.checkout(picked)
+        if moved is not None:
+            st.session_state["cleaned_results"][history_target] = moved
+            st.rerun()
 
 # ☁️ Azure Blob Storage 업로드
 st.markdown("### ☁️ Azure Blob Storage 업로드")
 
-if st.session_state.get("cleaned_results") and isinstance(st.session_state["cleaned_results"], dict):
+if st.session_state.get("cleaned_results") and isinstance(st.session_state["cleaned_results"], (dict, TableStore)):
     st.info("✅ 전처리 완료 데이터가 있습니다. 업로드할 파일을 선택하세요.")
 
     available_files = list(st.session_state["cleaned_results"].keys())
     selected_files = st.multiselect("📂 업로드할 파일 선택", available_files)
+    upload_fmt = st.selectbox(
+        "업로드 형식", list(EXPORT_FORMATS), index=0,
+        format_func=lambda f: EXPORT_FORMATS[f].label, key="blob_export_format"
+    )
 
     if st.button("🚀 선택한 파일 업로드"):
         with st.spinner("Azure Blob Storage 업로드 중..."):
             upload_to_azure_blob(
                 cleaned_results=st.session_state["cleaned_results"],
                 selected_files=selected_files,
-                container_name=os.getenv("AZURE_CONTAINER_NAME", "raw-data")
+                container_name=os.getenv("AZURE_CONTAINER_NAME", "raw-data"),
+                fmt=upload_fmt
             )
 else:
     st.info("⚠️ 아직 전처리된 결과가 없습니다. 전처리 후 업로드를 진행해주세요.")
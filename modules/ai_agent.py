@@ -1,8 +1,12 @@
 # modules/ai_agent.py
 import os
 import json
+import pandas as pd
 import streamlit as st
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
+from modules.llm_cache import cached_completion, discard_completion
+from modules.report_payload import build_report_payload
+from modules.sandbox import run_in_sandbox
 
 # ==============================
 # ✅ Azure 클라이언트 초기화
@@ -27,6 +31,27 @@ def init_azure_client():
         return None
 
 
+def init_async_azure_client():
+    """비동기 클라이언트 (이벤트 루프마다 새로 만들고 사용 후 close)"""
+    try:
+        api_key = os.getenv("AZURE_OPENAI_API_KEY")
+        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+        api_version = os.getenv("OPENAI_API_VERSION")
+
+        if not all([api_key, endpoint, api_version]):
+            raise ValueError("환경 변수(AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT, OPENAI_API_VERSION)가 누락되었습니다.")
+
+        return AsyncAzureOpenAI(
+            api_key=api_key,
+            azure_endpoint=endpoint,
+            api_version=api_version
+        )
+
+    except Exception as e:
+        st.error(f"❌ AsyncAzureOpenAI 초기화 실패: {e}")
+        return None
+
+
 # ==============================
 # ✅ 품질 점검 보고서 생성
 # ==============================
@@ -45,7 +70,10 @@ def run_ai_report(client, summaries, relations=None):
         "다음 형식을 반드시 따르라:\n"
         "- 섹션 제목은 굵게(**) 표시하라. 예: **1. 데이터 개요**\n"
         "- 각 섹션은 순서대로 작성하라.\n"
-        "- Markdown의 # 헤더는 사용하지 마라.\n\n"
+        "- Markdown의 # 헤더는 사용하지 마라.\n"
+        "- 요약은 이상 컬럼(anomalous_columns) 위주로 압축되어 있으며, 정상 컬럼은 개수와 타입 분포(healthy_columns)로만 제공된다.\n"
+        "- omitted 또는 tables_overview_only 항목이 있으면 일부 정보가 생략되었음을 데이터 개요에서 한 문장으로 밝혀라.\n"
+        "- duplicates.removed_rows_range는 근사 추정 구간이다. 하한이 0이면 중복이 있다고 단정하지 말고, 수치는 구간으로만 말하라.\n\n"
 
         "섹션 구성:\n"
         "1. 데이터 개요 — 파일의 기본 특성, 크기, 주요 컬럼 요약.\n"
@@ -72,10 +100,8 @@ def run_ai_report(client, summaries, relations=None):
     )
 
 
-    payload = {
-        "table_summaries": summaries,
-        "relations": relations or []
-    }
+    # 토큰 예산(AI_REPORT_TOKEN_BUDGET) 안으로 요약 압축 (생략 내역은 payload["omitted"]에 포함)
+    payload, _ = build_report_payload(summaries, relations)
 
     messages = [
         {"role": "system", "content": system_prompt},
@@ -83,13 +109,15 @@ def run_ai_report(client, summaries, relations=None):
     ]
 
     try:
-        resp = client.chat.completions.create(
-            model=os.getenv("DEPLOYMENT_NAME"),
-            messages=messages,
+        # 같은 요약/관계 + 프롬프트 + 파라미터면 캐시된 보고서 재사용
+        report, _ = cached_completion(
+            client,
+            os.getenv("DEPLOYMENT_NAME"),
+            messages,
             temperature=0.5,
             max_completion_tokens=1800
         )
-        return resp.choices[0].message.content.strip()
+        return report
     except Exception as e:
         st.error(f"❌ AI 보고서 생성 실패: {e}")
         return "⚠️ AI 품질 보고서 생성 중 오류가 발생했습니다."
@@ -101,9 +129,10 @@ def run_ai_report(client, summaries, relations=None):
 def run_data_processing(client, dataframe, user_command):
     """
     자연어 명령을 받아, 구체적인 pandas 전처리 코드를 생성하고 실행함.
+    → (상태 메시지, 결과 DataFrame). 실패하면 결과는 None (호출 측은 성공한 결과만 버전 기록에 남김)
     """
     if not client:
-        return "⚠️ Azure OpenAI 클라이언트가 초기화되지 않았습니다.", dataframe
+        return "⚠️ Azure OpenAI 클라이언트가 초기화되지 않았습니다.", None
 
     system_prompt = (
         "You are a senior data engineer. "
@@ -128,22 +157,25 @@ def run_data_processing(client, dataframe, user_command):
         {"role": "user", "content": f"데이터프레임 구조: {schema_info}\n\n사용자 명령: {user_command}"}
     ]
 
+    model = os.getenv("DEPLOYMENT_NAME")
+    params = {"temperature": 0.4, "max_completion_tokens": 600}
     try:
-        resp = client.chat.completions.create(
-            model=os.getenv("DEPLOYMENT_NAME"),
-            messages=messages,
-            temperature=0.4,
-            max_completion_tokens=600
-        )
-
-        code = resp.choices[0].message.content.strip()
-        local_vars = {"df": dataframe.copy()}
-        exec(code, {}, local_vars)
-        new_df = local_vars["df"]
-
-        return "✅ 데이터 전처리 성공", new_df
+        # 같은 스키마 + 명령이면 캐시된 코드 재사용 (실행은 매번 현재 데이터로 수행)
+        code, _ = cached_completion(client, model, messages, **params)
+        # 생성 코드는 자원 제한된 별도 워커 프로세스에서 실행 (원본 프레임은 건드리지 않음)
+        result = run_in_sandbox(code, dataframe)
+        if not result.ok:
+            # 실패한 코드는 캐시에서 지워 같은 명령을 다시 보내면 새로 생성
+            discard_completion(model, messages, **params)
+            st.error(f"❌ 데이터 전처리 실패 ({result.status}): {result.message}")
+            return f"⚠️ 데이터 전처리 중 오류가 발생했습니다. ({result.status})", None
+
+        new_df = result.dataframe
+        new_df.attrs.pop("source_key", None)  # 가공된 결과는 원본 파일과 내용이 다름
+        return f"✅ 데이터 전처리 성공 ({result.elapsed:.2f}초)", new_df
 
     except Exception as e:
+        discard_completion(model, messages, **params)
         st.error(f"❌ 데이터 전처리 실패: {e}")
-        return "⚠️ 데이터 전처리 중 오류가 발생했습니다.", dataframe
+        return "⚠️ 데이터 전처리 중 오류가 발생했습니다.", None
 
@@ -0,0 +1,200 @@
+# modules/async_report.py
+import os
+import re
+import json
+import time
+import asyncio
+from typing import Callable
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from modules.llm_cache import llm_cache, make_request_key
+from modules.report_payload import AI_REPORT_TOKEN_BUDGET, build_report_payload
+
+AI_REPORT_CONCURRENCY = int(os.getenv("AI_REPORT_CONCURRENCY", 4))
+AI_REPORT_RETRIES = int(os.getenv("AI_REPORT_RETRIES", 4))
+TABLE_TOKEN_BUDGET = max(AI_REPORT_TOKEN_BUDGET // 4, 800)   # 테이블 하나에 쓰는 입력 토큰 예산
+STREAM_UPDATE_INTERVAL = 0.1                                 # 화면 갱신 최소 간격(초)
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+REPORT_SECTIONS = (
+    "데이터 개요",
+    "결측치 현황",
+    "데이터 타입 적합성",
+    "중복 및 유일성",
+    "명명 일관성 및 관계",
+    "종합 의견",
+    "전처리 우선 권장 사항",
+)
+EMPTY_SECTION_NOTE = "_이 섹션은 생성된 내용이 없습니다._"
+REPORT_CLOSING = "👉 이상으로 사전 적재 데이터 품질 점검 보고서를 마칩니다."
+_SECTION_MARK = re.compile(r"^\s*\[\[(\d)\]\]\s*", re.MULTILINE)
+
+TABLE_SYSTEM_PROMPT = (
+    "You are a senior data engineer.\n"
+    "주어진 테이블 하나의 요약과 관련 컬럼 관계 후보를 바탕으로, 사전 적재 데이터 품질 점검 내용을 "
+    "**한국어로 자연스럽게** 작성하라.\n"
+    "기술용어보다 상황 설명 중심으로, 비전공자도 이해할 수 있게 표현하라.\n\n"
+    "다음 7개 섹션을 순서대로 작성하고, 각 섹션은 반드시 '[[번호]]' 한 줄로 시작하라 (예: [[1]]).\n"
+    "섹션 제목, Markdown 헤더, JSON은 쓰지 마라. 섹션마다 2~4문장으로 작성하라.\n"
+    + "".join(f"[[{i}]] {title}\n" for i, title in enumerate(REPORT_SECTIONS, 1))
+    + "\n7번은 '무엇을', '왜', '어떻게' 순서의 문단으로 작성하라.\n"
+    "요약은 이상 컬럼 위주로 압축되어 있으며, omitted 항목이 있으면 일부 정보가 생략되었음을 1번에서 밝혀라.\n"
+    "duplicates.removed_rows_range는 근사 추정 구간이므로 하한이 0이면 중복이 있다고 단정하지 마라."
+)
+
+
+# ==========================================================
+# 🧩 1️⃣ 테이블별 요청 / 섹션 병합
+# ==========================================================
+def _table_relations(name: str, relations: list) -> list:
+    return [
+        r for r in relations
+        if name in (r.get("table"), r.get("from_table"), r.get("to_table"))
+    ]
+
+
+def table_messages(name: str, summary: dict, relations: list) -> list:
+    payload, _ = build_report_payload({name: summary}, _table_relations(name, relations), budget=TABLE_TOKEN_BUDGET)
+    return [
+        {"role": "system", "content": TABLE_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=False, default=str)},
+    ]
+
+
+def split_sections(text: str) -> dict:
+    """'[[번호]]' 표시로 나뉜 응답 → {번호: 본문} (표시가 없으면 전체를 1번 섹션으로)"""
+    marks = list(_SECTION_MARK.finditer(text))
+    if not marks:
+        return {1: text.strip()} if text.strip() else {}
+    sections = {}
+    for mark, nxt in zip(marks, marks[1:] + [None]):
+        body = text[mark.end():nxt.start() if nxt else len(text)].strip()
+        number = int(mark.group(1))
+        if 1 <= number <= len(REPORT_SECTIONS) and body:
+            sections[number] = body
+    return sections
+
+
+def render_partial(text: str) -> str:
+    """스트리밍 중인 응답의 '[[번호]]' 표시를 섹션 제목으로 바꿔 표시용 Markdown 생성"""
+    def title(match):
+        number = int(match.group(1))
+        label = REPORT_SECTIONS[number - 1] if 1 <= number <= len(REPORT_SECTIONS) else ""
+        return f"\n**{number}. {label}**\n\n"
+    return _SECTION_MARK.sub(title, text).strip()
+
+
+def merge_reports(texts: dict) -> str:
+    """
+    테이블별 응답을 기존 7개 섹션 형식의 보고서 하나로 병합 (섹션마다 테이블별 문단).
+    - 어느 테이블도 내용을 쓰지 않은 섹션은 제목만 남기지 않고 안내 문구로 채움 (7개 섹션 번호 유지)
+    """
+    parsed = {name: split_sections(text) for name, text in texts.items()}
+    lines = []
+    for number, title in enumerate(REPORT_SECTIONS, 1):
+        lines.append(f"**{number}. {title}**\n")
+        bodies = [(name, sections[number]) for name, sections in parsed.items() if sections.get(number)]
+        for name, body in bodies:
+            lines.append(f"- **{name}**: {body}" if len(parsed) > 1 else body)
+        if not bodies:
+            lines.append(EMPTY_SECTION_NOTE)
+        lines.append("")
+    lines.append(REPORT_CLOSING)
+    return "\n".join(lines)
+
+
+# ==========================================================
+# ⚡ 2️⃣ 동시 스트리밍 생성
+# ==========================================================
+async def _stream_table(client, semaphore: asyncio.Semaphore, name: str, messages: list,
+                        params: dict, emit: Callable) -> str:
+    """
+    테이블 하나의 응답을 스트리밍으로 받아 emit(name, 누적 텍스트, 완료 여부)로 전달 (재시도 시 처음부터 다시 표시).
+    - 캐시 적중·병합된 요청은 스트리밍 없이 완성된 텍스트를 한 번에 전달
+    """
+    key = make_request_key(params.get("model"), messages, {k: v for k, v in params.items() if k != "model"})
+
+    async def compute():
+        async with semaphore:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(AI_REPORT_RETRIES),
+                wait=wait_exponential(multiplier=1, min=1, max=20),
+                retry=retry_if_exception_type(RETRYABLE_ERRORS),
+                reraise=True,
+            ):
+                with attempt:
+                    parts = []
+                    emit(name, "", False)
+                    stream = await client.chat.completions.create(messages=messages, stream=True, **params)
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            parts.append(chunk.choices[0].delta.content)
+                            emit(name, parts, False)
+        return "".join(parts).strip()
+
+    # 같은 요청이 이미 생성 중이면(다른 테이블·세션) 새로 호출하지 않고 그 결과를 받음
+    text, _ = await llm_cache.aget_or_compute(key, compute)
+    emit(name, text, True)
+    return text
+
+
+async def generate_report_async(client, summaries: dict, relations: list | None = None,
+                                on_text: Callable | None = None,
+                                concurrency: int = AI_REPORT_CONCURRENCY) -> str:
+    """
+    테이블별 섹션 요청을 동시에(최대 concurrency개) 보내고, 완료되면 7개 섹션 보고서로 병합.
+    - on_text(테이블명, 표시용 Markdown, 완료 여부)로 토큰이 도착하는 대로 부분 결과 통지 (STREAM_UPDATE_INTERVAL 간격)
+    - 일시적 API 오류는 지수 백오프로 재시도하고, 끝내 실패한 테이블은 보고서에 실패로 표시
+    """
+    relations = relations or []
+    params = {"model": os.getenv("DEPLOYMENT_NAME"), "temperature": 0.5, "max_completion_tokens": 900}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    last_emit: dict = {}
+
+    def emit(name, text, done):
+        if on_text is None:
+            return
+        now = time.perf_counter()
+        if not done and now - last_emit.get(name, 0.0) < STREAM_UPDATE_INTERVAL:
+            return
+        last_emit[name] = now
+        on_text(name, render_partial(text if isinstance(text, str) else "".join(text)), done)
+
+    names = list(summaries)
+    results = await asyncio.gather(
+        *(
+            _stream_table(client, semaphore, name, table_messages(name, summaries[name], relations), params, emit)
+            for name in names
+        ),
+        return_exceptions=True,
+    )
+
+    texts = {}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            texts[name] = f"[[1]] ⚠️ 이 테이블의 보고서 생성에 실패했습니다: {result}"
+            if on_text is not None:
+                on_text(name, f"⚠️ 생성 실패: {result}", True)
+        else:
+            texts[name] = result
+    return merge_reports(texts)
+
+
+def run_ai_report_async(client_factory: Callable, summaries: dict, relations: list | None = None,
+                        on_text: Callable | None = None) -> str:
+    """
+    동기 코드(Streamlit 스크립트)에서 호출하는 진입점.
+    - 비동기 클라이언트는 이벤트 루프에 묶이므로 실행마다 client_factory()로 새로 만들고 끝나면 닫음
+    """
+    async def main():
+        client = client_factory()
+        if client is None:
+            return "⚠️ Azure OpenAI 클라이언트가 초기화되지 않았습니다."
+        try:
+            return await generate_report_async(client, summaries, relations, on_text)
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
@@ -0,0 +1,116 @@
+# modules/batch_cleaner.py
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+import pandas as pd
+
+from modules.cleaner import preprocess_dataframe
+from modules.frame_ipc import read_frame, release_frame, write_frame
+
+CLEAN_WORKERS = int(os.getenv("CLEAN_WORKERS", min(8, os.cpu_count() or 1)))
+# 전체 행 수가 이보다 적으면 순차 처리 (spawn 워커 기동·pandas 임포트 비용이 전처리 시간보다 큼)
+CLEAN_PARALLEL_MIN_ROWS = int(os.getenv("CLEAN_PARALLEL_MIN_ROWS", 500_000))
+
+
+# ==========================================================
+# 📊 1️⃣ 전/후 비교 요약
+# ==========================================================
+def summarize_cleaning(table: str, before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """전처리 전/후 행 수, 결측 수, dtype 변경 내역 (main.py 결과 요약 형식)"""
+    dtypes_before = before.dtypes.astype(str).to_dict()
+    dtypes_after = after.dtypes.astype(str).to_dict()
+    changed_types = [
+        f"{col}: {dtypes_before.get(col)} -> {dtypes_after.get(col)}"
+        for col in after.columns
+        if dtypes_before.get(col) != dtypes_after.get(col)
+    ]
+    return {
+        "table": table,
+        "rows_before": len(before),
+        "rows_after": len(after),
+        "nulls_before": int(before.isna().sum().sum()),
+        "nulls_after": int(after.isna().sum().sum()),
+        "changed_types": changed_types,
+    }
+
+
+def clean_table(table: str, df: pd.DataFrame, options: dict, notify: Callable | None = None):
+    """테이블 하나 전처리 + 요약 계산 → (전처리 결과, 요약)"""
+    after = preprocess_dataframe(df, options, notify=notify)
+    return after, summarize_cleaning(table, df, after)
+
+
+# ==========================================================
+# 🧵 2️⃣ 워커 (Streamlit 컨텍스트 없이 실행)
+# ==========================================================
+def _clean_table_worker(table: str, handle, options: dict):
+    """공유 메모리에서 테이블을 읽어 전처리하고, 결과도 공유 메모리로 돌려줌"""
+    df = read_frame(handle, unlink=False)  # 입력 공유 메모리는 부모가 해제
+    messages = []
+    after, summary = clean_table(table, df, options, notify=messages.append)
+    return write_frame(after), summary, messages
+
+
+# ==========================================================
+# 🚀 3️⃣ 여러 테이블 병렬 전처리
+# ==========================================================
+def clean_tables(tables: dict, options: dict, workers: int = CLEAN_WORKERS,
+                 on_progress: Callable | None = None, notify: Callable | None = None,
+                 min_parallel_rows: int = CLEAN_PARALLEL_MIN_ROWS):
+    """
+    여러 테이블을 프로세스 풀에서 병렬 전처리 → (테이블명 → 결과 dict, 요약 list).
+    - 프레임은 pickle 대신 공유 메모리의 Arrow IPC로 주고받고, 요약 지표도 워커에서 계산
+    - 큰 테이블부터 먼저 시작하며, 결과 순서는 입력 순서와 동일
+    - on_progress(완료 수, 전체 수, 테이블명)로 진행률 통지, notify로 단계 안내 메시지 전달
+    - 워커에서 실패한 테이블은 현재 프로세스에서 다시 처리
+    - 테이블이 하나뿐이거나 전체 행 수가 min_parallel_rows 미만이면 풀 없이 순차 처리
+    """
+    results = {}
+    total = len(tables)
+
+    def finish(table, after, summary):
+        results[table] = (after, summary)
+        if on_progress is not None:
+            on_progress(len(results), total, table)
+
+    total_rows = sum(len(df) for df in tables.values())
+    if workers <= 1 or total <= 1 or total_rows < min_parallel_rows:
+        for table, df in tables.items():
+            finish(table, *clean_table(table, df, options, notify))
+    else:
+        order = sorted(tables, key=lambda t: tables[t].memory_usage(deep=False).sum(), reverse=True)
+        handles = {table: write_frame(tables[table]) for table in order}
+        failed = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, total),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = {
+                    pool.submit(_clean_table_worker, table, handles[table], options): table
+                    for table in order
+                }
+                for fut in as_completed(futures):
+                    table = futures[fut]
+                    try:
+                        out_handle, summary, messages = fut.result()
+                    except Exception as e:
+                        print(f"❌ {table} 병렬 전처리 실패, 현재 프로세스에서 재시도: {e}")
+                        failed.append(table)
+                        continue
+                    if notify is not None:
+                        for message in messages:
+                            notify(message)
+                    finish(table, read_frame(out_handle), summary)
+        finally:
+            for handle in handles.values():
+                release_frame(handle)
+
+        for table in failed:
+            finish(table, *clean_table(table, tables[table], options, notify))
+
+    cleaned = {table: results[table][0] for table in tables}
+    summaries = [results[table][1] for table in tables]
+    return cleaned, summaries
@@ -1,31 +1,170 @@
 # modules/blob_uploader.py
 import os
-from azure.storage.blob import BlobServiceClient
+import time
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Iterator
+
+from azure.storage.blob import BlobBlock, BlobServiceClient, ContentSettings
+from tenacity import Retrying, stop_after_attempt, wait_exponential
 import streamlit as st
 from dotenv import load_dotenv
 
+from modules.exporters import export_filename, get_format, iter_export
+
 load_dotenv()
 
+BLOB_BLOCK_SIZE = int(os.getenv("BLOB_BLOCK_SIZE", 8 * 1024 * 1024))      # 스테이징 블록 크기
+BLOB_UPLOAD_WORKERS = int(os.getenv("BLOB_UPLOAD_WORKERS", 8))            # 블록 업로드 동시 실행 수 (전체 공유)
+BLOB_FILE_CONCURRENCY = int(os.getenv("BLOB_FILE_CONCURRENCY", 4))        # 동시에 업로드할 파일 수
+BLOB_MAX_INFLIGHT_BLOCKS = int(os.getenv("BLOB_MAX_INFLIGHT_BLOCKS", 4))  # 파일당 메모리에 올라가는 블록 수 상한
+BLOB_BLOCK_RETRIES = int(os.getenv("BLOB_BLOCK_RETRIES", 4))
+
+
+# ==========================================================
+# 🔌 1️⃣ 클라이언트 (프로세스 전역 재사용)
+# ==========================================================
+@lru_cache(maxsize=1)
 def get_blob_service_client():
-    """환경 변수 기반으로 BlobServiceClient 초기화"""
-    account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
-    account_key = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
-    endpoint_suffix = os.getenv("AZURE_ENDPOINT_SUFFIX", "core.windows.net")
-
-    if not account_name or not account_key:
-        raise ValueError("환경 변수 AZURE_STORAGE_ACCOUNT_NAME 또는 AZURE_STORAGE_ACCOUNT_KEY가 설정되지 않았습니다.")
-
-    connection_str = (
-        f"DefaultEndpointsProtocol=https;"
-        f"AccountName={account_name};"
-        f"AccountKey={account_key};"
-        f"EndpointSuffix={endpoint_suffix}"
-    )
+    """
+    환경 변수 기반으로 BlobServiceClient 초기화 (한 번 만든 클라이언트와 연결 풀을 재사용).
+    - AZURE_STORAGE_CONNECTION_STRING이 있으면 우선 사용 (Azurite 등 로컬 에뮬레이터 포함)
+    """
+    connection_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    if not connection_str:
+        account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
+        account_key = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
+        endpoint_suffix = os.getenv("AZURE_ENDPOINT_SUFFIX", "core.windows.net")
+
+        if not account_name or not account_key:
+            raise ValueError("환경 변수 AZURE_STORAGE_ACCOUNT_NAME 또는 AZURE_STORAGE_ACCOUNT_KEY가 설정되지 않았습니다.")
+
+        connection_str = (
+            f"DefaultEndpointsProtocol=https;"
+            f"AccountName={account_name};"
+            f"AccountKey={account_key};"
+            f"EndpointSuffix={endpoint_suffix}"
+        )
 
     return BlobServiceClient.from_connection_string(connection_str)
 
 
-def upload_to_azure_blob(cleaned_results: dict, selected_files: list, container_name: str = "raw-data"):
+@lru_cache(maxsize=1)
+def _block_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=BLOB_UPLOAD_WORKERS, thread_name_prefix="blob-block")
+
+
+# ==========================================================
+# 🧾 2️⃣ 블록 분할
+# ==========================================================
+def iter_blocks(chunks: Iterator[bytes], block_size: int = BLOB_BLOCK_SIZE) -> Iterator[bytes]:
+    """임의 크기의 바이트 청크를 block_size 단위 블록으로 재구성 (마지막 블록은 더 작을 수 있음)"""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _block_id(index: int) -> str:
+    # 블록 ID는 blob 안에서 모두 같은 길이여야 함
+    return base64.b64encode(f"block-{index:08d}".encode()).decode()
+
+
+# ==========================================================
+# ☁️ 3️⃣ 블록 스테이징 업로드
+# ==========================================================
+def _stage_block(blob_client, block_id: str, data: bytes) -> int:
+    """블록 하나 스테이징 (일시 오류는 지수 백오프로 재시도) → 재시도 횟수"""
+    retries = 0
+    for attempt in Retrying(
+        stop=stop_after_attempt(BLOB_BLOCK_RETRIES),
+        wait=wait_exponential(multiplier=0.5, max=10),
+        reraise=True,
+    ):
+        with attempt:
+            retries = attempt.retry_state.attempt_number - 1
+            blob_client.stage_block(block_id, data, length=len(data))
+    return retries
+
+
+def upload_stream(blob_client, chunks: Iterator[bytes], content_type: str = "text/csv",
+                  block_size: int = BLOB_BLOCK_SIZE) -> dict:
+    """
+    바이트 청크 스트림을 블록 단위로 병렬 스테이징한 뒤 블록 목록을 커밋 (덮어쓰기).
+    - 파일당 진행 중인 블록 수를 BLOB_MAX_INFLIGHT_BLOCKS로 제한해 메모리 사용량을 일정하게 유지
+    """
+    t0 = time.perf_counter()
+    inflight = threading.BoundedSemaphore(BLOB_MAX_INFLIGHT_BLOCKS)
+    futures, block_ids, total = [], [], 0
+
+    def stage(block_id, data):
+        try:
+            return _stage_block(blob_client, block_id, data)
+        finally:
+            inflight.release()
+
+    try:
+        for index, data in enumerate(iter_blocks(chunks, block_size)):
+            inflight.acquire()
+            block_id = _block_id(index)
+            block_ids.append(block_id)
+            total += len(data)
+            futures.append(_block_pool().submit(stage, block_id, data))
+        retries = sum(f.result() for f in futures)
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+
+    blob_client.commit_block_list(
+        [BlobBlock(block_id=block_id) for block_id in block_ids],
+        content_settings=ContentSettings(content_type=content_type),
+    )
+    seconds = time.perf_counter() - t0
+    return {
+        "bytes": total,
+        "blocks": len(block_ids),
+        "retries": retries,
+        "seconds": round(seconds, 3),
+        "mb_per_s": round(total / 1024 ** 2 / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def upload_tables(container_client, tables: dict, fmt: str = "csv",
+                  on_progress: Callable | None = None) -> list:
+    """
+    여러 테이블을 동시에(최대 BLOB_FILE_CONCURRENCY개) 지정 형식(csv/parquet/arrow)으로 블록 업로드 → 파일별 결과 list.
+    - 결과: blob, bytes, blocks, retries, seconds, mb_per_s 또는 error
+    - on_progress(완료 수, 전체 수, 결과)는 호출 스레드에서 실행 (Streamlit 출력 가능)
+    """
+    def upload_one(name, df):
+        blob_name = export_filename(name, fmt)
+        blob_client = container_client.get_blob_client(blob_name)
+        try:
+            stats = upload_stream(blob_client, iter_export(df, fmt), content_type=get_format(fmt).content_type)
+            return {"table": name, "blob": blob_name, **stats}
+        except Exception as e:
+            return {"table": name, "blob": blob_name, "error": str(e)}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(BLOB_FILE_CONCURRENCY, len(tables)))) as pool:
+        futures = [pool.submit(upload_one, name, df) for name, df in tables.items()]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+            if on_progress is not None:
+                on_progress(len(results), len(futures), results[-1])
+    order = list(tables)
+    return sorted(results, key=lambda r: order.index(r["table"]))
+
+
+def upload_to_azure_blob(cleaned_results: dict, selected_files: list, container_name: str = "raw-data",
+                         fmt: str = "csv", service_client=None):
     """
     전처리된 DataFrame들을 Azure Blob Storage로 업로드
 
@@ -33,9 +172,11 @@ def upload_to_azure_blob(cleaned_results: dict, selected_files: list, container_
         cleaned_results (dict): 파일명 → DataFrame 매핑
         selected_files (list): 업로드할 파일명 리스트
         container_name (str): 대상 컨테이너명 (기본값 raw-data)
+        fmt (str): 업로드 형식 csv / parquet / arrow (기본값 csv)
+        service_client: BlobServiceClient 대체 객체 (기본값은 환경 변수 기반 공유 클라이언트)
     """
     try:
-        blob_service_client = get_blob_service_client()
+        blob_service_client = service_client or get_blob_service_client()
         container_client = blob_service_client.get_container_client(container_name)
 
         # 컨테이너 없으면 생성
@@ -43,22 +184,38 @@ def upload_to_azure_blob(cleaned_results: dict, selected_files: list, container_
             container_client.create_container()
             st.info(f"ℹ️ '{container_name}' 컨테이너가 존재하지 않아 새로 생성했습니다.")
 
-        # 파일 업로드
+        tables = {}
         for name in selected_files:
             if name not in cleaned_results:
                 st.warning(f"⚠️ '{name}' 데이터가 세션에 존재하지 않습니다.")
                 continue
+            tables[name] = cleaned_results[name]
 
-            df = cleaned_results[name]
-            blob_name = f"processed_{name.replace('/', '_')}.csv"
-            csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
+        t0 = time.perf_counter()
+        progress = st.progress(0.0, text="업로드 준비 중...")
 
-            blob_client = container_client.get_blob_client(blob_name)
-            blob_client.upload_blob(csv_bytes, overwrite=True)
+        def report(done, total, result):
+            progress.progress(done / total, text=f"업로드 중... ({done}/{total}) {result['blob']}")
+            if "error" in result:
+                st.error(f"❌ {result['blob']} 업로드 실패: {result['error']}")
+            else:
+                st.success(
+                    f"✅ {result['blob']} 업로드 완료 — {result['bytes'] / 1024 ** 2:.1f}MB, "
+                    f"블록 {result['blocks']}개, {result['seconds']:.2f}초 ({result['mb_per_s'] or 0:.1f}MB/s)"
+                    + (f", 재시도 {result['retries']}회" if result["retries"] else "")
+                )
 
-            st.success(f"✅ {blob_name} 업로드 완료")
+        results = upload_tables(container_client, tables, fmt, on_progress=report) if tables else []
+        progress.empty()
 
-        st.success(f"🎉 총 {len(selected_files)}개 파일이 '{container_name}' 컨테이너에 업로드되었습니다.")
+        uploaded = [r for r in results if "error" not in r]
+        elapsed = time.perf_counter() - t0
+        total_mb = sum(r["bytes"] for r in uploaded) / 1024 ** 2
+        st.success(
+            f"🎉 총 {len(uploaded)}개 파일이 '{container_name}' 컨테이너에 업로드되었습니다. "
+            f"({total_mb:.1f}MB, {elapsed:.2f}초, {total_mb / elapsed if elapsed > 0 else 0:.1f}MB/s)"
+        )
+        return results
 
     except Exception as e:
         st.error(f"❌ 업로드 실패: {e}")
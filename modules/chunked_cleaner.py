@@ -0,0 +1,269 @@
+# modules/chunked_cleaner.py
+import os
+import contextlib
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from modules.cleaner import (
+    DATE_KEYWORDS,
+    NUMERIC_MIN_RATIO,
+    clean_string_column,
+    convert_date_column,
+    convert_numeric_column,
+    count_numeric_strings,
+    first_date_format,
+    looks_like_date,
+)
+from modules.fingerprint import row_fingerprints
+from modules.loader import iter_csv_chunks
+
+CLEAN_CHUNK_ROWS = int(os.getenv("CLEAN_CHUNK_ROWS", 100_000))
+DATE_PATTERN_SAMPLE = 20  # preprocess_dataframe과 같은 날짜 판정 표본 수
+BOOL_STRINGS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+
+# ==========================================================
+# 📊 1️⃣ 1차 패스: 컬럼별 전역 통계
+# ==========================================================
+@dataclass
+class ColumnStats:
+    """청크를 모두 훑으며 모으는 컬럼 하나의 통계와, 그로부터 확정한 처리 방식"""
+    rows: int = 0
+    non_null: int = 0
+    numeric_ok: bool = True        # 모든 값이 그대로 숫자로 읽힘 (read_csv의 숫자형 추론)
+    integer_ok: bool = True        # 결측 없이 모두 정수
+    bool_ok: bool = True           # 결측 없이 모두 True/False 문자열
+    has_text: bool = False         # 정리 후 공백이 아닌 문자열 존재
+    numeric_strings: int = 0       # 숫자형 문자열 변환 시 숫자가 되는 행 수
+    numeric_strings_int: bool = True
+    date_samples: list = field(default_factory=list)
+    date_first: tuple | None = None  # first_date_format() 결과
+    date_any: bool = False         # 날짜로 변환되는 값이 하나라도 있는지
+    # ---- 1차 패스 후 확정 ----
+    kind: str = "text"             # bool | int | float | text | numeric_string | date
+    empty: bool = False
+
+
+def _is_date_candidate(col, st: ColumnStats, final: bool = False) -> bool | None:
+    """이름 또는 앞쪽 표본 패턴으로 날짜 컬럼 판정 (표본이 아직 모자라면 None)"""
+    if any(key in str(col).lower() for key in DATE_KEYWORDS):
+        return True
+    if len(st.date_samples) < DATE_PATTERN_SAMPLE and not final:
+        return None
+    samples = st.date_samples
+    return (sum(looks_like_date(v) for v in samples) / max(len(samples), 1)) > 0.5
+
+
+def _update_stats(col, s: pd.Series, st: ColumnStats, options: dict, need_date_any: bool):
+    st.rows += len(s)
+    values = s.dropna()
+    st.non_null += len(values)
+
+    # 원본 값 기준 타입 추론 (read_csv가 한 번에 읽었을 때의 dtype 재현)
+    if st.numeric_ok or st.bool_ok:
+        try:
+            uniques = pd.unique(values)
+        except TypeError:
+            uniques = values.to_numpy()
+        if st.numeric_ok:
+            parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce")
+            st.numeric_ok = bool(parsed.notna().all())
+            st.integer_ok = st.integer_ok and st.numeric_ok and len(values) == len(s) and \
+                pd.api.types.is_integer_dtype(parsed.dtype)
+        if st.bool_ok:
+            st.bool_ok = len(values) == len(s) and all(u in BOOL_STRINGS for u in uniques)
+
+    # 문자열 컬럼으로 처리될 경우를 대비한 통계 (정리 후 값 기준)
+    cleaned = clean_string_column(s, options.get("strip_strings", True), options.get("normalize_case"))
+    present = cleaned.dropna()
+    if present.empty:
+        return
+    st.has_text = True
+
+    if options.get("convert_numeric_strings", True):
+        count, all_int = count_numeric_strings(cleaned)
+        st.numeric_strings += count
+        st.numeric_strings_int = st.numeric_strings_int and all_int
+
+    if options.get("convert_dates", True):
+        if len(st.date_samples) < DATE_PATTERN_SAMPLE:
+            st.date_samples += present.astype(str).head(DATE_PATTERN_SAMPLE - len(st.date_samples)).tolist()
+        if st.date_first is None or not st.date_first[0]:
+            st.date_first = first_date_format(cleaned)
+        # 빈 컬럼 삭제 여부 판정용: 날짜 후보로 확정된 뒤에만, 변환되는 값을 찾을 때까지 파싱
+        if need_date_any and not st.date_any and _is_date_candidate(col, st):
+            parsed, _ = convert_date_column(cleaned, st.date_first)
+            st.date_any = bool(parsed.notna().any())
+
+
+def _finalize(col, st: ColumnStats, options: dict, drop_empty: bool):
+    if st.bool_ok and st.rows:
+        st.kind = "bool"
+    elif st.numeric_ok:
+        st.kind = "int" if st.integer_ok and st.rows else "float"
+    elif not st.has_text:
+        st.kind = "float"  # 공백뿐인 문자열 컬럼 → NaN → float64 (preprocess_dataframe과 동일)
+    elif options.get("convert_numeric_strings", True) and st.numeric_strings > st.rows * NUMERIC_MIN_RATIO:
+        st.kind = "numeric_string"
+    elif options.get("convert_dates", True) and _is_date_candidate(col, st, final=True):
+        st.kind = "date"
+
+    if drop_empty:
+        if st.kind == "date":
+            st.empty = not st.date_any
+        elif st.kind in ("text", "numeric_string"):
+            st.empty = not st.has_text
+        else:
+            st.empty = st.non_null == 0 or not st.has_text
+
+
+def collect_column_stats(open_source: Callable, options: dict, chunksize: int = CLEAN_CHUNK_ROWS) -> dict:
+    """1차 패스: 모든 청크를 문자열로 읽어 컬럼별 타입·숫자 비율·날짜 포맷·빈 컬럼 여부 확정"""
+    drop_empty = options.get("drop_empty_cols", True) and not options.get("fillna_zero", True)
+    stats = {}
+    with open_source() as f:
+        for chunk in iter_csv_chunks(f, chunksize=chunksize, dtype=object):
+            for col in chunk.columns:
+                _update_stats(col, chunk[col], stats.setdefault(col, ColumnStats()), options, drop_empty)
+
+    for col, st in stats.items():
+        if drop_empty and options.get("convert_dates", True) and not st.date_any \
+                and _is_date_candidate(col, st, final=True) and st.date_samples:
+            # 유효 값이 표본 수보다 적은 컬럼은 표본이 곧 전체 값
+            parsed, _ = convert_date_column(pd.Series(st.date_samples, dtype=object), st.date_first)
+            st.date_any = bool(parsed.notna().any())
+        _finalize(col, st, options, drop_empty)
+    return stats
+
+
+# ==========================================================
+# 🧬 2️⃣ 디스크 기반 중복 행 집합
+# ==========================================================
+class RowDigestSet:
+    """
+    행 내용 128비트 해시를 SQLite 파일에 보관하는 중복 판정 집합 (메모리 사용량은 청크 크기에만 비례).
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE seen (d BLOB PRIMARY KEY) WITHOUT ROWID")
+        self.conn.execute("CREATE TEMP TABLE batch (pos INTEGER, d BLOB)")
+
+    @staticmethod
+    def digests(df: pd.DataFrame) -> np.ndarray:
+        h1 = row_fingerprints(df)
+        h2 = row_fingerprints(df, hash_key="fedcba9876543210")
+        return np.stack([h1, h2], axis=1).view("V16").ravel()
+
+    def keep_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """처음 보는 행만 True (같은 청크 안의 중복은 첫 행만 유지)"""
+        digests = self.digests(df)
+        _, first = np.unique(digests, return_index=True)
+        first.sort()
+
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM batch")
+        cur.executemany("INSERT INTO batch VALUES (?, ?)", ((int(i), digests[i].tobytes()) for i in first))
+        seen = {row[0] for row in cur.execute("SELECT pos FROM batch JOIN seen USING (d)")}
+        cur.execute("INSERT OR IGNORE INTO seen SELECT d FROM batch")
+        self.conn.commit()
+
+        keep = np.zeros(len(df), dtype=bool)
+        keep[[i for i in first if i not in seen]] = True
+        return keep
+
+    def close(self):
+        self.conn.close()
+
+
+# ==========================================================
+# 🌊 3️⃣ 2차 패스: 청크 스트리밍 변환 + 증분 기록
+# ==========================================================
+def _transform_chunk(chunk: pd.DataFrame, stats: dict, options: dict) -> pd.DataFrame:
+    strip = options.get("strip_strings", True)
+    case = options.get("normalize_case")
+    out = {}
+    for col in chunk.columns:
+        st = stats[col]
+        if st.empty:
+            continue
+        s = chunk[col]
+        if st.kind == "bool":
+            s = s.map(BOOL_STRINGS).astype(bool)
+        elif st.kind == "int":
+            s = pd.to_numeric(s).astype("int64")
+        elif st.kind == "float":
+            s = pd.to_numeric(clean_string_column(s), errors="coerce").astype("float64")
+        else:
+            s = clean_string_column(s, strip, case).astype(object)
+            if st.kind == "numeric_string":
+                s = convert_numeric_column(s, min_ratio=None, as_float=not st.numeric_strings_int)
+            elif st.kind == "date":
+                s, _ = convert_date_column(s, st.date_first)
+                s = s.dt.strftime("%Y-%m-%d") if pd.api.types.is_datetime64_any_dtype(s) else s
+
+        if options.get("fillna_zero", True) and s.hasnans:
+            s = s.fillna(0) if pd.api.types.is_numeric_dtype(s) else s.fillna("NULL")
+        out[col] = s
+    return pd.DataFrame(out, index=chunk.index)
+
+
+def clean_csv_chunked(src, dest, options: dict, chunksize: int = CLEAN_CHUNK_ROWS,
+                      on_progress: Callable | None = None) -> dict:
+    """
+    메모리보다 큰 CSV/TXT를 청크 단위로 전처리해 dest(경로)에 CSV로 기록.
+    - 1차 패스: 숫자형 비율(30% 기준), 날짜 후보·포맷, 빈 컬럼 등 전체 데이터가 필요한 판단을 먼저 확정
+    - 2차 패스: 청크마다 행 단위 변환 → 중복 제거(SQLite 해시 집합) → 결과 파일에 이어 쓰기
+    - src: 파일 경로 또는 바이너리 파일 객체 (두 번 읽으므로 seek 가능해야 함)
+    - on_progress(패스, 처리한 행 수)로 진행 상황 통지
+    반환값: 행 수·중복 제거 수·삭제 컬럼·컬럼별 처리 방식·패스별 소요 시간
+    """
+    def open_source():
+        if isinstance(src, (str, os.PathLike)):
+            return open(src, "rb")
+        src.seek(0)
+        return contextlib.nullcontext(src)
+
+    started = time.perf_counter()
+    stats = collect_column_stats(open_source, options, chunksize)
+    pass1_seconds = time.perf_counter() - started
+    if on_progress is not None:
+        on_progress(1, sum(st.rows for st in stats.values()) // max(len(stats), 1))
+
+    result = {"rows_in": 0, "rows_out": 0, "duplicates_removed": 0}
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp, open(dest, "w", encoding="utf-8-sig", newline="") as out_file:
+        digest_set = RowDigestSet(os.path.join(tmp, "rows.sqlite")) if options.get("drop_duplicates", False) else None
+        try:
+            header = True
+            with open_source() as f:
+                for chunk in iter_csv_chunks(f, chunksize=chunksize, dtype=object):
+                    result["rows_in"] += len(chunk)
+                    out = _transform_chunk(chunk, stats, options)
+                    if digest_set is not None:
+                        keep = digest_set.keep_mask(out)
+                        result["duplicates_removed"] += int((~keep).sum())
+                        out = out[keep]
+                    out.columns = [c.strip().replace(" ", "_") for c in out.columns]
+                    out.to_csv(out_file, index=False, header=header)
+                    header = False
+                    result["rows_out"] += len(out)
+                    if on_progress is not None:
+                        on_progress(2, result["rows_in"])
+        finally:
+            if digest_set is not None:
+                digest_set.close()
+
+    result["dropped_columns"] = [col for col, st in stats.items() if st.empty]
+    result["column_kinds"] = {col: st.kind for col, st in stats.items()}
+    result["timings"] = {"stats_pass": round(pass1_seconds, 4), "transform_pass": round(time.perf_counter() - started, 4)}
+    return result
+
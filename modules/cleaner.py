@@ -2,20 +2,68 @@ import pandas as pd
 import numpy as np
 import unicodedata
 import streamlit as st
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable
 from dateutil import parser
 from datetime import datetime
 
+from modules.dedup import drop_duplicate_rows
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+DATE_SAMPLE_SIZE = 200           # 후보 포맷 추정에 쓰는 고유값 샘플 수
+DATE_VALIDATE_SIZE = 8           # 후보 포맷 결과를 robust 파서와 대조할 표본 수
+DATE_NULL_STRINGS = ["", " ", "NULL", "nan", "NaN", "None"]
+ROBUST_DATE_FORMATS = ("%Y-%m-%d", "%Y%m%d", "%Y-%m-%d %H:%M:%S")
+NUMERIC_MIN_RATIO = 0.3          # 숫자로 바뀌는 행 비율이 이 값을 넘으면 숫자형으로 변환
+NUMERIC_SAMPLE_SIZE = 2_000      # 숫자형 사전 검사 표본 행 수
+NUMERIC_SAMPLE_MARGIN = 4        # 표본 비율이 기준보다 표준오차 × 이 값 이상 낮으면 전체 변환 생략
+NON_NUMERIC_PATTERN = r"[^\d\.\-]"  # 따옴표·통화기호·콤마 등 숫자 외 문자 (한 번의 치환으로 제거)
+EMPTY_SAMPLE_SIZE = 100          # 빈 컬럼 판정 전 앞쪽 값 사전 검사 수
+
 # ==========================================================
 # 🧹 0️⃣ 비어 있는 컬럼 자동 삭제
 # ==========================================================
-def drop_empty_cols(df: pd.DataFrame) -> pd.DataFrame:
+def _is_empty_column(s: pd.Series) -> tuple[bool, bool]:
+    """
+    결측이거나 공백 문자열뿐인 컬럼인지 판정 → (비어 있음, 사전 검사만으로 판정됨)
+    - 숫자/날짜 등 문자열이 아닌 dtype은 결측 여부만 확인
+    - 앞쪽 값에서 공백이 아닌 값이 나오면 전체 검사 생략, 아니면 고유값만 검사
+    """
+    values = s.dropna()
+    if values.empty:
+        return True, True
+    if not (s.dtype == object or pd.api.types.is_string_dtype(s.dtype)):
+        return False, True
+    if any(str(x).strip() != "" for x in values.head(EMPTY_SAMPLE_SIZE)):
+        return False, True
+    try:
+        uniques = pd.unique(values)
+    except TypeError:
+        uniques = values
+    return all(str(x).strip() == "" for x in uniques), False
+
+
+def drop_empty_cols(df: pd.DataFrame, stats: dict | None = None, notify: Callable | None = st.info) -> pd.DataFrame:
+    """notify: 삭제 안내 메시지를 받을 콜백 (기본 st.info, Streamlit 밖에서는 None 또는 list.append 등)"""
     drop_cols = []
     for col in df.columns:
-        if df[col].apply(lambda x: (pd.isna(x)) or (str(x).strip() == "")).all():
+        empty, by_sample = _is_empty_column(df[col])
+        if stats is not None:
+            stats["empty_checked"] = stats.get("empty_checked", 0) + 1
+            stats["empty_skipped_sample"] = stats.get("empty_skipped_sample", 0) + int(by_sample)
+        if empty:
             drop_cols.append(col)
     if drop_cols:
         df = df.drop(columns=drop_cols)
-        st.info(f"🗑️ 비어 있는 컬럼 자동 삭제됨: {', '.join(drop_cols)}")
+        if notify is not None:
+            notify(f"🗑️ 비어 있는 컬럼 자동 삭제됨: {', '.join(drop_cols)}")
     return df
 
 
@@ -27,7 +75,7 @@ def robust_parse_date(x):
     if pd.isna(x) or str(x).strip() == "":
         return pd.NaT
     x = str(x).strip().replace("/", "-").replace(".", "-")
-    for fmt in ("%Y-%m-%d", "%Y%m%d", "%Y-%m-%d %H:%M:%S"):
+    for fmt in ROBUST_DATE_FORMATS:
         try:
             return datetime.strptime(x, fmt)
         except ValueError:
@@ -51,109 +99,488 @@ def looks_like_date(val: str) -> bool:
 
 
 # ==========================================================
-# ⚙️ 메인 전처리 함수
+# 📅 날짜 변환 엔진 (포맷 추정 + 벡터화 파싱 + 메모이제이션)
 # ==========================================================
-def preprocess_dataframe(df: pd.DataFrame, options: dict):
-    df = df.copy()
-    logs = []
-
-    # 1️⃣ 빈 문자열을 NaN으로 통일
-    df = df.replace(r'^\s*$', np.nan, regex=True)
-
-    # 2️⃣ 문자열 공백 및 유니코드 정규화
-    if options.get("strip_strings", True):
-        df = df.applymap(lambda x: unicodedata.normalize("NFKC", x.strip()) if isinstance(x, str) else x)
-        logs.append("✅ 문자열 앞뒤 공백 및 유니코드 정규화")
-
-    # 3️⃣ 대소문자 변환
-    normalize_case = options.get("normalize_case")
-    if normalize_case:
-        if normalize_case == "lower":
-            df = df.applymap(lambda x: x.lower() if isinstance(x, str) else x)
-        elif normalize_case == "upper":
-            df = df.applymap(lambda x: x.upper() if isinstance(x, str) else x)
-        logs.append("✅ 문자열 대소문자 변환 수행")
-
-    # 4️⃣ 숫자형 문자열 변환 ("1,000", "$3000")
-    if options.get("convert_numeric_strings", True):
-        for col in df.columns:
-            if df[col].dtype == object:
-                cleaned = (
-                    df[col].astype(str)
-                    .str.replace(r"['\"]", "", regex=True)
-                    .str.replace(r"[^\d\.\-]", "", regex=True)
-                )
-                numeric = pd.to_numeric(cleaned, errors="coerce")
-                if numeric.notna().sum() > len(df) * 0.3:
-                    df[col] = numeric
-        logs.append("✅ 숫자형 문자열 변환 수행")
-
-    # 5️⃣ 날짜형 변환 (robust 처리 포함)
-    if options.get("convert_dates", True):
-        date_keywords = ["date", "day", "time", "dob", "birth", "dt"]
-        for col in df.columns:
-            if df[col].dtype != object:
-                continue
+@lru_cache(maxsize=100_000)
+def _robust_parse_cached(x: str):
+    """같은 문자열은 dateutil 파싱을 한 번만 수행"""
+    return robust_parse_date(x)
+
+
+def _robust_parse_memo(x):
+    return _robust_parse_cached(x) if isinstance(x, str) else robust_parse_date(x)
+
+
+def _is_safe_format(fmt: str) -> bool:
+    """
+    벡터화 파싱에 써도 robust 파서(dateutil)와 결과가 같은 포맷인지 판단.
+    - 연/월/일이 모두 있어야 함 (빠진 필드는 dateutil이 오늘 날짜로 채움)
+    - 일이 월보다 앞서는 포맷은 제외 (dateutil은 기본적으로 월을 먼저 해석)
+    - 타임존 포맷 제외
+    """
+    if "%z" in fmt or "%Z" in fmt:
+        return False
+    has_month = any(tok in fmt for tok in ("%m", "%b", "%B"))
+    if not (("%Y" in fmt or "%y" in fmt) and has_month and "%d" in fmt):
+        return False
+    month_pos = min(fmt.find(tok) for tok in ("%m", "%b", "%B") if tok in fmt)
+    return month_pos < fmt.find("%d")
 
-            # ① 날짜 가능성 판단
-            sample_values = df[col].dropna().astype(str).head(20).tolist()
-            has_date_name = any(key in col.lower() for key in date_keywords)
-            has_date_pattern = (
-                sum(looks_like_date(v) for v in sample_values) / max(len(sample_values), 1)
-            ) > 0.5
 
-            if not (has_date_name or has_date_pattern):
+def _candidate_formats(values: np.ndarray) -> list[str]:
+    """고유값 샘플에서 포맷을 추정해 빈도순 후보 목록 생성 (robust 파서의 고정 포맷 포함)"""
+    counts = Counter()
+    for v in values[:DATE_SAMPLE_SIZE]:
+        fmt = guess_datetime_format(v)
+        if fmt and _is_safe_format(fmt):
+            counts[fmt] += 1
+    formats = [fmt for fmt, _ in counts.most_common()]
+    formats += [fmt for fmt in ROBUST_DATE_FORMATS if fmt not in formats]
+    return formats
+
+
+def factorize_as_strings(values) -> tuple[np.ndarray, np.ndarray]:
+    """
+    값의 문자열 표현 기준 factorize (날짜·숫자 파싱처럼 str(값)을 변환하는 경우용).
+    - 그대로 factorize하면 True / 1 / 1.0이 같은 고유값으로 묶여 "True"가 "1"의 변환 결과를 받으므로,
+      문자열이 아닌 값이 섞인 경우에만 문자열로 바꿔 factorize (해시 불가 값도 처리)
+    """
+    values = pd.Series(values, dtype=object, copy=False) if not isinstance(values, pd.Series) else values
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        return pd.factorize(values)
+    return pd.factorize(values.astype(str))
+
+
+def _date_strings(values) -> pd.Series:
+    """날짜 파싱 전 문자열 정리: 공백 제거, [./] → '-', 결측 표현 → NaN"""
+    return (
+        pd.Series(values, dtype=object).astype(str)
+        .str.strip()
+        .str.replace(r"[./]", "-", regex=True)
+        .replace(DATE_NULL_STRINGS, np.nan)
+    )
+
+
+def first_date_format(s: pd.Series) -> tuple[bool, str | None]:
+    """컬럼의 첫 유효 값에서 추정한 날짜 포맷 → (유효 값 존재 여부, 포맷)"""
+    temp = _date_strings(s.dropna().head(DATE_SAMPLE_SIZE)).dropna()
+    if temp.empty:
+        temp = _date_strings(s).dropna()
+    if temp.empty:
+        return False, None
+    return True, guess_datetime_format(temp.iloc[0])
+
+
+def convert_date_column(s: pd.Series, first_format: tuple[bool, str | None] | None = None) -> tuple[pd.Series, dict]:
+    """
+    문자열 컬럼 하나를 날짜로 변환하고 포맷별 적용 범위(coverage)를 함께 반환.
+    ① 첫 값에서 추정한 포맷으로 pandas 변환 (기존 pd.to_datetime과 동일)
+    ② 실패한 고유값에 샘플 기반 후보 포맷을 차례로 벡터화 적용
+    ③ 남은 고유값만 robust_parse_date로 한 번씩 파싱 (메모 테이블 사용)
+    - first_format: 청크 단위 처리처럼 ①의 포맷을 밖에서 정해 둔 경우 first_date_format() 결과
+    """
+    codes, uniques = factorize_as_strings(s)
+    temp = _date_strings(uniques)
+    present = temp.notna().to_numpy()
+    stage = np.full(len(temp), "failed", dtype=object)
+
+    # ① 기존 pd.to_datetime과 같은 규칙: 첫 번째 값의 포맷을 전체에 적용
+    if first_format is None:
+        first = temp[present].iloc[0] if present.any() else None
+        first_fmt = guess_datetime_format(first) if first is not None else None
+    else:
+        first_fmt = first_format[1]
+    if first_fmt:
+        parsed = pd.to_datetime(temp, format=first_fmt, errors="coerce")
+    else:
+        parsed = pd.to_datetime(temp, errors="coerce")  # 포맷 추정 불가 → 값별 dateutil 파싱
+    stage[parsed.notna().to_numpy()] = first_fmt or "dateutil"
+
+    # ② 후보 포맷 벡터화 파싱 (robust 파서 결과와 표본 대조 후 채택)
+    failed = parsed.isna().to_numpy() & present
+    if failed.any():
+        for fmt in _candidate_formats(temp[failed].to_numpy()):
+            if fmt == first_fmt or not failed.any():
                 continue
+            attempt = pd.to_datetime(temp[failed], format=fmt, errors="coerce")
+            hit = attempt.dropna()
+            if hit.empty:
+                continue
+            check = hit.head(DATE_VALIDATE_SIZE)
+            if any(pd.Timestamp(_robust_parse_memo(temp[i])) != v for i, v in check.items()):
+                continue
+            parsed.loc[hit.index] = hit
+            stage[hit.index] = fmt
+            failed[hit.index] = False
+
+    # ③ 남은 고유값만 robust 파서 적용
+    mask_failed = parsed.isna()
+    if mask_failed.any():
+        parsed.loc[mask_failed] = temp[mask_failed].map(_robust_parse_memo)
+        fixed = mask_failed.to_numpy() & parsed.notna().to_numpy()
+        stage[fixed] = "fallback"
+
+    # 고유값 결과 → 원래 행으로 (결측 코드 -1은 끝에 붙인 NaT를 가리킴)
+    parsed = pd.concat([parsed, pd.Series([pd.NaT], dtype=parsed.dtype)], ignore_index=True)
+    result = pd.Series(parsed.to_numpy()[codes], index=s.index, name=s.name)
+
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(temp))
+    coverage = {"rows": int(row_counts[present].sum())}
+    labels = [l for l in pd.unique(stage[present]) if l not in ("fallback", "failed")]
+    for label in labels + ["fallback", "failed"]:
+        count = int(row_counts[present & (stage == label)].sum())
+        if count:
+            coverage[label] = count
+    return result, coverage
+
+
+# ==========================================================
+# 🔤 문자열 정리 (빈 문자열 → NaN + strip/NFKC + 대소문자, 컬럼당 1패스)
+# ==========================================================
+def _str_unique_codes(values: np.ndarray):
+    """
+    object 배열을 factorize해 (codes, uniques, 문자열 고유값 여부) 반환.
+    - 해시 불가 값(list/dict 등)이 섞여 있으면 None
+    """
+    try:
+        codes, uniques = pd.factorize(values)
+    except TypeError:
+        return None
+    is_str = np.fromiter((isinstance(u, str) for u in uniques), dtype=bool, count=len(uniques))
+    return codes, uniques, is_str
+
+
+def _rows_of(codes: np.ndarray, unique_mask: np.ndarray) -> np.ndarray:
+    """고유값 마스크 → 행 마스크 (결측 코드 -1은 False)"""
+    rows = codes >= 0
+    rows[rows] = unique_mask[codes[rows]]
+    return rows
+
+
+def _normalize_str_value(x: str, strip: bool, case: str | None) -> str:
+    if strip:
+        x = unicodedata.normalize("NFKC", x.strip())
+    if case == "lower":
+        x = x.lower()
+    elif case == "upper":
+        x = x.upper()
+    return x
+
+
+def _normalize_str_uniques(u: pd.Series, strip: bool, case: str | None) -> pd.Series:
+    if strip:
+        u = pd.Series([unicodedata.normalize("NFKC", x) for x in u.str.strip()], dtype=object)
+    if case == "lower":
+        u = u.str.lower()
+    elif case == "upper":
+        u = u.str.upper()
+    return u
+
+
+def clean_string_column(s: pd.Series, strip: bool = False, case: str | None = None) -> pd.Series:
+    r"""
+    문자열 컬럼 하나를 한 번에 정리.
+    - 공백뿐인 문자열 → NaN (기존 df.replace(r'^\s*$', np.nan, regex=True)와 동일)
+    - strip → NFKC → 대소문자 변환을 고유값마다 한 번만 수행한 뒤 factorize 코드로 되돌려 매핑
+    - 문자열이 아닌 값은 그대로 두고, replace/applymap과 같이 infer_objects로 dtype 재추론
+    """
+    normalize = strip or case in ("lower", "upper")
+    is_string_dtype = s.dtype != object
+    if is_string_dtype and not normalize:
+        return s.mask(s.str.strip() == "")
+    na_value = pd.NA if is_string_dtype else np.nan
+
+    values = s.to_numpy(dtype=object, copy=True)
+    factorized = _str_unique_codes(values)
+    if factorized is None:  # list/dict 등 해시 불가 값이 섞인 컬럼
+        values = np.array([
+            (na_value if x.strip() == "" else _normalize_str_value(x, strip, case)) if isinstance(x, str) else x
+            for x in values
+        ], dtype=object)
+        return pd.Series(values, index=s.index, name=s.name, dtype=object).infer_objects()
+
+    codes, uniques, is_str = factorized
+    if is_str.any():
+        u = pd.Series(uniques[is_str], dtype=object)
+        blank = u.str.strip().eq("").to_numpy()
+        if normalize:
+            u = _normalize_str_uniques(u, strip, case)
+
+        new_str = np.empty(len(uniques), dtype=object)
+        new_str[is_str] = np.where(blank, na_value, u.to_numpy(dtype=object))
+        mask = _rows_of(codes, is_str)  # 문자열이 아닌 위치는 원본 유지
+        values[mask] = new_str[codes[mask]]
+    return pd.Series(values, index=s.index, name=s.name, dtype=object).infer_objects()
+
+
+# ==========================================================
+# 🔢 숫자형 문자열 변환
+# ==========================================================
+def _numeric_unlikely(s: pd.Series) -> bool:
+    """
+    무작위 표본의 숫자 변환 비율로 전체 변환이 기준을 넘지 못할 컬럼을 미리 판정.
+    - 표본 비율이 기준보다 표준오차의 NUMERIC_SAMPLE_MARGIN배 이상 낮을 때만 생략 (텍스트 컬럼 대부분)
+    """
+    n = len(s)
+    if n <= NUMERIC_SAMPLE_SIZE:
+        return False
+    positions = np.random.default_rng(0).choice(n, NUMERIC_SAMPLE_SIZE, replace=False)
+    cleaned = s.iloc[positions].astype(str).str.replace(NON_NUMERIC_PATTERN, "", regex=True)
+    ratio = pd.to_numeric(cleaned, errors="coerce").notna().mean()
+    std_err = np.sqrt(NUMERIC_MIN_RATIO * (1 - NUMERIC_MIN_RATIO) / NUMERIC_SAMPLE_SIZE)
+    return ratio < NUMERIC_MIN_RATIO - NUMERIC_SAMPLE_MARGIN * std_err
+
+
+def _numeric_uniques(s: pd.Series):
+    """숫자 외 문자를 한 번의 정규식 치환으로 제거한 뒤 고유값 단위 변환 → (codes, 고유값 변환 결과, 고유값별 행 수)"""
+    codes, uniques = factorize_as_strings(s.to_numpy(dtype=object))
+    cleaned = pd.Series(uniques, dtype=object).astype(str).str.replace(NON_NUMERIC_PATTERN, "", regex=True)
+    numeric = pd.to_numeric(cleaned, errors="coerce")
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return codes, numeric, row_counts
+
+
+def count_numeric_strings(s: pd.Series) -> tuple[int, bool]:
+    """숫자로 변환되는 행 수와 변환 결과가 결측 없는 정수형인지 (청크 단위 통계 수집용)"""
+    codes, numeric, row_counts = _numeric_uniques(s)
+    count = int(row_counts[numeric.notna().to_numpy()].sum())
+    return count, count == len(s) and pd.api.types.is_integer_dtype(numeric.dtype)
+
 
-            # ② 문자열 정리
-            temp = (
-                df[col].astype(str)
-                .str.strip()
-                .str.replace(r"[./]", "-", regex=True)
-                .replace(["", " ", "NULL", "nan", "NaN", "None"], np.nan)
+def convert_numeric_column(s: pd.Series, min_ratio: float | None = NUMERIC_MIN_RATIO,
+                           as_float: bool = False) -> pd.Series | None:
+    """
+    "1,000", "$3000" 같은 숫자형 문자열 컬럼을 수치형으로 변환. 기준 비율을 넘지 못하면 None.
+    - min_ratio=None이면 비율 검사 없이 변환 (청크 처리처럼 전체 통계로 이미 판정한 경우)
+    - as_float=True면 결측이 없어도 float64로 통일
+    """
+    codes, numeric, row_counts = _numeric_uniques(s)
+    if min_ratio is not None and row_counts[numeric.notna().to_numpy()].sum() <= len(s) * min_ratio:
+        return None
+
+    result = numeric.to_numpy()
+    if as_float or (codes < 0).any() or numeric.isna().any():
+        result = result.astype("float64")
+        result = np.append(result, np.nan)  # 결측 코드 -1 → 마지막 NaN
+    return pd.Series(result[codes], index=s.index, name=s.name)
+
+
+# ==========================================================
+# 🧭 전처리 실행 계획 (옵션 → 단계 컴파일)
+# ==========================================================
+DATE_KEYWORDS = ["date", "day", "time", "dob", "birth", "dt"]
+
+
+def _is_text_column(s: pd.Series) -> bool:
+    return s.dtype == object or pd.api.types.is_string_dtype(s.dtype)
+
+
+@dataclass
+class CleanStep:
+    """실행 계획의 한 단계: 대상 컬럼과 실행 함수"""
+    name: str
+    description: str
+    run: Callable
+    columns: list | None = None  # None이면 프레임 전체 단위 단계
+
+
+@dataclass
+class CleanPlan:
+    """
+    compile_plan이 만든 전처리 실행 계획.
+    - 옵션상 꺼져 있거나 대상 컬럼이 없는 단계는 계획에서 제외하고 skipped에 사유 기록
+    - execute()는 방어적 복사를 한 번만 하고 이후 단계는 컬럼 단위로 제자리 갱신
+    """
+    options: dict
+    steps: list = field(default_factory=list)
+    skipped: dict = field(default_factory=dict)
+
+    def explain(self) -> str:
+        lines = [f"🧭 전처리 실행 계획: {len(self.steps)}단계"]
+        for i, step in enumerate(self.steps, 1):
+            target = "전체" if step.columns is None else f"{len(step.columns)}개 컬럼"
+            lines.append(f"{i}. {step.name} — {step.description} ({target})")
+        for name, reason in self.skipped.items():
+            lines.append(f"- 생략: {name} ({reason})")
+        return "\n".join(lines)
+
+    def execute(self, df: pd.DataFrame, notify: Callable | None = st.info) -> pd.DataFrame:
+        df = df.copy()
+        df.attrs.pop("source_key", None)  # 내용이 바뀌므로 원본 파일 식별자 제거
+        ctx = {"options": self.options, "logs": [], "stats": {}, "notify": notify}
+        timings = {}
+        for step in self.steps:
+            started = time.perf_counter()
+            df = step.run(df, step.columns, ctx)
+            timings[step.name] = round(time.perf_counter() - started, 4)
+
+        df.attrs["clean_log"] = df.attrs.get("clean_log", []) + ctx["logs"]
+        df.attrs["clean_stats"] = ctx["stats"]
+        df.attrs["clean_timings"] = timings
+        df.attrs["clean_plan"] = self.explain()
+        return df
+
+
+# ---------- 단계별 실행 함수 (df, 대상 컬럼, ctx) → df ----------
+def _run_clean_strings(df, columns, ctx):
+    options = ctx["options"]
+    strip = options.get("strip_strings", True)
+    case = options.get("normalize_case")
+    for col in columns:
+        if _is_text_column(df[col]):
+            df[col] = clean_string_column(df[col], strip, case)
+    if strip:
+        ctx["logs"].append("✅ 문자열 앞뒤 공백 및 유니코드 정규화")
+    if case:
+        ctx["logs"].append("✅ 문자열 대소문자 변환 수행")
+    return df
+
+
+def _run_numeric(df, columns, ctx):
+    stats = ctx["stats"]
+    stats.update(numeric_checked=0, numeric_skipped_sample=0, numeric_converted=0)
+    for col in columns:
+        if df[col].dtype != object:  # 앞 단계에서 이미 숫자형으로 추론된 컬럼
+            continue
+        stats["numeric_checked"] += 1
+        if _numeric_unlikely(df[col]):
+            stats["numeric_skipped_sample"] += 1
+            continue
+        numeric = convert_numeric_column(df[col])
+        if numeric is not None:
+            df[col] = numeric
+            stats["numeric_converted"] += 1
+    ctx["logs"].append(
+        f"✅ 숫자형 문자열 변환 수행 (변환 {stats['numeric_converted']}개, "
+        f"표본 검사로 건너뜀 {stats['numeric_skipped_sample']}개)"
+    )
+    return df
+
+
+def _run_dates(df, columns, ctx):
+    date_coverage = {}
+    for col in columns:
+        if df[col].dtype != object:
+            continue
+
+        # ① 날짜 가능성 판단
+        sample_values = df[col].dropna().astype(str).head(20).tolist()
+        has_date_name = any(key in col.lower() for key in DATE_KEYWORDS)
+        has_date_pattern = (
+            sum(looks_like_date(v) for v in sample_values) / max(len(sample_values), 1)
+        ) > 0.5
+
+        if not (has_date_name or has_date_pattern):
+            continue
+
+        # ② 포맷 추정 + 벡터화 변환 + 남은 값만 robust 파싱
+        df[col], coverage = convert_date_column(df[col])
+        date_coverage[col] = coverage
+        if coverage["rows"]:
+            detail = ", ".join(
+                f"{label} {count / coverage['rows']:.0%}"
+                for label, count in coverage.items() if label != "rows"
             )
+            ctx["logs"].append(f"📅 {col} 날짜 포맷 적용 범위: {detail}")
 
-            # ③ 1차 pandas 변환
-            parsed = pd.to_datetime(temp, errors="coerce", infer_datetime_format=True)
-
-            # ④ 2차 robust parser 적용
-            mask_failed = parsed.isna()
-            if mask_failed.any():
-                parsed.loc[mask_failed] = temp[mask_failed].apply(robust_parse_date)
-
-            df[col] = parsed
-
-        # ✅ 날짜 포맷 통일
-        for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].dt.strftime("%Y-%m-%d")
-
-        logs.append("✅ 날짜형 변환 완료 (robust 처리 포함)")
-
-    # 6️⃣ 결측치 채우기
-    if options.get("fillna_zero", True):
-        for col in df.columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                df[col] = df[col].fillna(0)
-            elif pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].fillna(pd.Timestamp("1900-01-01"))
-            else:
-                df[col] = df[col].fillna("NULL")
-        logs.append("✅ 결측치 채우기 수행 (숫자: 0, 날짜: 1900-01-01, 문자열: 'NULL')")
-
-    # 7️⃣ 중복 제거
-    if options.get("drop_duplicates", False):
-        before = len(df)
-        df.drop_duplicates(inplace=True)
-        logs.append(f"⚙️ 중복 행 {before - len(df)}개 제거")
-
-    # 8️⃣ 비어 있는 컬럼 자동 삭제
-    if options.get("drop_empty_cols", True):
-        df = drop_empty_cols(df)
-
-    # 9️⃣ 컬럼명 정리
-    df.columns = [c.strip().replace(" ", "_") for c in df.columns]
-    logs.append("✅ 컬럼명 공백 제거 및 언더스코어 변환")
+    # ✅ 날짜 포맷 통일
+    for col in columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+
+    df.attrs["date_coverage"] = date_coverage
+    ctx["logs"].append("✅ 날짜형 변환 완료 (robust 처리 포함)")
+    return df
+
+
+def _run_fillna(df, columns, ctx):
+    for col in columns:
+        if not df[col].hasnans:
+            continue
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].fillna(0)
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].fillna(pd.Timestamp("1900-01-01"))
+        else:
+            df[col] = df[col].fillna("NULL")
+    ctx["logs"].append("✅ 결측치 채우기 수행 (숫자: 0, 날짜: 1900-01-01, 문자열: 'NULL')")
+    return df
 
-    df.attrs["clean_log"] = logs
+
+def _run_drop_duplicates(df, columns, ctx):
+    options = ctx["options"]
+    mode = options.get("dedup_mode", "exact")
+    df, report = drop_duplicate_rows(
+        df,
+        subset=options.get("dedup_subset"),
+        keep=options.get("dedup_keep", "first"),
+        mode=mode,
+    )
+    df.attrs["duplicate_report"] = report.to_dict()
+    detail = f" (근사 중복 클러스터 {report.cluster_count}개)" if mode == "near" else ""
+    ctx["logs"].append(f"⚙️ 중복 행 {report.removed}개 제거{detail}")
     return df
+
+
+def _run_drop_empty_cols(df, columns, ctx):
+    return drop_empty_cols(df, ctx["stats"], ctx["notify"])
+
+
+def _run_rename_columns(df, columns, ctx):
+    df.columns = [c.strip().replace(" ", "_") for c in df.columns]
+    ctx["logs"].append("✅ 컬럼명 공백 제거 및 언더스코어 변환")
+    return df
+
+
+def compile_plan(df: pd.DataFrame, options: dict) -> CleanPlan:
+    """
+    옵션과 컬럼 dtype을 보고 실행할 단계·대상 컬럼을 결정.
+    - 빈 문자열 → NaN, strip/NFKC, 대소문자 변환은 문자열 컬럼 단위 한 단계로 융합
+    - 숫자/날짜 변환은 문자열 컬럼만 후보로 두고, 실행 시 앞 단계에서 dtype이 바뀐 컬럼은 건너뜀
+    - 결측치 채우기 이후에는 빈 컬럼이 남지 않으므로 빈 컬럼 삭제 단계 제외
+    """
+    plan = CleanPlan(options=dict(options))
+    text_cols = [col for col in df.columns if _is_text_column(df[col])]
+
+    def add(name, description, run, columns=None, enabled=True, reason="옵션 꺼짐"):
+        if not enabled:
+            plan.skipped[name] = reason
+        elif columns is not None and not columns:
+            plan.skipped[name] = "대상 컬럼 없음"
+        else:
+            plan.steps.append(CleanStep(name, description, run, columns))
+
+    normalize = [
+        label for label, on in (
+            ("strip/NFKC", options.get("strip_strings", True)),
+            ("대소문자", options.get("normalize_case")),
+        ) if on
+    ]
+    add("clean_strings", " + ".join(["빈 문자열 → NaN"] + normalize), _run_clean_strings, text_cols)
+    add("convert_numeric_strings", "숫자형 문자열 → 수치형", _run_numeric, text_cols,
+        options.get("convert_numeric_strings", True))
+    date_cols = text_cols + [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    add("convert_dates", "날짜형 변환 및 YYYY-MM-DD 통일", _run_dates, date_cols,
+        options.get("convert_dates", True))
+    fillna = options.get("fillna_zero", True)
+    add("fillna_zero", "결측치 채우기", _run_fillna, list(df.columns), fillna)
+    dedup_desc = "중복 행 제거 ({}, keep={}{})".format(
+        "근사 중복" if options.get("dedup_mode") == "near" else "행 지문",
+        options.get("dedup_keep", "first"),
+        f", 키 {options['dedup_subset']}" if options.get("dedup_subset") else "",
+    )
+    add("drop_duplicates", dedup_desc, _run_drop_duplicates, None,
+        options.get("drop_duplicates", False))
+    add("drop_empty_cols", "비어 있는 컬럼 삭제", _run_drop_empty_cols, None,
+        options.get("drop_empty_cols", True) and not fillna,
+        "결측치 채우기 후에는 빈 컬럼 없음" if fillna and options.get("drop_empty_cols", True) else "옵션 꺼짐")
+    add("rename_columns", "컬럼명 공백 → 언더스코어", _run_rename_columns)
+    return plan
+
+
+# ==========================================================
+# ⚙️ 메인 전처리 함수
+# ==========================================================
+def preprocess_dataframe(df: pd.DataFrame, options: dict, notify: Callable | None = st.info):
+    """compile_plan으로 실행 계획을 만든 뒤 실행 (계획·단계별 소요 시간은 df.attrs에 기록)"""
+    return compile_plan(df, options).execute(df, notify)
@@ -0,0 +1,248 @@
+# modules/dedup.py
+import itertools
+import unicodedata
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from modules.fingerprint import hash_values, row_fingerprints
+
+MINHASH_PERMUTATIONS = 64      # MinHash 서명 길이
+NEAR_DUP_THRESHOLD = 0.8       # 근사 중복으로 볼 최소 추정 Jaccard 유사도
+SHINGLE_SIZE = 3               # 문자 n-gram 크기
+NEAR_DUP_BATCH_ROWS = 50_000   # 서명 계산 배치 크기 (메모리 상한)
+REPORT_CLUSTERS = 10           # 리포트에 담을 상위 클러스터 수
+KEEP_POLICIES = ("first", "last", False)
+
+
+# ==========================================================
+# 📋 1️⃣ 중복 탐지 결과
+# ==========================================================
+@dataclass
+class DuplicateReport:
+    """중복 탐지 결과: 삭제 대상 행 마스크와 크기순 중복 클러스터"""
+    mode: str                                   # "exact" | "near"
+    subset: list | None
+    keep: object
+    total_rows: int
+    drop_mask: np.ndarray                       # True = 정책상 삭제할 행
+    cluster_count: int = 0
+    duplicated_rows: int = 0                    # 클러스터(크기 2 이상)에 속한 전체 행 수
+    clusters: list = field(default_factory=list)  # [{"size", "rows", "similarity"}] 크기순 상위 일부
+
+    @property
+    def removed(self) -> int:
+        return int(self.drop_mask.sum())
+
+    def to_dict(self, df: pd.DataFrame | None = None, max_clusters: int = REPORT_CLUSTERS) -> dict:
+        """리포트/attrs용 요약 (df를 주면 클러스터마다 대표 행 샘플 포함)"""
+        clusters = []
+        for cluster in self.clusters[:max_clusters]:
+            item = dict(cluster)
+            item["rows"] = [int(r) for r in cluster["rows"][:5]]
+            if df is not None:
+                first = df.iloc[cluster["rows"][0]]
+                item["sample"] = {str(k): str(v) for k, v in first.items()}
+            clusters.append(item)
+        return {
+            "mode": self.mode,
+            "subset": self.subset,
+            "keep": self.keep,
+            "total_rows": self.total_rows,
+            "removed_rows": self.removed,
+            "duplicated_rows": self.duplicated_rows,
+            "cluster_count": self.cluster_count,
+            "clusters": clusters,
+        }
+
+
+def _resolve_subset(df: pd.DataFrame, subset) -> list | None:
+    """존재하는 키 컬럼만 남김 (여러 테이블 일괄 처리 시 없는 컬럼은 무시, 하나도 없으면 전체 행)"""
+    if not subset:
+        return None
+    present = [col for col in subset if col in df.columns]
+    return present or None
+
+
+def _drop_mask_from_labels(labels: np.ndarray, keep) -> np.ndarray:
+    """클러스터 라벨 배열 → keep 정책에 따른 삭제 마스크"""
+    s = pd.Series(labels)
+    return s.duplicated(keep=keep).to_numpy()
+
+
+def _top_clusters(labels: np.ndarray, limit: int) -> tuple[int, int, list]:
+    counts = pd.Series(labels).value_counts()
+    multi = counts[counts > 1]
+    clusters = []
+    for label, size in multi.head(limit).items():
+        rows = np.flatnonzero(labels == label)
+        clusters.append({"size": int(size), "rows": rows.tolist()})
+    return len(multi), int(multi.sum()), clusters
+
+
+# ==========================================================
+# 🧬 2️⃣ 정확 중복 (행 지문)
+# ==========================================================
+def find_exact_duplicates(df: pd.DataFrame, subset=None, keep="first",
+                          max_clusters: int = REPORT_CLUSTERS) -> DuplicateReport:
+    """
+    64비트 행 지문으로 정확 중복 탐지 (pandas drop_duplicates와 같은 keep 의미).
+    - 메모리는 지문 배열(행당 8바이트)과 해시 테이블에만 비례
+    """
+    subset = _resolve_subset(df, subset)
+    fp = row_fingerprints(df, subset)
+    drop_mask = pd.Series(fp).duplicated(keep=keep).to_numpy()
+    count, rows, clusters = _top_clusters(fp, max_clusters)
+    return DuplicateReport("exact", subset, keep, len(df), drop_mask, count, rows, clusters)
+
+
+# ==========================================================
+# 🔍 3️⃣ 근사 중복 (정규화 문자열 MinHash + LSH)
+# ==========================================================
+def _normalized_rows(df: pd.DataFrame) -> list[str]:
+    """행을 하나의 정규화 문자열로: NFKC + 소문자 + 연속 공백 축약, 컬럼 구분자 '|'"""
+    parts = [
+        df.iloc[:, i].astype(str).str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+        for i in range(df.shape[1])
+    ]
+    joined = parts[0].str.cat(parts[1:], sep="|") if len(parts) > 1 else parts[0]
+    return [unicodedata.normalize("NFKC", x) for x in joined]
+
+
+def _shingles(text: str) -> list[str]:
+    if len(text) <= SHINGLE_SIZE:
+        return [text]
+    return list({text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)})
+
+
+def _minhash_params(num_perm: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, np.iinfo(np.int64).max, num_perm, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.int64).max, num_perm, dtype=np.int64).astype(np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts: list[str], num_perm: int = MINHASH_PERMUTATIONS) -> np.ndarray:
+    """
+    문자열 목록의 MinHash 서명 (행 × num_perm, uint32).
+    - 모든 shingle을 한 배열로 펼쳐 한 번에 해시하고, 순열마다 reduceat으로 행별 최솟값 계산
+    """
+    shingles = [_shingles(t) for t in texts]
+    lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+    flat = hash_values(np.array(list(itertools.chain.from_iterable(shingles)), dtype=object))
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    a, b = _minhash_params(num_perm)
+    sig = np.empty((len(texts), num_perm), dtype=np.uint32)
+    with np.errstate(over="ignore"):
+        for k in range(num_perm):
+            permuted = ((flat * a[k] + b[k]) >> np.uint64(32)).astype(np.uint32)  # multiply-shift 해시
+            sig[:, k] = np.minimum.reduceat(permuted, offsets)
+    return sig
+
+
+def _lsh_bands(num_perm: int, threshold: float) -> int:
+    """(1/b)^(1/r) ≈ threshold가 되도록 밴드 수 b 선택 (b × r = num_perm)"""
+    best, best_gap = 1, float("inf")
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        gap = abs((1 / bands) ** (1 / rows) - threshold)
+        if gap < best_gap:
+            best, best_gap = bands, gap
+    return best
+
+
+def _band_keys(sig: np.ndarray, bands: int) -> np.ndarray:
+    """서명을 밴드별 64비트 키로 압축 (행 × bands)"""
+    rows = sig.shape[1] // bands
+    keys = np.empty((sig.shape[0], bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(bands):
+            h = np.full(sig.shape[0], 0xCBF29CE484222325, dtype=np.uint64)
+            for v in sig[:, j * rows:(j + 1) * rows].T:
+                h = (h ^ v.astype(np.uint64)) * np.uint64(0x100000001B3)
+            keys[:, j] = h
+    return keys
+
+
+def _connected_labels(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """검증된 간선(src, dst)으로 연결된 행끼리 같은 라벨 (최솟값 전파 + 포인터 점프)"""
+    labels = np.arange(n)
+    while True:
+        before = labels.copy()
+        np.minimum.at(labels, src, labels[dst])
+        np.minimum.at(labels, dst, labels[src])
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+
+def find_near_duplicates(df: pd.DataFrame, subset=None, keep="first", threshold: float = NEAR_DUP_THRESHOLD,
+                         num_perm: int = MINHASH_PERMUTATIONS, max_clusters: int = REPORT_CLUSTERS) -> DuplicateReport:
+    """
+    정규화 문자열의 문자 n-gram MinHash + LSH로 근사 중복 클러스터 탐지.
+    - 서명은 배치 단위로 계산하고 행마다 밴드 키와 하위 8비트 서명만 보관 (행 내용은 보관하지 않음)
+    - 같은 LSH 버킷의 행은 버킷 대표 행과의 추정 유사도가 threshold 이상일 때만 연결
+    - keep="first"/"last"는 클러스터마다 첫/마지막 행 유지, False는 클러스터 전체 삭제
+    """
+    subset = _resolve_subset(df, subset)
+    frame = df if subset is None else df[subset]
+    n = len(frame)
+    bands = _lsh_bands(num_perm, threshold)
+
+    keys = np.empty((n, bands), dtype=np.uint64)
+    sig8 = np.empty((n, num_perm), dtype=np.uint8)  # b-bit MinHash (유사도 검증용)
+    for start in range(0, n, NEAR_DUP_BATCH_ROWS):
+        part = frame.iloc[start:start + NEAR_DUP_BATCH_ROWS]
+        sig = minhash_signatures(_normalized_rows(part), num_perm)
+        keys[start:start + len(part)] = _band_keys(sig, bands)
+        sig8[start:start + len(part)] = sig.astype(np.uint8)
+
+    # 밴드마다 버킷 대표(가장 앞 행)와 비교해 유사도 검증을 통과한 간선만 사용
+    rows = np.arange(n)
+    src_parts, dst_parts, sim_parts = [], [], []
+    for j in range(bands):
+        first = pd.Series(rows).groupby(keys[:, j]).transform("min").to_numpy()
+        cand = np.flatnonzero(first != rows)
+        if not len(cand):
+            continue
+        matches = (sig8[cand] == sig8[first[cand]]).mean(axis=1)
+        sim = (matches - 1 / 256) / (1 - 1 / 256)  # 8비트 우연 일치 보정
+        ok = sim >= threshold
+        src_parts.append(cand[ok])
+        dst_parts.append(first[cand][ok])
+        sim_parts.append(sim[ok])
+    src = np.concatenate(src_parts) if src_parts else np.zeros(0, dtype=np.int64)
+    dst = np.concatenate(dst_parts) if dst_parts else np.zeros(0, dtype=np.int64)
+    edge_sim = np.concatenate(sim_parts) if sim_parts else np.zeros(0)
+    labels = _connected_labels(n, src, dst)
+
+    drop_mask = _drop_mask_from_labels(labels, keep)
+    count, dup_rows, clusters = _top_clusters(labels, max_clusters)
+    for cluster in clusters:
+        in_cluster = np.isin(src, cluster["rows"])
+        cluster["similarity"] = round(float(np.clip(edge_sim[in_cluster].min(), 0, 1)), 3) if in_cluster.any() else 1.0
+    return DuplicateReport("near", subset, keep, len(df), drop_mask, count, dup_rows, clusters)
+
+
+# ==========================================================
+# 🧹 4️⃣ 중복 제거
+# ==========================================================
+def find_duplicates(df: pd.DataFrame, subset=None, keep="first", mode: str = "exact", **kwargs) -> DuplicateReport:
+    if keep not in KEEP_POLICIES:
+        raise ValueError(f"keep은 {KEEP_POLICIES} 중 하나여야 합니다: {keep!r}")
+    if mode == "near":
+        return find_near_duplicates(df, subset, keep, **kwargs)
+    return find_exact_duplicates(df, subset, keep, **kwargs)
+
+
+def drop_duplicate_rows(df: pd.DataFrame, subset=None, keep="first", mode: str = "exact",
+                        **kwargs) -> tuple[pd.DataFrame, DuplicateReport]:
+    """중복 행 제거 → (결과 DataFrame, 탐지 결과). 남는 행의 원래 인덱스는 유지"""
+    report = find_duplicates(df, subset, keep, mode, **kwargs)
+    if not report.drop_mask.any():
+        return df, report
+    return df[~report.drop_mask], report
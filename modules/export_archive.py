@@ -0,0 +1,167 @@
+# modules/export_archive.py
+import os
+import time
+import contextlib
+import shutil
+import hashlib
+import zipfile
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from modules.exporters import export_filename, get_format
+from modules.fingerprint import table_fingerprint
+from modules.table_store import TableStore
+
+EXPORT_ZIP_WORKERS = int(os.getenv("EXPORT_ZIP_WORKERS", min(8, os.cpu_count() or 1)))
+EXPORT_ZIP_CACHE_ENTRIES = int(os.getenv("EXPORT_ZIP_CACHE_ENTRIES", 4))
+EXPORT_SPOOL_MAX_BYTES = int(os.getenv("EXPORT_SPOOL_MAX_BYTES", 64 * 1024 * 1024))  # 넘으면 디스크로 내려감
+
+
+# ==========================================================
+# 🗜️ 1️⃣ 테이블별 병렬 직렬화 + ZIP 기록
+# ==========================================================
+def archive_key(tables: dict, fmt: str) -> str:
+    """형식 + 테이블명·내용 지문으로 ZIP 캐시 키 생성 (테이블 하나라도 바뀌면 달라짐)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(fmt.encode())
+    for name in list(tables):
+        fingerprint = tables.fingerprint(name) if isinstance(tables, TableStore) else table_fingerprint(tables[name])
+        h.update(f"\0{name}\0{fingerprint}".encode())
+    return h.hexdigest()
+
+
+def _read_table(tables: dict, name: str) -> pd.DataFrame:
+    """TableStore의 스필된 테이블은 저장소에 다시 올리지 않고 파일에서 바로 읽음"""
+    return tables.peek(name) if isinstance(tables, TableStore) else tables[name]
+
+
+def _serialize_entry(table: str, tables: dict, fmt: str, disk_lock: threading.Lock):
+    """
+    테이블 하나를 ZIP 항목 데이터로 직렬화 → (ZipInfo, 직렬화 데이터 임시 파일).
+    - 직렬화(CSV/Excel/Parquet 작성)는 스레드마다 독립적으로, 압축은 ZIP 기록 시 zipfile이 수행
+    - 자체 압축 포맷(Parquet/Arrow)은 다시 압축하지 않고 저장만
+    - 디스크에 스필된 테이블은 disk_lock으로 한 번에 하나씩만 메모리에 올림
+    """
+    spec = get_format(fmt)
+    info = zipfile.ZipInfo(export_filename(table, fmt), date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_STORED if spec.compressed else zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+
+    on_disk = isinstance(tables, TableStore) and not tables.is_resident(table)
+    out = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+    with disk_lock if on_disk else contextlib.nullcontext():
+        for chunk in spec.writer(_read_table(tables, table)):
+            out.write(chunk)
+
+    info.file_size = out.tell()
+    out.seek(0)
+    return info, out
+
+
+def build_archive(tables: dict, fmt: str = "csv", workers: int = EXPORT_ZIP_WORKERS, out=None):
+    """
+    테이블들을 병렬로 직렬화해 ZIP 하나로 묶음 → out (없으면 SpooledTemporaryFile, 처음 위치로 되감은 상태).
+    - 항목 순서는 입력 순서와 동일
+    - 앞 항목을 압축해 기록하는 동안 뒤 테이블의 직렬화가 계속 진행됨 (zlib은 GIL을 놓음)
+    - tables가 TableStore이면 스필된 테이블을 저장소에 다시 올리지 않고 하나씩 읽어 직렬화
+    """
+    names = list(tables)
+    disk_lock = threading.Lock()
+    archive = out if out is not None else tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names) or 1))) as pool:
+        futures = [pool.submit(_serialize_entry, name, tables, fmt, disk_lock) for name in names]
+        with zipfile.ZipFile(archive, "w", allowZip64=True) as zf:
+            for fut in futures:
+                info, data = fut.result()
+                with data, zf.open(info, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as entry:
+                    shutil.copyfileobj(data, entry, 1024 * 1024)
+    archive.seek(0)
+    return archive
+
+
+# ==========================================================
+# 🗃️ 2️⃣ 지문 기반 ZIP 캐시
+# ==========================================================
+class ExportArchiveCache:
+    """
+    지문 키 → 완성된 ZIP 파일(임시 디렉터리) LRU 캐시.
+    - 적중 시 ZIP 전체를 메모리로 읽지 않고 새 읽기 핸들만 반환
+    - 같은 키를 동시에 요청하면 한 번만 빌드 (키별 잠금)
+    - hit / miss / build 시간 카운터 제공
+    """
+
+    def __init__(self, max_entries: int = EXPORT_ZIP_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.last_build_seconds = 0.0
+
+    def _open(self, key: str):
+        with self._lock:
+            path = self._items.get(key)
+            if path is None:
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return open(path, "rb")
+
+    def open(self, tables: dict, fmt: str = "csv"):
+        """ZIP 읽기 핸들 반환 (호출자가 닫음). 제거된 캐시 파일도 열려 있는 핸들로는 끝까지 읽을 수 있음"""
+        key = archive_key(tables, fmt)
+        handle = self._open(key)
+        if handle is not None:
+            return handle
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                handle = self._open(key)  # 기다리는 동안 다른 요청이 만들었을 수 있음
+                if handle is not None:
+                    return handle
+                with self._lock:
+                    self.misses += 1
+                t0 = time.perf_counter()
+                out = tempfile.NamedTemporaryFile(prefix="dq_export_", suffix=".zip", delete=False)
+                try:
+                    with out:
+                        build_archive(tables, fmt, out=out)
+                except BaseException:
+                    _remove(out.name)
+                    raise
+                self.last_build_seconds = time.perf_counter() - t0
+                with self._lock:
+                    self._items[key] = out.name
+                    while len(self._items) > self.max_entries:
+                        _, evicted = self._items.popitem(last=False)
+                        _remove(evicted)
+                    return open(out.name, "rb")
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._items.values():
+                _remove(path)
+            self._items.clear()
+
+
+def _remove(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+
+# 프로세스 전역 캐시 (Streamlit rerun / 세션 간 공유)
+export_archive_cache = ExportArchiveCache()
+
+
+def open_export_archive(tables: dict, fmt: str = "csv"):
+    return export_archive_cache.open(tables, fmt)
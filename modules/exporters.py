@@ -0,0 +1,179 @@
+# modules/exporters.py
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_CSV_CHUNK_ROWS = int(os.getenv("EXPORT_CSV_CHUNK_ROWS", 50_000))
+EXPORT_ROW_GROUP_ROWS = int(os.getenv("EXPORT_ROW_GROUP_ROWS", 128_000))
+EXPORT_PARQUET_COMPRESSION = os.getenv("EXPORT_PARQUET_COMPRESSION", "zstd")
+EXPORT_ARROW_COMPRESSION = os.getenv("EXPORT_ARROW_COMPRESSION", "lz4")
+
+
+# ==========================================================
+# 🔄 1️⃣ pandas → Arrow 변환
+# ==========================================================
+_ARROW_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+
+
+def arrow_ready(df: pd.DataFrame) -> tuple[pd.DataFrame, pa.Schema]:
+    """
+    DataFrame 전체 기준 Arrow 스키마 결정 → (변환 가능한 DataFrame, 스키마).
+    - 타입이 섞인 object 컬럼은 Arrow가 직접 변환하지 못하므로 결측을 유지한 문자열로 변환
+    - 스키마를 전체 기준으로 정해 두어야 행 청크마다 타입이 달라지지 않음
+    - 문자열이 아닌 컬럼명(정수 등)은 Arrow 필드명으로 쓸 수 없으므로 문자열로 바꾼 얕은 복사본 사용
+    """
+    if not all(isinstance(c, str) for c in df.columns):
+        df = df.copy(deep=False)
+        df.columns = df.columns.map(str)
+    try:
+        return df, pa.Schema.from_pandas(df, preserve_index=False)
+    except _ARROW_ERRORS:
+        pass
+    fixed = df.copy(deep=False)
+    for i in range(fixed.shape[1]):
+        s = fixed.iloc[:, i]
+        if s.dtype != object:
+            continue
+        try:
+            pa.array(s, from_pandas=True)
+        except _ARROW_ERRORS:
+            fixed.isetitem(i, s.astype("string"))
+    return fixed, pa.Schema.from_pandas(fixed, preserve_index=False)
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """DataFrame → Arrow Table (숫자/날짜 컬럼은 복사 없이 버퍼 공유)"""
+    ready, schema = arrow_ready(df)
+    return pa.Table.from_pandas(ready, schema=schema, preserve_index=False)
+
+
+class _ChunkSink:
+    """Arrow 라이터의 출력을 모았다가 청크 단위로 내보내는 쓰기 전용 파일 객체"""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def _row_slices(df: pd.DataFrame, rows: int):
+    if len(df) == 0:
+        yield df
+        return
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+
+# ==========================================================
+# ✍️ 2️⃣ 포맷별 스트리밍 writer (바이트 청크 생성기)
+# ==========================================================
+def iter_csv_bytes(df: pd.DataFrame, chunk_rows: int = EXPORT_CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """df.to_csv(index=False).encode("utf-8-sig")와 같은 바이트를 행 청크 단위로 생성 (전체 문자열을 만들지 않음)"""
+    for i, part in enumerate(_row_slices(df, chunk_rows)):
+        text = part.to_csv(index=False, header=i == 0)
+        yield text.encode("utf-8-sig" if i == 0 else "utf-8")
+
+
+def iter_parquet_bytes(df: pd.DataFrame, compression: str = EXPORT_PARQUET_COMPRESSION,
+                       row_group_size: int = EXPORT_ROW_GROUP_ROWS) -> Iterator[bytes]:
+    """row group 단위로 변환·기록하며 Parquet 바이트를 생성 (메모리는 row group 하나 분량만 추가 사용)"""
+    ready, schema = arrow_ready(df)
+    sink = _ChunkSink()
+    compression = None if compression in (None, "", "none") else compression
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    for part in _row_slices(ready, row_group_size):
+        writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False), row_group_size=row_group_size)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def iter_arrow_bytes(df: pd.DataFrame, compression: str = EXPORT_ARROW_COMPRESSION,
+                     batch_rows: int = EXPORT_ROW_GROUP_ROWS) -> Iterator[bytes]:
+    """Arrow IPC 파일(Feather v2) 바이트를 record batch 단위로 생성"""
+    ready, schema = arrow_ready(df)
+    sink = _ChunkSink()
+    compression = None if compression in (None, "", "none") else compression
+    writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+    for part in _row_slices(ready, batch_rows):
+        writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+# ==========================================================
+# 🧩 3️⃣ 포맷 레지스트리
+# ==========================================================
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    label: str
+    extension: str
+    content_type: str
+    writer: Callable[..., Iterator[bytes]]
+    compressed: bool = False                       # 자체 압축 포맷이면 ZIP에서 다시 deflate하지 않음
+
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat("csv", "CSV (UTF-8 BOM)", "csv", "text/csv", iter_csv_bytes),
+    "parquet": ExportFormat(
+        "parquet", "Parquet", "parquet", "application/vnd.apache.parquet", iter_parquet_bytes,
+        compressed=EXPORT_PARQUET_COMPRESSION not in ("", "none"),
+    ),
+    "arrow": ExportFormat(
+        "arrow", "Arrow IPC (Feather)", "arrow", "application/vnd.apache.arrow.file", iter_arrow_bytes,
+        compressed=EXPORT_ARROW_COMPRESSION not in ("", "none"),
+    ),
+}
+
+
+def get_format(fmt: str) -> ExportFormat:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+    return EXPORT_FORMATS[fmt]
+
+
+def export_filename(table: str, fmt: str = "csv") -> str:
+    return f"processed_{table.replace('/', '_')}.{get_format(fmt).extension}"
+
+
+def iter_export(df: pd.DataFrame, fmt: str = "csv", **options) -> Iterator[bytes]:
+    """선택한 형식의 바이트 청크 스트림 (options는 형식별 writer 인자: compression, row_group_size 등)"""
+    return get_format(fmt).writer(df, **options)
+
+
+def export_bytes(df: pd.DataFrame, fmt: str = "csv", **options) -> bytes:
+    return b"".join(iter_export(df, fmt, **options))
+
+
+def write_to_zip(zf: zipfile.ZipFile, table: str, df: pd.DataFrame, fmt: str = "csv", **options) -> int:
+    """ZIP 항목으로 스트리밍 기록 → 기록한 바이트 수 (자체 압축 포맷은 저장만)"""
+    spec = get_format(fmt)
+    info = zipfile.ZipInfo(export_filename(table, fmt))
+    info.compress_type = zipfile.ZIP_STORED if spec.compressed else zipfile.ZIP_DEFLATED
+    written = 0
+    with zf.open(info, "w", force_zip64=True) as entry:
+        for chunk in spec.writer(df, **options):
+            entry.write(chunk)
+            written += len(chunk)
+    return written
@@ -0,0 +1,118 @@
+# modules/fingerprint.py
+import hashlib
+import numbers
+
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# 🔢 1️⃣ 값 해시
+# ==========================================================
+DEFAULT_HASH_KEY = "0123456789123456"  # pandas 기본 해시 키 (16자)
+
+# object 값 종류 태그: 문자열 "1"과 숫자 1처럼 문자열 표현이 같아도 종류가 다르면 다른 해시
+_TAG_STR, _TAG_INT, _TAG_FLOAT, _TAG_NA, _TAG_OTHER = range(1, 6)
+_TAG_MIX = np.uint64(0x9E3779B97F4A7C15)
+_HASH_MULT = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def _missing_key(v, distinct_na: bool) -> str:
+    # 결측끼리는 같은 값 (distinct_na면 None / NaN / NaT처럼 종류별로 구분)
+    return type(v).__name__ if distinct_na else ""
+
+
+def _object_value_key(v, distinct_na: bool) -> tuple[int, str]:
+    """
+    object 값 하나 → (종류 태그, 정규화 문자열). pandas(파이썬) 동등성과 같은 기준:
+    - 1 / 1.0 / True는 같은 값, "1"은 다른 값 (정수로 표현되는 실수는 정수로 정규화)
+    - 해시 불가 값(list, dict 등)은 문자열 표현 기준
+    """
+    if isinstance(v, str):
+        return _TAG_STR, v
+    if v is None or v is pd.NA or v is pd.NaT or (isinstance(v, (float, np.floating)) and v != v):
+        return _TAG_NA, _missing_key(v, distinct_na)
+    if isinstance(v, numbers.Real):
+        try:
+            iv = int(v)
+            if iv == v:
+                return _TAG_INT, str(iv)
+        except (OverflowError, ValueError):  # inf
+            pass
+        return _TAG_FLOAT, repr(float(v))
+    return _TAG_OTHER, str(v)
+
+
+def _object_keys(arr: np.ndarray, distinct_na: bool) -> tuple[np.ndarray, np.ndarray]:
+    """object 배열 → (정규화 문자열 배열, 태그 배열). 문자열(+결측) 컬럼은 값 단위 변환 없이 처리"""
+    if pd.api.types.infer_dtype(arr, skipna=True) in ("string", "empty"):
+        tags = np.full(len(arr), _TAG_STR, dtype=np.uint64)
+        missing = pd.isna(arr)
+        if not missing.any():
+            return arr, tags
+        keys = arr.copy()
+        keys[missing] = [_missing_key(v, distinct_na) for v in arr[missing]]
+        tags[missing] = _TAG_NA
+        return keys, tags
+    pairs = [_object_value_key(v, distinct_na) for v in arr]
+    tags = np.fromiter((t for t, _ in pairs), dtype=np.uint64, count=len(pairs))
+    keys = np.empty(len(pairs), dtype=object)
+    keys[:] = [k for _, k in pairs]
+    return keys, tags
+
+
+def hash_values(values, hash_key: str = DEFAULT_HASH_KEY, distinct_na: bool = False) -> np.ndarray:
+    """
+    값 배열을 64비트 해시(uint64)로 변환 (청크/파티션/테이블 간 동일 값 → 동일 해시).
+    - object 배열은 값 종류 태그를 섞어 해시하므로 문자열 표현만 같은 값(1과 "1")은 구분하고,
+      pandas가 같은 값으로 보는 1 / 1.0 / True는 같은 해시
+    - distinct_na: 결측을 종류별로 구분 (pandas Series.duplicated 기준), 기본은 모든 결측을 같은 값으로 취급
+    """
+    arr = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if arr.dtype != object:
+        return pd.util.hash_array(arr, hash_key=hash_key, categorize=False)
+    keys, tags = _object_keys(arr, distinct_na)
+    with np.errstate(over="ignore"):
+        h = pd.util.hash_array(keys, hash_key=hash_key, categorize=False)
+        return (h ^ (tags * _TAG_MIX)) * _HASH_MULT
+
+
+def row_fingerprints(df: pd.DataFrame, subset=None, hash_key: str = DEFAULT_HASH_KEY) -> np.ndarray:
+    """
+    행 단위 64비트 지문(uint64). 컬럼별 값 해시를 순서 의존적으로 섞어 결합 (pandas hash_pandas_object 방식).
+    - subset: 지문에 포함할 컬럼 (None이면 전체)
+    - 메모리는 행 수 × 8바이트 배열 몇 개뿐이며 행 객체를 만들지 않음
+    - 값 동등성은 df.duplicated()와 같음 (pandas는 컬럼이 하나면 Series.duplicated 경로를 타 결측을 종류별로 구분)
+    """
+    if subset is None:
+        positions = list(range(df.shape[1]))
+    else:
+        keys = set(subset)
+        positions = [i for i, col in enumerate(df.columns) if col in keys]
+    distinct_na = len(positions) == 1
+    h = np.full(len(df), 0x345678, dtype=np.uint64)
+    mult = np.uint64(1000003)
+    with np.errstate(over="ignore"):
+        for i, pos in enumerate(positions):
+            h = (h ^ hash_values(df.iloc[:, pos], hash_key, distinct_na)) * mult
+            mult += np.uint64(82520 + 2 * (len(positions) - i))
+        h += np.uint64(97531)
+    return h
+
+
+# ==========================================================
+# 🧬 2️⃣ 테이블 지문
+# ==========================================================
+def table_fingerprint(df: pd.DataFrame) -> str:
+    """
+    컬럼명·타입·전체 값으로 테이블 지문 생성 (내용이 같으면 같은 값).
+    - 로더가 남긴 df.attrs["source_key"]가 있으면 재계산 없이 그대로 사용
+    """
+    source_key = df.attrs.get("source_key")
+    if source_key:
+        return f"src:{source_key}"
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((len(df), list(map(str, df.columns)), list(map(str, df.dtypes)))).encode())
+    for i in range(df.shape[1]):
+        h.update(hash_values(df.iloc[:, i]).tobytes())
+    return h.hexdigest()
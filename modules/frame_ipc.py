@@ -0,0 +1,162 @@
+# modules/frame_ipc.py
+import pickle
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Arrow로 그대로 왕복되는 numpy dtype 종류 (정수/부호없는 정수/실수/불리언/날짜/시간차)
+_ARROW_KINDS = "iufbMm"
+
+
+# ==========================================================
+# 📦 1️⃣ 프로세스 간 DataFrame 전달 핸들
+# ==========================================================
+@dataclass
+class SharedFrame:
+    """
+    공유 메모리에 Arrow IPC 스트림으로 올린 DataFrame 핸들 (작은 메타데이터만 pickle로 전달).
+    - 숫자/날짜/불리언 컬럼과 순수 문자열 object 컬럼은 Arrow 배치로 공유 메모리에 기록
+    - 타입이 섞인 object 컬럼이나 확장 dtype 컬럼만 컬럼 단위로 pickle 대체 전달
+    """
+    shm_name: str | None
+    size: int
+    columns: object                                   # 원래 컬럼 Index (이름 타입/중복 그대로 보존)
+    index: object                                     # RangeIndex 인자 tuple 또는 pickle된 Index
+    kinds: list = field(default_factory=list)         # 컬럼별 "arrow" | "str" | "pickle"
+    dtypes: list = field(default_factory=list)
+    na_values: list = field(default_factory=list)     # 문자열 컬럼의 결측 표현 (None 또는 NaN)
+    pickled: dict = field(default_factory=dict)       # 컬럼 위치 → pickle bytes
+    attrs: dict = field(default_factory=dict)
+
+
+def _string_column(s: pd.Series):
+    """순수 문자열 object 컬럼이면 (Arrow 배열, 결측 표현) 반환, 아니면 None"""
+    try:
+        arr = pa.array(s.to_numpy(dtype=object), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type) or pa.types.is_null(arr.type)):
+        return None
+
+    na = s[s.isna()]
+    if na.empty:
+        return arr, None
+    if all(x is None for x in na):
+        return arr, None
+    if all(isinstance(x, float) for x in na):
+        return arr, np.nan
+    return None  # None/NaN/NaT 등이 섞인 경우는 정확히 복원할 수 없음
+
+
+# ==========================================================
+# ✍️ 2️⃣ 기록 / 읽기
+# ==========================================================
+def _write_batch(target: memoryview, batch: pa.RecordBatch):
+    """공유 메모리에 직접 IPC 스트림 기록 (함수 종료 시 버퍼 참조가 모두 풀려야 shm.close() 가능)"""
+    with pa.FixedSizeBufferWriter(pa.py_buffer(target)) as sink, pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+
+def write_frame(df: pd.DataFrame, shm_name: str | None = None) -> SharedFrame:
+    """
+    DataFrame을 공유 메모리에 기록하고 핸들 반환 (해제는 read_frame(unlink=True)가 담당).
+    - shm_name을 주면 그 이름으로 생성 (받는 쪽이 핸들을 못 받아도 이름으로 해제할 수 있게)
+    """
+    if isinstance(df.index, pd.RangeIndex):
+        index = (df.index.start, df.index.stop, df.index.step)
+    else:
+        index = pickle.dumps(df.index, protocol=pickle.HIGHEST_PROTOCOL)
+
+    handle = SharedFrame(None, 0, df.columns, index, attrs=dict(df.attrs))
+    arrays, names = [], []
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        kind, na_value = "pickle", None
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in _ARROW_KINDS:
+            arrays.append(pa.array(s.to_numpy()))
+            kind = "arrow"
+        elif s.dtype == object:
+            encoded = _string_column(s)
+            if encoded is not None:
+                arr, na_value = encoded
+                arrays.append(arr)
+                kind = "str"
+        if kind == "pickle":
+            handle.pickled[i] = pickle.dumps(s.to_numpy(), protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            names.append(f"c{i}")
+        handle.kinds.append(kind)
+        handle.dtypes.append(s.dtype)
+        handle.na_values.append(na_value)
+
+    if not arrays:
+        return handle
+
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+    mock = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock, batch.schema) as writer:
+        writer.write_batch(batch)
+    handle.size = mock.size()
+
+    shm = shared_memory.SharedMemory(name=shm_name, create=True, size=handle.size)
+    try:
+        _write_batch(shm.buf, batch)
+    finally:
+        shm.close()
+    handle.shm_name = shm.name
+    return handle
+
+
+def read_frame(handle: SharedFrame, unlink: bool = True) -> pd.DataFrame:
+    """핸들에서 DataFrame 복원 (공유 메모리 내용을 한 번 복사해 온 뒤 닫고, unlink=True면 해제)"""
+    table = None
+    if handle.shm_name is not None:
+        shm = shared_memory.SharedMemory(name=handle.shm_name)
+        try:
+            data = bytes(shm.buf[:handle.size])
+        finally:
+            shm.close()
+            if unlink:
+                shm.unlink()
+        table = pa.ipc.open_stream(data).read_all()
+
+    if isinstance(handle.index, tuple):
+        index = pd.RangeIndex(*handle.index)
+    else:
+        index = pickle.loads(handle.index)
+
+    data = {}
+    for i, (kind, dtype, na_value) in enumerate(zip(handle.kinds, handle.dtypes, handle.na_values)):
+        if kind == "pickle":
+            values = pickle.loads(handle.pickled[i])
+        elif kind == "arrow":
+            values = np.array(table.column(f"c{i}").to_numpy(), dtype=dtype, copy=True)
+        else:
+            values = table.column(f"c{i}").to_numpy(zero_copy_only=False).astype(object, copy=False)
+            if na_value is not None:
+                values[pd.isna(values)] = na_value
+        data[i] = pd.Series(values, index=index, dtype=dtype, copy=False)
+
+    df = pd.DataFrame(data, index=index, copy=False)
+    df.columns = handle.columns
+    df.attrs.update(handle.attrs)
+    return df
+
+
+def release_frame(handle: SharedFrame):
+    """읽지 않고 버리는 핸들의 공유 메모리 해제 (작업 실패 시 정리용)"""
+    if handle.shm_name is not None:
+        release_shared(handle.shm_name)
+
+
+def release_shared(shm_name: str):
+    """이름으로 공유 메모리 해제 (없으면 무시)"""
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
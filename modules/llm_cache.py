@@ -0,0 +1,243 @@
+# modules/llm_cache.py
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))              # 초 (0 이하면 만료 없음)
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+# ==========================================================
+# 🔑 1️⃣ 요청 정규화 해시
+# ==========================================================
+def make_request_key(model: str | None, messages: list, params: dict | None = None) -> str:
+    """모델 + 메시지(프롬프트/페이로드) + 생성 파라미터를 정규화한 JSON의 sha256"""
+    canonical = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _InFlight:
+    """진행 중인 동일 요청의 결과를 기다리는 대기 슬롯"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+# ==========================================================
+# 🗄️ 2️⃣ SQLite 응답 캐시 (TTL + 용량 한도 + 동시 요청 병합)
+# ==========================================================
+class LLMResponseCache:
+    """
+    LLM 응답 문자열을 SQLite에 보관하는 영속 캐시.
+    - TTL이 지난 항목은 조회 시 무시·삭제, 총 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+    - 같은 키의 요청이 동시에 들어오면 첫 요청만 API를 호출하고 나머지는 그 결과를 공유
+    - hit / miss / merged / eviction 카운터 제공 (프로세스 단위)
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight: dict[str, _InFlight] = {}
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.merged = 0
+        self.evictions = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._conn = conn
+        return self._conn
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self._expired(row[1], now):
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:  # 단일 항목이 한도를 넘으면 캐시하지 않음
+            return
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        if self.ttl > 0:
+            cur = db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self.evictions += max(cur.rowcount, 0)
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def _claim(self, key: str) -> tuple[_InFlight, bool]:
+        """같은 키의 진행 중 슬롯 → (슬롯, 직접 계산해야 하는지)"""
+        with self._lock:
+            slot = self._inflight.get(key)
+            if slot is None:
+                slot = self._inflight[key] = _InFlight()
+                return slot, True
+            self.merged += 1
+            return slot, False
+
+    def _release(self, key: str, slot: _InFlight):
+        with self._lock:
+            self._inflight.pop(key, None)
+        slot.done.set()
+
+    def get_or_compute(self, key: str, compute) -> tuple[str, bool]:
+        """
+        캐시 조회 후 없으면 compute()로 생성·저장 → (응답, 캐시 사용 여부).
+        - 같은 키를 계산 중인 요청이 있으면 새로 호출하지 않고 그 결과를 기다림 (예외도 그대로 전달)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        slot, owner = self._claim(key)
+        if not owner:
+            slot.done.wait()
+            if slot.error is not None:
+                raise slot.error
+            return slot.value, True
+
+        try:
+            slot.value = compute()
+            self.put(key, slot.value)
+            return slot.value, False
+        except BaseException as e:
+            slot.error = e
+            raise
+        finally:
+            self._release(key, slot)
+
+    async def aget_or_compute(self, key: str, compute) -> tuple[str, bool]:
+        """
+        get_or_compute의 비동기 버전 (compute는 코루틴 함수).
+        - 동기·비동기 호출이 같은 진행 중 슬롯을 공유하므로 어느 쪽에서 먼저 요청해도 한 번만 호출
+        - 대기는 별도 스레드에서 하므로 이벤트 루프를 막지 않음
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        slot, owner = self._claim(key)
+        if not owner:
+            await asyncio.to_thread(slot.done.wait)
+            if slot.error is not None:
+                raise slot.error
+            return slot.value, True
+
+        try:
+            slot.value = await compute()
+            self.put(key, slot.value)
+            return slot.value, False
+        except BaseException as e:
+            slot.error = e
+            raise
+        finally:
+            self._release(key, slot)
+
+    def discard(self, key: str) -> bool:
+        """항목 하나 삭제 (응답이 쓸모없는 것으로 확인된 경우) → 삭제 여부"""
+        with self._lock:
+            cur = self._db().execute("DELETE FROM responses WHERE key = ?", (key,))
+            return cur.rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "merged": self.merged,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# ==========================================================
+# 🤖 3️⃣ 캐시를 거치는 Chat Completion 호출
+# ==========================================================
+def cached_completion(client, model: str | None, messages: list, cache: "LLMResponseCache | None" = None,
+                      **params) -> tuple[str, bool]:
+    """
+    client.chat.completions.create 결과 텍스트를 캐시 경유로 반환 → (응답, 캐시 사용 여부).
+    - 성공한 응답만 저장하며, cache=None이면 프로세스 전역 llm_cache 사용
+    """
+    cache = cache or llm_cache
+    key = make_request_key(model, messages, params)
+
+    def compute():
+        resp = client.chat.completions.create(model=model, messages=messages, **params)
+        return resp.choices[0].message.content.strip()
+
+    return cache.get_or_compute(key, compute)
+
+
+def discard_completion(model: str | None, messages: list, cache: "LLMResponseCache | None" = None,
+                       **params) -> bool:
+    """cached_completion과 같은 인자로 캐시 항목 삭제 (응답을 써 보니 실패한 경우, 다음 요청은 새로 생성)"""
+    return (cache or llm_cache).discard(make_request_key(model, messages, params))
+
+
+# 프로세스 전역 캐시 (Streamlit rerun / 세션 간 공유)
+llm_cache = LLMResponseCache()
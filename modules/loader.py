@@ -3,33 +3,336 @@ import json
 import xml.etree.ElementTree as ET
 import zipfile
 import io
+import os
+import contextlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from modules.parse_cache import parse_cache, hash_stream, make_cache_key
+from modules.text_detector import detect_text_format, fallback_formats
+
+LOADER_STREAM_BYTES = int(os.getenv("LOADER_STREAM_BYTES", 256 * 1024 * 1024))  # 넘는 CSV/TXT는 DataFrame으로 올리지 않음
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", 100_000))
+
+
+# ==========================================================
+# 🌊 1️⃣ 청크 단위 CSV/TXT 스트리밍 리더
+# ==========================================================
+def iter_csv_chunks(file_obj, chunksize: int = 100_000, dtype=None, content_hash: str | None = None):
+    """
+    CSV/TXT를 chunksize 행 단위 DataFrame으로 순차 반환 (메모리 사용량 ∝ chunksize).
+    - 인코딩/구분자/헤더는 앞부분 샘플로만 판단하고, 전체 내용을 디코딩해 복사하지 않음
+    - 이미 내보낸 청크는 되돌릴 수 없으므로 샘플 이후의 디코딩 불가 바이트는 대체 문자로 읽음
+    - dtype을 지정하면 모든 청크에 동일하게 적용 (청크마다 타입이 달라지는 문제 방지)
+    """
+    fmt = detect_text_format(file_obj, content_hash)
+    with pd.read_csv(file_obj, dtype=dtype, chunksize=chunksize, **fmt.read_csv_kwargs()) as reader:
+        yield from reader
+
+
+def read_csv_head(file_obj, n: int = 5, content_hash: str | None = None) -> pd.DataFrame:
+    """앞 n행만 읽기 (미리보기용, 나머지 내용은 파싱하지 않음)"""
+    file_obj.seek(0)
+    return next(iter_csv_chunks(file_obj, chunksize=n, content_hash=content_hash), pd.DataFrame())
+
+
+def read_csv_file(file_obj, options: dict | None = None, content_hash: str | None = None) -> pd.DataFrame:
+    """
+    CSV/TXT를 DataFrame으로 읽기.
+    - options["chunksize"]가 있으면 청크 단위로 읽어 결합
+    - options["dtype"]으로 컬럼 타입을 명시 가능
+    - 샘플 이후에 감지한 인코딩으로 읽을 수 없는 바이트가 나오면 다른 후보 인코딩으로 다시 파싱하고,
+      모두 실패하면 감지한 인코딩으로 읽되 해당 바이트만 대체 문자로 (정상 파일은 한 번만 디코딩)
+    """
+    options = options or {}
+    chunksize = options.get("chunksize")
+    dtype = options.get("dtype")
+
+    if chunksize:
+        chunks = list(iter_csv_chunks(file_obj, chunksize=chunksize, dtype=dtype, content_hash=content_hash))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    fmt = detect_text_format(file_obj, content_hash)
+    for candidate in [fmt, *fallback_formats(fmt)]:
+        file_obj.seek(0)
+        try:
+            return pd.read_csv(file_obj, dtype=dtype, **candidate.read_csv_kwargs(errors="strict"))
+        except UnicodeDecodeError:
+            continue
+    file_obj.seek(0)
+    return pd.read_csv(file_obj, dtype=dtype, **fmt.read_csv_kwargs())
+
+
+# ==========================================================
+# 🌲 2️⃣ iterparse 기반 XML 스트리밍 리더
+# ==========================================================
+def _local_tag(tag) -> str:
+    """'{namespace}tag' 형태에서 네임스페이스 제거"""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else str(tag)
+
+
+def _flatten_xml_element(elem, prefix: str, record: dict):
+    """
+    하위 요소와 속성을 점(.) 구분 컬럼으로 평탄화 (json_normalize 방식).
+    - <addr type="home"><city>Seoul</city></addr> → addr.type, addr.city
+    - 같은 이름의 형제 요소가 반복되면 tag, tag.1, tag.2 … 로 구분
+    """
+    for attr, value in elem.attrib.items():
+        record[f"{prefix}{_local_tag(attr)}"] = value
+
+    seen = {}
+    for child in elem:
+        if not isinstance(child.tag, str):
+            continue  # 주석/처리 지시문 스킵
+        tag = _local_tag(child.tag)
+        idx = seen.get(tag, 0)
+        seen[tag] = idx + 1
+        key = f"{prefix}{tag}" if idx == 0 else f"{prefix}{tag}.{idx}"
+
+        if len(child) == 0:
+            record[key] = child.text
+            for attr, value in child.attrib.items():
+                record[f"{key}.{_local_tag(attr)}"] = value
+        else:
+            _flatten_xml_element(child, f"{key}.", record)
+
+
+def _flatten_xml_record(elem) -> dict:
+    record = {}
+    if len(elem) == 0 and elem.text and elem.text.strip():
+        record[_local_tag(elem.tag)] = elem.text
+    _flatten_xml_element(elem, "", record)
+    return record
+
+
+def iter_xml_batches(file_obj, batch_size: int = 10_000):
+    """
+    루트의 직계 자식을 레코드로 보고 batch_size개씩 DataFrame으로 순차 반환.
+    - 레코드가 닫히는 즉시 평탄화 후 트리에서 제거하므로 전체 DOM을 메모리에 올리지 않음
+    """
+    root, depth, batch = None, 0, []
+    for event, elem in ET.iterparse(file_obj, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1:
+            batch.append(_flatten_xml_record(elem))
+            root.clear()  # 처리 완료된 레코드 해제
+            if len(batch) >= batch_size:
+                yield pd.DataFrame(batch)
+                batch = []
+
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def read_xml_file(file_obj, options: dict | None = None) -> pd.DataFrame:
+    """XML을 배치 단위로 읽어 하나의 DataFrame으로 결합"""
+    batch_size = (options or {}).get("xml_batch_size", 10_000)
+    batches = list(iter_xml_batches(file_obj, batch_size=batch_size))
+    if not batches:
+        return pd.DataFrame()
+    return pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+
+
+# ==========================================================
+# 🧾 3️⃣ JSON / NDJSON 스트리밍 리더
+# ==========================================================
+JSON_READ_BLOCK = 1024 * 1024
+JSON_WS = " \t\r\n"
+MISSING = float("nan")  # 키가 없는 레코드의 값 (json_normalize와 동일하게 NaN, 명시적 null은 None 유지)
+
+
+def _flatten_json_record(obj: dict, prefix: str = "") -> dict:
+    """중첩 dict를 점(.) 구분 키로 평탄화 (json_normalize와 동일한 컬럼 순서: 스칼라 먼저, 중첩은 뒤에)"""
+    flat, nested = {}, []
+    for k, v in obj.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            nested.append((key, v))
+        else:
+            flat[key] = v
+    for key, v in nested:
+        flat.update(_flatten_json_record(v, f"{key}."))
+    return flat
+
+
+def _iter_json_array(reader, buf: str):
+    """'[' 이후의 텍스트 스트림에서 배열 원소를 하나씩 디코딩해 반환"""
+    decoder = json.JSONDecoder()
+    pos, block, eof = 0, JSON_READ_BLOCK, False
+
+    def refill():
+        nonlocal buf, pos, block, eof
+        chunk = reader.read(block)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and (buf[pos] in JSON_WS or buf[pos] == ","):
+            pos += 1
+        if pos >= len(buf):
+            if not refill():
+                raise ValueError("JSON 배열이 ']'로 끝나지 않았습니다.")
+            continue
+        if buf[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not refill():
+                raise
+            block *= 2  # 블록보다 큰 레코드는 읽기 크기를 늘려 재시도
+            continue
+        # 버퍼 끝에 걸친 숫자/리터럴은 잘렸을 수 있으므로 더 읽고 다시 판단
+        if end == len(buf) and not eof and refill():
+            continue
+        yield obj
+        pos = end
+
+
+def _iter_json_records(file_obj):
+    """
+    JSON 형식을 판별해 레코드를 순차 반환.
+    - '[' 로 시작: 레코드 배열 → 원소 단위 스트리밍
+    - 첫 줄이 완결된 JSON이고 다음 줄이 있으면: NDJSON → 줄 단위 스트리밍
+    - 그 외(단일 객체 문서): 통째로 읽어 1건 처리 (기존 동작)
+    """
+    reader = io.TextIOWrapper(file_obj, encoding="utf-8-sig")
+    try:
+        head = reader.read(JSON_READ_BLOCK)
+        stripped = head.lstrip(JSON_WS)
+
+        if stripped.startswith("["):
+            yield from _iter_json_array(reader, stripped[1:])
+            return
+
+        first_line, sep, rest = stripped.partition("\n")
+        try:
+            first = json.loads(first_line)
+            if sep and not rest.strip():
+                rest += reader.read(JSON_READ_BLOCK)
+            is_ndjson = bool(sep) and bool(rest.strip())
+        except json.JSONDecodeError:
+            is_ndjson = False
+
+        if not is_ndjson:
+            yield json.loads(head + reader.read())
+            return
+
+        yield first
+        # head에 남은 부분과 이후 스트림을 줄 단위로 처리 (마지막 미완성 줄은 다음 청크와 결합)
+        lines = rest.split("\n")
+        tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        for line in reader:
+            line = tail + line
+            tail = ""
+            if line.strip():
+                yield json.loads(line)
+        if tail.strip():
+            yield json.loads(tail)
+    finally:
+        reader.detach()
+
+
+def iter_json_batches(file_obj, batch_size: int = 10_000, sample_size: int = 1_000):
+    """
+    JSON/NDJSON 레코드를 평탄화해 batch_size개씩 DataFrame으로 순차 반환.
+    - 첫 sample_size개 레코드로 컬럼 스키마를 정하고, 이후 새 키가 나오면 컬럼을 추가
+    - 레코드를 컬럼별 리스트에 바로 적재해 DataFrame 생성 (행 dict 리스트를 거치지 않음)
+    """
+    schema: list[str] = []
+    known: set[str] = set()
+    columns: dict[str, list] = {}
+    n_rows = 0
+
+    def add(flat: dict):
+        nonlocal n_rows
+        for key in flat:
+            if key not in known:  # 샘플 이후 처음 등장한 키 → 컬럼 추가 (이전 행은 결측)
+                known.add(key)
+                schema.append(key)
+                columns[key] = [MISSING] * n_rows
+        for key in schema:
+            columns.setdefault(key, [MISSING] * n_rows).append(flat.get(key, MISSING))
+        n_rows += 1
+
+    def flush():
+        nonlocal columns, n_rows
+        df = pd.DataFrame(columns, columns=schema)
+        columns, n_rows = {}, 0
+        return df
+
+    sample: list[dict] | None = []
+    for obj in _iter_json_records(file_obj):
+        flat = _flatten_json_record(obj) if isinstance(obj, dict) else {"value": obj}
+        if sample is not None:
+            sample.append(flat)
+            if len(sample) < sample_size:
+                continue
+            # 샘플로 스키마(컬럼 순서)를 확정한 뒤 적재 시작
+            for key in dict.fromkeys(k for rec in sample for k in rec):
+                known.add(key)
+                schema.append(key)
+            records, sample = sample, None
+        else:
+            records = (flat,)
+
+        for rec in records:
+            add(rec)
+            if n_rows >= batch_size:
+                yield flush()
+
+    for rec in sample or ():
+        add(rec)
+    if n_rows:
+        yield flush()
+
+
+def read_json_file(file_obj, options: dict | None = None) -> pd.DataFrame:
+    """JSON/NDJSON을 배치 단위로 읽어 하나의 DataFrame으로 결합"""
+    batch_size = (options or {}).get("json_batch_size", 10_000)
+    batches = list(iter_json_batches(file_obj, batch_size=batch_size))
+    if not batches:
+        return pd.DataFrame()
+    return pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+
 
 # ==========================================================
-# 🧩 1️⃣ 개별 파일 파서 (공통 함수)
+# 🧩 4️⃣ 개별 파일 파서 (공통 함수)
 # ==========================================================
-def parse_file_to_df(file_obj, filename: str) -> pd.DataFrame | None:
-    """파일 객체와 이름을 받아 확장자에 따라 DataFrame으로 변환"""
+def parse_file_to_df(file_obj, filename: str, options: dict | None = None,
+                     content_hash: str | None = None) -> pd.DataFrame | None:
+    """
+    파일 객체와 이름을 받아 확장자에 따라 DataFrame으로 변환
+    - content_hash: CSV/TXT 형식 감지 결과를 파일 내용별로 재사용하기 위한 키 (선택)
+    """
     try:
-        if filename.endswith(".csv"):
-            return pd.read_csv(file_obj)
+        if filename.endswith((".csv", ".txt")):
+            return read_csv_file(file_obj, options, content_hash)
 
         elif filename.endswith(".xlsx"):
             return pd.read_excel(file_obj)
 
-        elif filename.endswith(".json"):
-            return pd.json_normalize(json.load(file_obj))
+        elif filename.endswith((".json", ".jsonl", ".ndjson")):
+            return read_json_file(file_obj, options)
 
         elif filename.endswith(".xml"):
-            tree = ET.parse(file_obj)
-            root = tree.getroot()
-            data = [{child.tag: child.text for child in elem} for elem in root]
-            return pd.DataFrame(data)
-
-        elif filename.endswith(".txt"):
-            content = file_obj.read().decode("utf-8", errors="ignore")
-            # 자동 구분자 탐색
-            delim = "," if "," in content else "\t" if "\t" in content else ";"
-            return pd.read_csv(io.StringIO(content), delimiter=delim)
+            return read_xml_file(file_obj, options)
 
         else:
             print(f"⚠️ 지원되지 않는 파일 형식: {filename}")
@@ -41,33 +344,181 @@ def parse_file_to_df(file_obj, filename: str) -> pd.DataFrame | None:
 
 
 # ==========================================================
-# 📦 2️⃣ 업로드 파일 로더 (ZIP 포함)
+# 🗃️ 5️⃣ 캐시 경유 파서
 # ==========================================================
-def load_uploaded_files(uploaded_files):
+def parse_with_cache(open_file, filename: str, cache_key: str, options: dict | None = None,
+                     content_hash: str | None = None) -> pd.DataFrame | None:
+    """
+    캐시를 먼저 조회하고, 없을 때만 open_file()로 파일을 열어 파싱.
+    - open_file: 파일 객체를 돌려주는 context manager 팩토리 (캐시 히트 시 호출되지 않음)
+    """
+    df = parse_cache.get(cache_key)
+    if df is not None:
+        return df
+
+    with open_file() as file_obj:
+        df = parse_file_to_df(file_obj, filename, options, content_hash)
+    if df is not None:
+        df.attrs["source_key"] = cache_key  # 요약/프로파일 캐시에서 원본 식별용
+        parse_cache.put(cache_key, df)
+    return df
+
+
+# ==========================================================
+# 🗜️ 6️⃣ ZIP 멤버 병렬 파싱
+# ==========================================================
+DEFAULT_ZIP_WORKERS = int(os.getenv("LOADER_ZIP_WORKERS", min(8, os.cpu_count() or 1)))
+
+_worker_zip_bytes = None  # 프로세스 풀 워커별 ZIP 원본 (initializer에서 1회 전달)
+
+
+def _init_zip_worker(zip_bytes: bytes):
+    global _worker_zip_bytes
+    _worker_zip_bytes = zip_bytes
+
+
+def _member_hash(zip_hash: str, inner_name: str) -> str:
+    """ZIP 멤버 식별자: (ZIP 해시 + 멤버 경로)"""
+    return f"{zip_hash}!{inner_name}"
+
+
+def _parse_zip_member(zip_bytes, inner_name: str, options: dict | None, member_hash: str) -> pd.DataFrame | None:
+    """ZIP 원본에서 멤버 하나를 독립적으로 열어 파싱 (워커마다 별도 ZipFile 핸들 사용)"""
+    if zip_bytes is None:
+        zip_bytes = _worker_zip_bytes
+    try:
+        with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as z, z.open(inner_name) as inner_file:
+            return parse_file_to_df(inner_file, inner_name.lower(), options, member_hash)
+    except Exception as e:
+        print(f"❌ {inner_name} 처리 중 오류: {e}")
+        return None
+
+
+def load_zip_members(file, content_hash: str, options: dict | None = None,
+                     workers: int = DEFAULT_ZIP_WORKERS, executor: str = "thread") -> dict:
+    """
+    ZIP 내부 파일을 DataFrame dict로 반환.
+    - 캐시에 없는 멤버만 파싱하며, workers > 1이면 스레드/프로세스 풀에서 병렬 처리
+    - 큰 멤버부터 먼저 시작하고, 결과 키 순서는 순차 처리(namelist 순서)와 동일
+    - 한 멤버가 실패해도 나머지 멤버 처리는 계속됨
+    """
+    with zipfile.ZipFile(file, "r") as z:
+        members = [info for info in z.infolist() if not info.filename.endswith("/")]  # 폴더는 스킵
+
+    parsed, pending = {}, []
+    for info in members:
+        # ZIP 멤버는 (ZIP 해시 + 멤버 경로)로 식별 → 캐시 히트 시 압축 해제도 생략
+        key = make_cache_key(_member_hash(content_hash, info.filename), info.filename.lower(), options)
+        df = parse_cache.get(key)
+        if df is not None:
+            parsed[info.filename] = df
+        else:
+            pending.append((info, key))
+
+    if pending:
+        # BytesIO(UploadedFile)는 getvalue()가 내부 버퍼를 복사 없이 반환
+        if hasattr(file, "getvalue"):
+            zip_bytes = file.getvalue()
+        else:
+            file.seek(0)
+            zip_bytes = file.read()
+            file.seek(0)
+        pending.sort(key=lambda p: p[0].file_size, reverse=True)
+
+        if workers <= 1 or len(pending) == 1:
+            results = {
+                info.filename: _parse_zip_member(zip_bytes, info.filename, options, _member_hash(content_hash, info.filename))
+                for info, _ in pending
+            }
+        else:
+            n_workers = min(workers, len(pending))
+            if executor == "process":
+                pool = ProcessPoolExecutor(
+                    max_workers=n_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_zip_worker,
+                    initargs=(zip_bytes,),
+                )
+                task_bytes = None
+            else:
+                pool = ThreadPoolExecutor(max_workers=n_workers)
+                task_bytes = zip_bytes
+
+            with pool:
+                futures = {
+                    info.filename: pool.submit(
+                        _parse_zip_member, task_bytes, info.filename, options, _member_hash(content_hash, info.filename)
+                    )
+                    for info, _ in pending
+                }
+                results = {}
+                for name, fut in futures.items():
+                    try:
+                        results[name] = fut.result()
+                    except Exception as e:
+                        print(f"❌ {name} 처리 중 오류: {e}")
+                        results[name] = None
+
+        for info, key in pending:
+            df = results.get(info.filename)
+            if df is not None:
+                df.attrs["source_key"] = key
+                parse_cache.put(key, df)
+                parsed[info.filename] = df
+
+    return {info.filename: parsed[info.filename] for info in members if info.filename in parsed}
+
+
+# ==========================================================
+# 📦 7️⃣ 업로드 파일 로더 (ZIP 포함)
+# ==========================================================
+def _upload_size(file) -> int:
+    size = getattr(file, "size", None)
+    if size is not None:
+        return size
+    pos = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(pos)
+    return size
+
+
+def split_large_uploads(uploaded_files, threshold: int = LOADER_STREAM_BYTES) -> tuple[list, dict]:
+    """
+    업로드 파일을 (일반 파일 list, 대용량 CSV/TXT dict: 파일명 → 파일 객체)로 분리.
+    - 대용량 CSV/TXT는 DataFrame으로 올리지 않고 iter_csv_chunks로 청크 단위 프로파일링·전처리
+    - threshold <= 0이면 분리하지 않음
+    """
+    regular, large = [], {}
+    for file in uploaded_files:
+        if threshold > 0 and file.name.lower().endswith((".csv", ".txt")) and _upload_size(file) > threshold:
+            large[file.name] = file
+        else:
+            regular.append(file)
+    return regular, large
+
+
+def load_uploaded_files(uploaded_files, options: dict | None = None,
+                        zip_workers: int = DEFAULT_ZIP_WORKERS, zip_executor: str = "thread"):
     """
     Streamlit uploader에서 넘어온 파일 리스트를 읽어 DataFrame dict로 반환.
-    - zip 파일일 경우 내부 파일을 자동 해제하여 함께 반환
+    - zip 파일일 경우 내부 파일을 자동 해제하여 함께 반환 (zip_workers개 워커로 병렬 파싱)
+    - 내용이 바뀌지 않은 파일은 해시 계산만 하고 캐시된 결과를 재사용
     """
     dfs = {}
 
     for file in uploaded_files:
         filename = file.name.lower()
+        content_hash = hash_stream(file)
 
         # ---- ZIP 파일 처리 ----
         if filename.endswith(".zip"):
-            with zipfile.ZipFile(file, "r") as z:
-                for inner_name in z.namelist():
-                    if inner_name.endswith("/"):
-                        continue  # 폴더는 스킵
-
-                    with z.open(inner_name) as inner_file:
-                        df = parse_file_to_df(inner_file, inner_name.lower())
-                        if df is not None:
-                            dfs[inner_name] = df
+            dfs.update(load_zip_members(file, content_hash, options, zip_workers, zip_executor))
 
         # ---- 단일 파일 처리 ----
         else:
-            df = parse_file_to_df(file, filename)
+            key = make_cache_key(content_hash, filename, options)
+            df = parse_with_cache(lambda: contextlib.nullcontext(file), filename, key, options, content_hash)
             if df is not None:
                 dfs[file.name] = df
 
@@ -0,0 +1,105 @@
+# modules/parse_cache.py
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ==========================================================
+# 🔑 1️⃣ 콘텐츠 해시 / 캐시 키
+# ==========================================================
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_stream(file_obj) -> str:
+    """파일 객체 내용을 블록 단위로 읽어 sha256 해시 계산 (읽은 뒤 위치는 처음으로 되돌림)"""
+    h = hashlib.sha256()
+    file_obj.seek(0)
+    while True:
+        block = file_obj.read(HASH_BLOCK_SIZE)
+        if not block:
+            break
+        h.update(block)
+    file_obj.seek(0)
+    return h.hexdigest()
+
+
+def make_cache_key(content_hash: str, filename: str, options: dict | None = None) -> str:
+    """콘텐츠 해시 + 파일명(확장자 판단용) + 파서 옵션으로 캐시 키 생성"""
+    opts = json.dumps(options or {}, sort_keys=True, default=str)
+    return f"{content_hash}:{filename}:{opts}"
+
+
+def estimate_df_bytes(df: pd.DataFrame) -> int:
+    """DataFrame의 실제 메모리 사용량(바이트) 추정"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+# ==========================================================
+# 🗃️ 2️⃣ 메모리 한도 기반 LRU 파싱 캐시
+# ==========================================================
+class ParseCache:
+    """
+    파싱된 DataFrame을 콘텐츠 해시 기준으로 보관하는 LRU 캐시.
+    - 총 메모리 사용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - hit / miss / eviction 카운터 제공
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            # 호출 측에서 컬럼을 추가/삭제해도 캐시 원본이 바뀌지 않도록 얕은 복사본 반환
+            return item[0].copy(deep=False)
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        size = estimate_df_bytes(df)
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            # 단일 항목이 한도를 넘으면 캐시하지 않음
+            if size > self.max_bytes:
+                return
+            self._items[key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._items:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# 프로세스 전역 캐시 (Streamlit rerun 간 공유)
+parse_cache = ParseCache(max_bytes=int(os.getenv("PARSE_CACHE_MAX_BYTES", 1024 * 1024 * 1024)))
@@ -1,22 +1,240 @@
 import pandas as pd
+import numpy as np
 import json
 import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from modules.dedup import find_duplicates
+from modules.loader import STREAM_CHUNK_ROWS, iter_csv_chunks
+from modules.sketches import TableSketch
 from openai import AzureOpenAI
 
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", min(8, os.cpu_count() or 1)))
+TYPE_MISMATCH_RATIO = 0.9
+APPROX_PROFILE_ROWS = int(os.getenv("APPROX_PROFILE_ROWS", 10_000_000))
+APPROX_PARTITION_ROWS = 1_000_000
+
+
+# ====================================================
+# 📐 0. 컬럼 단위 프로파일링 엔진
+# ====================================================
+def _nunique(s: pd.Series) -> int:
+    """고유값 개수 (정수 컬럼은 값 범위가 좁으면 해시 대신 bincount 사용)"""
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "iu" and len(s):
+        values = s.to_numpy()
+        lo, hi = int(values.min()), int(values.max())
+        if hi - lo <= 4 * len(values):
+            return int(np.count_nonzero(np.bincount(values - lo)))
+    try:
+        return int(s.nunique())
+    except TypeError:  # list/dict 등 해시 불가 값(JSON 배열 등)은 문자열 기준으로 계산
+        return int(s.dropna().astype(str).nunique())
+
+
+def _object_missing_unique(s: pd.Series) -> tuple[int, int]:
+    """object 컬럼은 factorize 한 번으로 결측 수와 고유값 수를 함께 계산"""
+    try:
+        codes, uniques = pd.factorize(s)
+        return int((codes == -1).sum()), len(uniques)
+    except TypeError:
+        return int(s.isna().sum()), _nunique(s)
+
+
+def _type_mismatch(s: pd.Series) -> dict | None:
+    """object 컬럼의 실제 값 타입을 고유값 기준으로 추정해 선언 타입과 다르면 반환"""
+    if s.dtype != object:
+        return None
+    try:
+        uniques = pd.Series(s.dropna().unique())
+    except TypeError:
+        return None
+    if uniques.empty:
+        return None
+
+    inferred = pd.api.types.infer_dtype(uniques, skipna=True)
+    if inferred in ("mixed", "mixed-integer", "mixed-integer-float"):
+        return {"declared": "object", "inferred": inferred}
+    if inferred == "string":
+        ratio = pd.to_numeric(uniques, errors="coerce").notna().mean()
+        if ratio >= TYPE_MISMATCH_RATIO:
+            return {"declared": "object", "inferred": "numeric", "ratio": round(float(ratio), 3)}
+    return None
+
+
+def _min_max(df: pd.DataFrame) -> tuple[dict, dict]:
+    """숫자/날짜/불리언 컬럼의 최솟값·최댓값을 블록 단위로 한 번에 계산"""
+    cols = df.select_dtypes(include=["number", "datetime", "datetimetz", "bool"]).columns
+    if len(cols) == 0:
+        return {}, {}
+    sub = df[cols]
+    return sub.min().to_dict(), sub.max().to_dict()
+
+
+def profile_dataframe(df: pd.DataFrame, metrics=("missing", "unique", "minmax", "type_mismatch"),
+                      max_workers: int = PROFILE_WORKERS) -> dict:
+    """
+    결측·고유값·최소/최대·타입 불일치를 가능한 적은 컬럼 패스로 계산.
+    - 결측/최소/최대는 DataFrame 전체에 벡터 연산 한 번
+    - 고유값/타입 추정은 컬럼별 작업을 스레드 풀에서 병렬 실행
+    - 패스별 소요 시간(초)을 timings에 기록 (결측·고유값을 함께 구하는 패스는 "missing+unique" 하나로)
+    """
+    result, timings = {}, {}
+    columns = list(df.columns)
+    workers = max(1, min(max_workers, len(columns)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if "missing" in metrics or "unique" in metrics:
+            t0 = time.perf_counter()
+            is_obj = [dt == object for dt in df.dtypes]
+            obj_idx = [i for i, o in enumerate(is_obj) if o]
+            other_idx = [i for i, o in enumerate(is_obj) if not o]
+
+            # object 컬럼: 결측+고유값을 컬럼당 한 번의 해시 패스로
+            obj_stats = dict(zip(obj_idx, pool.map(lambda i: _object_missing_unique(df.iloc[:, i]), obj_idx)))
+
+            # 그 외 컬럼: 결측은 블록 단위 벡터 연산 한 번
+            other_missing = df.iloc[:, other_idx].isna().sum().to_numpy() if other_idx else []
+            missing = {i: int(m) for i, m in zip(other_idx, other_missing)}
+            missing.update({i: stats[0] for i, stats in obj_stats.items()})
+
+            if "missing" in metrics:
+                result["missing_values"] = {col: missing[i] for i, col in enumerate(columns)}
+
+            if "unique" in metrics:
+                counts = dict(zip(other_idx, pool.map(lambda i: _nunique(df.iloc[:, i]), other_idx)))
+                counts.update({i: stats[1] for i, stats in obj_stats.items()})
+                result["unique_values"] = {col: counts[i] for i, col in enumerate(columns)}
+            timings["+".join(m for m in ("missing", "unique") if m in metrics)] = time.perf_counter() - t0
+
+        if "minmax" in metrics:
+            t0 = time.perf_counter()
+            result["min"], result["max"] = _min_max(df)
+            timings["minmax"] = time.perf_counter() - t0
+
+        if "type_mismatch" in metrics:
+            t0 = time.perf_counter()
+            found = pool.map(lambda i: _type_mismatch(df.iloc[:, i]), range(len(columns)))
+            result["type_mismatches"] = {col: m for col, m in zip(columns, found) if m}
+            timings["type_mismatch"] = time.perf_counter() - t0
+
+    result["timings"] = {k: round(v, 4) for k, v in timings.items()}
+    return result
+
+
+def sketch_dataframe(df: pd.DataFrame, error: float = 0.01, partition_rows: int = APPROX_PARTITION_ROWS,
+                     max_workers: int = PROFILE_WORKERS, seed: int | None = 0) -> TableSketch:
+    """
+    행 파티션별로 TableSketch를 병렬 생성한 뒤 병합 (청크 로딩 결과에도 같은 방식으로 사용 가능).
+    - error: 고유값 상대오차 / 분위수 순위오차 목표치
+    """
+    starts = range(0, max(len(df), 1), partition_rows)
+
+    def build(start):
+        sketch = TableSketch(error=error, seed=None if seed is None else seed + start)
+        sketch.update(df.iloc[start:start + partition_rows])
+        return sketch
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(starts)))) as pool:
+        sketches = list(pool.map(build, starts))
+
+    merged = sketches[0]
+    for other in sketches[1:]:
+        merged.merge(other)
+    return merged
+
+
+def summarize_csv_stream(file_obj, name: str, content_hash: str | None = None, error: float = 0.01,
+                         chunksize: int = STREAM_CHUNK_ROWS) -> dict:
+    """
+    대용량 CSV/TXT를 DataFrame으로 올리지 않고 청크 단위 TableSketch로 요약 (approx 요약과 같은 형식).
+    - 메모리 사용량은 청크 하나 + 스케치 크기에 비례
+    - content_hash가 있으면 같은 내용의 rerun에서 요약 재사용
+    """
+    cache_key = (content_hash, name, "stream", error) if content_hash else None
+    if cache_key:
+        with _summary_lock:
+            cached = _summary_cache.get(cache_key)
+            if cached is not None:
+                _summary_cache.move_to_end(cache_key)
+                return dict(cached)
+
+    sketch = TableSketch(error=error, seed=0)
+    file_obj.seek(0)
+    for chunk in iter_csv_chunks(file_obj, chunksize=chunksize, content_hash=content_hash):
+        sketch.update(chunk)
+    summary = sketch.to_summary(name)
+    summary["approx"]["source"] = f"chunked stream ({chunksize:,}행 단위)"
+
+    if cache_key:
+        with _summary_lock:
+            _summary_cache[cache_key] = summary
+            while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return dict(summary)
+
+
 # ====================================================
 # 🔧 1. 기본 데이터 요약 함수
 # ====================================================
-def summarize_dataframe(df: pd.DataFrame, name: str):
-    """각 데이터프레임의 기본 메타정보 및 통계 요약 생성"""
+_SUMMARY_CACHE_SIZE = 256
+_summary_cache: OrderedDict[tuple, dict] = OrderedDict()
+_summary_lock = threading.Lock()
+
+
+def summarize_dataframe(df: pd.DataFrame, name: str, with_timings: bool = False,
+                        mode: str = "auto", approx_error: float = 0.01):
+    """
+    각 데이터프레임의 기본 메타정보 및 통계 요약 생성
+    - 로더가 남긴 df.attrs["source_key"](콘텐츠 해시)가 있으면 rerun 시 캐시된 요약 재사용
+    - with_timings=True면 지표별 소요 시간을 "timings"에 추가
+    - mode: "exact" | "approx" | "auto"(APPROX_PROFILE_ROWS 행 이상이면 approx)
+      approx는 HLL 고유값·저수지 샘플·KLL 분위수를 쓰며 오차 범위를 "approx"에 기록
+    """
+    if mode == "auto":
+        mode = "approx" if len(df) >= APPROX_PROFILE_ROWS else "exact"
+
+    source_key = df.attrs.get("source_key")
+    cache_key = (source_key, name, mode, approx_error) if source_key else None
+    if cache_key:
+        with _summary_lock:
+            cached = _summary_cache.get(cache_key)
+            if cached is not None:
+                _summary_cache.move_to_end(cache_key)
+                return {k: v for k, v in cached.items() if with_timings or k != "timings"}
+
+    if mode == "approx":
+        t0 = time.perf_counter()
+        summary = sketch_dataframe(df, error=approx_error).to_summary(name)
+        summary["timings"] = {"sketch": round(time.perf_counter() - t0, 4)}
+    else:
+        summary = _exact_summary(df, name)
+
+    if cache_key:
+        with _summary_lock:
+            _summary_cache[cache_key] = summary
+            while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return {k: v for k, v in summary.items() if with_timings or k != "timings"}
+
+
+def _exact_summary(df: pd.DataFrame, name: str) -> dict:
+    profile = profile_dataframe(df)
     return {
         "파일명": name,
         "shape": df.shape,
         "columns": list(df.columns),
         "types": df.dtypes.astype(str).to_dict(),
-        "missing_values": df.isnull().sum().to_dict(),
-        "unique_values": {col: df[col].nunique() for col in df.columns},
+        "missing_values": profile["missing_values"],
+        "unique_values": profile["unique_values"],
+        "min": profile["min"],
+        "max": profile["max"],
+        "type_mismatches": profile["type_mismatches"],
         "sample_rows": df.head(3).to_dict(orient="records"),
+        "duplicates": find_duplicates(df).to_dict(df, max_clusters=3),
+        "timings": profile["timings"],
     }
 
 
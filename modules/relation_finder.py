@@ -0,0 +1,253 @@
+# modules/relation_finder.py
+import math
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from modules.fingerprint import hash_values, table_fingerprint
+
+SIGNATURE_SIZE = 16          # FK 후보 탐색에 쓰는 bottom-k 서명 크기
+FK_MIN_COVERAGE = 0.95       # FK 값 중 PK에 존재해야 하는 최소 비율
+FK_MIN_DISTINCT = 3          # 고유값이 너무 적은 컬럼(플래그 등)은 FK 후보에서 제외
+FK_PREFILTER_MISS_RATE = 1e-3  # 포함 비율이 FK_MIN_COVERAGE인 실제 FK를 서명 단계에서 놓칠 확률 상한
+FREE_TEXT_MIN_LENGTH = 40    # 평균 길이가 이 이상이거나 대부분 공백을 포함한 문자열 컬럼은 자유 텍스트로 보고 키에서 제외
+FREE_TEXT_SAMPLE = 1_000
+COMPOSITE_MAX_COLUMNS = 10   # 복합 PK 탐색 대상 컬럼 수 상한
+COMPOSITE_MAX_WIDTH = 3
+
+
+# ==========================================================
+# 🧱 1️⃣ 테이블별 컬럼 값 인덱스
+# ==========================================================
+@dataclass
+class TableIndex:
+    """테이블 하나의 컬럼별 고유값 해시 집합과 PK 후보"""
+    rows: int
+    value_hashes: dict = field(default_factory=dict)   # 컬럼 → 정렬된 고유값 해시(uint64)
+    null_counts: dict = field(default_factory=dict)
+    key_columns: set = field(default_factory=set)       # 키(PK/FK)가 될 수 있는 컬럼 (실수·자유 텍스트 제외)
+    pk_candidates: list = field(default_factory=list)  # [[col], [col_a, col_b], ...]
+
+
+def _normalized_uniques(s: pd.Series) -> np.ndarray:
+    """
+    테이블 간 비교용 고유값 해시.
+    - 정수로 떨어지는 실수는 정수로, 문자열은 앞뒤 공백 제거 후 비교 (1 == 1.0 == " 1 ")
+    """
+    values = s.dropna()
+    if pd.api.types.is_float_dtype(values.dtype) and len(values) and (values % 1 == 0).all():
+        values = values.astype("int64")
+    try:
+        uniques = pd.unique(values)
+    except TypeError:
+        uniques = pd.unique(values.astype(str))
+    normalized = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    return np.unique(hash_values(normalized.to_numpy(dtype=object)))
+
+
+def _is_key_like(s: pd.Series) -> bool:
+    """
+    키가 될 수 있는 컬럼인지: 실수형(금액·비율 등)과 자유 텍스트(설명·이름 등)는 값이 우연히 유일해도 키가 아님
+    - 결측이 있는 정수 컬럼은 pandas가 float64로 읽으므로, 결측 외 값이 모두 정수인 실수형 컬럼은 키 후보로 인정
+    - 자유 텍스트는 앞쪽 표본의 평균 길이 / 공백 포함 비율로 판정
+    """
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return False
+    if pd.api.types.is_float_dtype(s.dtype):
+        values = s.dropna()
+        return len(values) > 0 and bool((values % 1 == 0).all())
+    if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+        sample = s.dropna().head(FREE_TEXT_SAMPLE)
+        if sample.map(lambda v: isinstance(v, float)).any():
+            return False
+        text = sample.astype(str).str.strip()
+        if len(text) and (text.str.len().mean() >= FREE_TEXT_MIN_LENGTH or text.str.contains(r"\s").mean() > 0.5):
+            return False
+    return True
+
+
+def _min_signature_hits(k: int, distinct: int, coverage: float = FK_MIN_COVERAGE,
+                        miss_rate: float = FK_PREFILTER_MISS_RATE) -> int:
+    """
+    bottom-k 서명 중 PK에서 찾아야 하는 최소 개수.
+    - 서명이 컬럼의 고유값 전체면 포함 비율 그대로 적용
+    - 표본이면 적중 수 ~ Binomial(k, coverage) → 포함 비율이 coverage인 FK가 이보다 적게 적중할 확률이 miss_rate 이하가 되도록 여유
+    """
+    if distinct <= k:
+        return math.ceil(k * coverage)
+    below = 0.0
+    for hits in range(k + 1):
+        below += math.comb(k, hits) * coverage ** hits * (1 - coverage) ** (k - hits)
+        if below > miss_rate:
+            return max(hits, 1)
+    return k
+
+
+def _factorize_codes(s: pd.Series) -> tuple[np.ndarray, int]:
+    try:
+        codes, uniques = pd.factorize(s)
+    except TypeError:
+        codes, uniques = pd.factorize(s.astype(str))
+    return codes, len(uniques)
+
+
+def _find_composite_keys(df: pd.DataFrame, candidates: list) -> list:
+    """
+    단일 PK가 없을 때 2~3개 컬럼 조합의 유일성 검사.
+    - 컬럼별 factorize 코드를 정수 하나로 합쳐 np.unique 한 번으로 판정 (행 문자열화 없음)
+    """
+    rows = len(df)
+    codes = {col: _factorize_codes(df[col]) for col in candidates}
+    found = []
+    for width in range(2, COMPOSITE_MAX_WIDTH + 1):
+        for combo in itertools.combinations(candidates, width):
+            if any(set(prev) <= set(combo) for prev in found):
+                continue  # 이미 찾은 키를 포함하는 상위 조합은 최소 키가 아님
+            key = np.zeros(rows, dtype=np.int64)
+            overflow = False
+            for col in combo:
+                c, n = codes[col]
+                if n and key.max(initial=0) > np.iinfo(np.int64).max // (n + 1):
+                    overflow = True
+                    break
+                key = key * (n + 1) + (c + 1)
+            if overflow:
+                continue
+            if len(np.unique(key)) == rows:
+                found.append(list(combo))
+        if found:
+            break
+    return found
+
+
+def build_table_index(df: pd.DataFrame) -> TableIndex:
+    """컬럼별 고유값 해시 집합과 단일/복합 PK 후보 계산 (실수·자유 텍스트 컬럼은 키 후보에서 제외)"""
+    index = TableIndex(rows=len(df))
+    for col in df.columns:
+        s = df[col]
+        index.null_counts[col] = int(s.isna().sum())
+        index.value_hashes[col] = _normalized_uniques(s)
+        if _is_key_like(s):
+            index.key_columns.add(col)
+        if col in index.key_columns and index.rows > 1 and index.null_counts[col] == 0 \
+                and _factorize_codes(s)[1] == index.rows:
+            index.pk_candidates.append([col])
+
+    if not index.pk_candidates and index.rows > 1:
+        candidates = [
+            col for col in df.columns
+            if col in index.key_columns and index.null_counts[col] == 0 and len(index.value_hashes[col]) > 1
+        ][:COMPOSITE_MAX_COLUMNS]
+        index.pk_candidates = _find_composite_keys(df, candidates)
+    return index
+
+
+# ==========================================================
+# 🗃️ 2️⃣ 테이블 지문별 인덱스 캐시
+# ==========================================================
+_INDEX_CACHE_SIZE = 128
+_index_cache: OrderedDict[str, TableIndex] = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_table_index(df: pd.DataFrame) -> TableIndex:
+    key = table_fingerprint(df)
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = build_table_index(df)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+# ==========================================================
+# 🔗 3️⃣ PK / FK 관계 탐색
+# ==========================================================
+def _normalize_name(name) -> str:
+    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+def discover_relations(dfs: dict) -> list[dict]:
+    """
+    업로드된 전체 테이블에서 PK 후보와 FK 후보(포함 종속성)를 찾아 run_ai_report의 relations 형식으로 반환.
+    - 모든 단일 PK 컬럼의 고유값 해시를 하나의 정렬 배열로 합쳐 두고,
+      각 컬럼의 bottom-k 서명(가장 작은 해시 k개)을 이 배열에서 찾아 후보 PK를 좁힌 뒤에만 전체 포함 여부를 검증
+      (서명은 고유값 표본이므로 포함 비율 기준에 이항 분포 여유를 두어 실제 FK를 놓치지 않음)
+      → 테이블 수 N, 컬럼 수 M일 때 (N·M)² 쌍 비교를 하지 않음
+    """
+    indexes = {name: get_table_index(df) for name, df in dfs.items()}
+    relations, foreign_keys = [], []
+
+    for name, index in indexes.items():
+        for cols in index.pk_candidates:
+            relations.append({"type": "PK", "table": name, "columns": cols})
+
+    # ① PK 컬럼 값 → 소속 (테이블, 컬럼) 역색인
+    owners, hash_parts, owner_parts = [], [], []
+    for name, index in indexes.items():
+        for cols in index.pk_candidates:
+            if len(cols) != 1:
+                continue
+            hashes = index.value_hashes[cols[0]]
+            owner_parts.append(np.full(len(hashes), len(owners), dtype=np.int32))
+            hash_parts.append(hashes)
+            owners.append((name, cols[0]))
+    if not owners:
+        return relations
+
+    all_hashes = np.concatenate(hash_parts)
+    all_owners = np.concatenate(owner_parts)
+    order = np.argsort(all_hashes, kind="stable")
+    all_hashes, all_owners = all_hashes[order], all_owners[order]
+
+    # ② 컬럼별 서명으로 후보 PK 조회 → 전체 포함 여부 검증
+    for name, index in indexes.items():
+        for col, hashes in index.value_hashes.items():
+            if len(hashes) < FK_MIN_DISTINCT or col not in index.key_columns:
+                continue
+            signature = hashes[:SIGNATURE_SIZE]  # 정렬되어 있으므로 앞쪽이 bottom-k
+            lo = np.searchsorted(all_hashes, signature, side="left")
+            hi = np.searchsorted(all_hashes, signature, side="right")
+            hit_counts = np.zeros(len(owners), dtype=np.int32)
+            for a, b in zip(lo, hi):
+                if b > a:
+                    hit_counts[np.unique(all_owners[a:b])] += 1
+
+            need = _min_signature_hits(len(signature), len(hashes))
+            is_own_pk = [col] in index.pk_candidates
+            for owner_id in np.flatnonzero(hit_counts >= need):
+                pk_table, pk_col = owners[owner_id]
+                if pk_table == name:
+                    continue
+                name_match = _normalize_name(col) == _normalize_name(pk_col)
+                # 양쪽 모두 PK인 일련번호(1..N)끼리는 우연히 포함되기 쉬우므로 이름이 같을 때만 인정
+                if is_own_pk and not name_match:
+                    continue
+                pk_hashes = indexes[pk_table].value_hashes[pk_col]
+                if len(pk_hashes) < len(hashes) * FK_MIN_COVERAGE:
+                    continue
+                coverage = float(np.isin(hashes, pk_hashes, assume_unique=True).mean())
+                if coverage >= FK_MIN_COVERAGE:
+                    foreign_keys.append({
+                        "type": "FK",
+                        "from_table": name,
+                        "from_column": col,
+                        "to_table": pk_table,
+                        "to_column": pk_col,
+                        "coverage": round(coverage, 4),
+                        "name_match": name_match,
+                    })
+
+    # 이름이 일치하고 포함 비율이 높은 후보부터
+    foreign_keys.sort(key=lambda r: (not r["name_match"], -r["coverage"]))
+    return relations + foreign_keys
@@ -0,0 +1,203 @@
+# modules/report_payload.py
+import os
+import json
+import math
+from collections import Counter
+from functools import lru_cache
+
+AI_REPORT_TOKEN_BUDGET = int(os.getenv("AI_REPORT_TOKEN_BUDGET", 6000))
+AI_REPORT_TOKENIZER = os.getenv("AI_REPORT_TOKENIZER", "o200k_base")
+SAMPLE_VALUE_CHARS = 60          # 샘플 값 최대 길이
+HEALTHY_NAME_LIMIT = 30          # 정상 컬럼 이름을 나열할 최대 개수
+BYTES_PER_TOKEN = 3              # tiktoken이 없을 때의 보수적 추정 (UTF-8 바이트 기준)
+
+# 예산을 넘을 때 순서대로 적용하는 축약 단계: (정상 컬럼 이름 나열, 샘플 행 수, 테이블당 이상 컬럼 수, 관계 수)
+REDUCTION_LEVELS = (
+    (True, 3, None, None),
+    (False, 3, None, None),
+    (False, 1, None, None),
+    (False, 1, 20, 50),
+    (False, 0, 10, 30),
+    (False, 0, 5, 20),
+    (False, 0, 3, 10),
+)
+
+
+# ==========================================================
+# 🔢 1️⃣ 토큰 수 계산
+# ==========================================================
+@lru_cache(maxsize=1)
+def _encoder():
+    """tiktoken 인코더 (설치/인코딩 파일 다운로드가 안 되면 None → 바이트 기반 추정)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(AI_REPORT_TOKENIZER)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return math.ceil(len(text.encode("utf-8")) / BYTES_PER_TOKEN)
+
+
+def _dumps(payload) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+# ==========================================================
+# 🚨 2️⃣ 컬럼 이상 점수
+# ==========================================================
+def column_anomaly_score(rows: int, missing: int, unique: int | None, mismatch: dict | None = None) -> float:
+    """결측 비율, 전체 결측/단일 값, 타입 불일치 정황으로 컬럼 이상 점수 계산 (0이면 정상)"""
+    if rows <= 0:
+        return 0.0
+    score = 3.0 * missing / rows
+    present = rows - missing
+    if present == 0:
+        score += 2.0
+    elif unique is not None and unique <= 1 and rows > 1:
+        score += 1.0
+    if mismatch:
+        score += 1.5
+    return round(score, 3)
+
+
+def _truncate(value):
+    text = str(value)
+    return text if len(text) <= SAMPLE_VALUE_CHARS else text[:SAMPLE_VALUE_CHARS] + "…"
+
+
+def _profile_table(summary: dict) -> dict:
+    """요약 하나 → 점수순 이상 컬럼 목록, 정상 컬럼 목록, 테이블 점수"""
+    rows = summary.get("shape", (0, 0))[0]
+    types = summary.get("types", {})
+    missing = summary.get("missing_values", {})
+    unique = summary.get("unique_values", {})
+    mismatches = summary.get("type_mismatches", {})
+
+    anomalies, healthy = [], []
+    for col in summary.get("columns", []):
+        dtype = str(types.get(col))
+        score = column_anomaly_score(rows, missing.get(col, 0), unique.get(col), mismatches.get(col))
+        if score > 0:
+            item = {
+                "column": str(col),
+                "type": dtype,
+                "missing": missing.get(col, 0),
+                "missing_ratio": round(missing.get(col, 0) / rows, 4) if rows else 0.0,
+                "unique": unique.get(col),
+                "score": score,
+            }
+            if col in mismatches:
+                item["type_mismatch"] = mismatches[col]
+            anomalies.append(item)
+        else:
+            healthy.append((str(col), dtype))
+    anomalies.sort(key=lambda item: item["score"], reverse=True)
+    return {"anomalies": anomalies, "healthy": healthy, "score": sum(item["score"] for item in anomalies)}
+
+
+# ==========================================================
+# 📦 3️⃣ 예산 맞춤 페이로드
+# ==========================================================
+def _table_payload(name: str, summary: dict, profile: dict, level: tuple, omitted: dict) -> dict:
+    list_healthy, sample_rows, max_columns, _ = level
+    anomalies = profile["anomalies"]
+    if max_columns is not None and len(anomalies) > max_columns:
+        omitted["columns"] += len(anomalies) - max_columns
+        anomalies = anomalies[:max_columns]
+
+    healthy = profile["healthy"]
+    healthy_info = {"count": len(healthy), "types": dict(Counter(dtype for _, dtype in healthy))}
+    if list_healthy:
+        healthy_info["names"] = [col for col, _ in healthy[:HEALTHY_NAME_LIMIT]]
+    elif healthy:
+        omitted["healthy_column_names"] += len(healthy)
+
+    table = {
+        "파일명": summary.get("파일명", name),
+        "shape": list(summary.get("shape", (0, 0))),
+        "anomalous_columns": anomalies,
+        "healthy_columns": healthy_info,
+    }
+    duplicates = summary.get("duplicates")
+    if duplicates:
+        table["duplicates"] = {k: duplicates[k] for k in ("removed_rows", "removed_rows_range", "cluster_count") if k in duplicates}
+    if "approx" in summary:
+        table["approx"] = True
+
+    samples = summary.get("sample_rows", [])
+    if sample_rows:
+        # 이상 컬럼이 있으면 샘플도 그 컬럼 값만 남김
+        keep = {item["column"] for item in anomalies}
+        table["sample_rows"] = [
+            {str(k): _truncate(v) for k, v in row.items() if not keep or str(k) in keep}
+            for row in samples[:sample_rows]
+        ]
+    omitted["sample_rows"] += max(len(samples) - sample_rows, 0)
+    return table
+
+
+def _rank_relations(relations: list) -> list:
+    """FK는 이름 일치·커버리지 높은 순, PK는 뒤로"""
+    return sorted(
+        relations,
+        key=lambda r: (r.get("type") == "FK", bool(r.get("name_match")), r.get("coverage", 0)),
+        reverse=True,
+    )
+
+
+def build_report_payload(summaries: dict, relations: list | None = None,
+                         budget: int = AI_REPORT_TOKEN_BUDGET) -> tuple[dict, dict]:
+    """
+    테이블 요약을 토큰 예산 안에 맞춘 리포트 페이로드로 압축 → (payload, 생략 내역).
+    - 컬럼은 이상 점수순으로 남기고, 정상 컬럼은 개수/타입 분포로 집계
+    - 예산을 넘으면 REDUCTION_LEVELS 순서로 축약하고, 그래도 넘으면 점수 낮은 테이블부터 개요만 남김
+    - 생략 내역은 payload["omitted"]에도 넣어 보고서가 누락 사실을 언급할 수 있게 함
+    """
+    relations = _rank_relations(relations or [])
+    profiles = {name: _profile_table(summary) for name, summary in summaries.items()}
+    order = sorted(summaries, key=lambda name: profiles[name]["score"], reverse=True)
+
+    def build(level, detailed):
+        omitted = Counter()
+        tables = [_table_payload(name, summaries[name], profiles[name], level, omitted) for name in detailed]
+        detailed = set(detailed)
+        overview = [
+            {"파일명": name, "shape": list(summaries[name].get("shape", (0, 0))),
+             "anomalous_columns": len(profiles[name]["anomalies"])}
+            for name in order if name not in detailed
+        ]
+        max_relations = level[3]
+        kept_relations = relations if max_relations is None else relations[:max_relations]
+        omitted["relations"] = len(relations) - len(kept_relations)
+        payload = {"table_summaries": tables, "relations": kept_relations}
+        if overview:
+            payload["tables_overview_only"] = overview
+        omitted = {k: v for k, v in omitted.items() if v}
+        if overview:
+            omitted["tables"] = [t["파일명"] for t in overview]
+        if omitted:
+            payload["omitted"] = omitted
+        return payload, omitted
+
+    detailed = list(order)
+    for level in REDUCTION_LEVELS:
+        payload, omitted = build(level, detailed)
+        if count_tokens(_dumps(payload)) <= budget:
+            return payload, omitted
+
+    # 가장 강한 축약으로도 넘치면 점수 낮은 테이블부터 개요만 남김 (이분 탐색)
+    lo, hi = 0, len(detailed)
+    best = build(REDUCTION_LEVELS[-1], [])
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        candidate = build(REDUCTION_LEVELS[-1], detailed[:mid])
+        if count_tokens(_dumps(candidate[0])) <= budget:
+            best, lo = candidate, mid
+        else:
+            hi = mid - 1
+    return best
@@ -0,0 +1,257 @@
+# modules/sandbox.py
+import os
+import gc
+import math
+import time
+import queue
+import atexit
+import signal
+import uuid
+import threading
+import multiprocessing
+from dataclasses import dataclass
+
+import pandas as pd
+
+from modules.frame_ipc import read_frame, release_frame, release_shared, write_frame
+
+try:
+    import resource  # POSIX 전용 (Windows에서는 자원 제한 없이 시간 제한만 적용)
+except ImportError:
+    resource = None
+
+SANDBOX_WORKERS = int(os.getenv("SANDBOX_WORKERS", 2))
+SANDBOX_TIMEOUT = float(os.getenv("SANDBOX_TIMEOUT", 30))            # 실행 제한 시간(초, 벽시계)
+SANDBOX_CPU_SECONDS = int(os.getenv("SANDBOX_CPU_SECONDS", 20))      # 명령 하나당 CPU 시간(초)
+SANDBOX_MEMORY_MB = int(os.getenv("SANDBOX_MEMORY_MB", 2048))        # 워커 기동 후 추가로 쓸 수 있는 메모리
+SANDBOX_START_TIMEOUT = 60.0                                         # 워커 기동(임포트) 대기 시간
+
+
+# ==========================================================
+# 📋 1️⃣ 실행 결과
+# ==========================================================
+@dataclass
+class ExecResult:
+    """
+    샌드박스 실행 결과.
+    - status: "ok" | "error" | "timeout" | "cpu_limit" | "memory" | "crashed"
+    """
+    status: str
+    dataframe: pd.DataFrame | None = None
+    message: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+# ==========================================================
+# 🧱 2️⃣ 워커 프로세스
+# ==========================================================
+class _CpuLimitExceeded(Exception):
+    pass
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CpuLimitExceeded()
+
+
+def _virtual_memory_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _apply_memory_limit(memory_mb: int):
+    """기동(임포트) 후 주소 공간 + memory_mb로 RLIMIT_AS 설정 → 초과 할당은 MemoryError"""
+    if resource is None or memory_mb <= 0:
+        return
+    base = _virtual_memory_bytes()
+    if base is None:
+        return
+    limit = base + memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _set_cpu_limit(cpu_seconds: int | None):
+    """RLIMIT_CPU는 프로세스 누적값이므로 '지금까지 사용량 + 허용량'으로 소프트 한도 설정 (초과 시 SIGXCPU)"""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if not cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _execute(code: str, handle, cpu_seconds: int | None, result_name: str):
+    """명령 하나 실행 → (상태, 결과 핸들 또는 메시지), 결과 공유 메모리는 부모가 정한 result_name으로 생성"""
+    try:
+        _set_cpu_limit(cpu_seconds)
+        local_vars = {"df": read_frame(handle, unlink=False)}  # 입력 공유 메모리는 부모가 해제
+        exec(code, {}, local_vars)
+        new_df = local_vars.get("df")
+        if not isinstance(new_df, pd.DataFrame):
+            return "error", f"실행 후 df가 DataFrame이 아닙니다: {type(new_df).__name__}"
+        return "ok", write_frame(new_df, shm_name=result_name)
+    except _CpuLimitExceeded:
+        return "cpu_limit", f"CPU 시간 {cpu_seconds}초를 초과해 중단했습니다."
+    except MemoryError:
+        return "memory", "메모리 한도를 초과해 중단했습니다."
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+    finally:
+        _set_cpu_limit(None)
+
+
+def _worker_main(conn, memory_mb: int):
+    """미리 띄워 두는 실행 워커: pandas 임포트와 자원 제한을 마친 뒤 명령을 하나씩 처리"""
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+    _apply_memory_limit(memory_mb)
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg[0] == "stop":
+            break
+        _, code, handle, cpu_seconds, result_name = msg
+        conn.send(_execute(code, handle, cpu_seconds, result_name))
+        gc.collect()
+
+
+# ==========================================================
+# 🏊 3️⃣ 사전 기동 워커 풀
+# ==========================================================
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+
+
+class SandboxPool:
+    """
+    LLM이 생성한 pandas 코드를 별도 프로세스에서 실행하는 워커 풀.
+    - 워커는 spawn으로 미리 띄워 두어 명령마다 인터프리터/pandas 임포트 비용이 들지 않음
+    - 프레임은 pickle 대신 frame_ipc(공유 메모리 Arrow IPC)로 주고받음
+    - 벽시계 제한을 넘기거나 워커가 죽으면 강제 종료 후 새 워커로 교체하고 구조화된 상태로 반환
+    - 보안 격리가 아니라 자원 격리용 (파일/네트워크 접근은 막지 않음)
+    """
+
+    def __init__(self, workers: int = SANDBOX_WORKERS, memory_mb: int = SANDBOX_MEMORY_MB):
+        self.memory_mb = memory_mb
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._all: list[_Worker] = []
+        for _ in range(max(1, workers)):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn, self.memory_mb), daemon=True)
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        with self._lock:
+            self._all.append(worker)
+        return worker
+
+    def _discard(self, worker: _Worker):
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+        worker.conn.close()
+        with self._lock:
+            if worker in self._all:
+                self._all.remove(worker)
+
+    def _wait_ready(self, worker: _Worker):
+        if worker.ready:
+            return
+        if not worker.conn.poll(SANDBOX_START_TIMEOUT):
+            raise TimeoutError("샌드박스 워커 기동 시간이 초과되었습니다.")
+        worker.conn.recv()
+        worker.ready = True
+
+    def run(self, code: str, df: pd.DataFrame, timeout: float = SANDBOX_TIMEOUT,
+            cpu_seconds: int | None = SANDBOX_CPU_SECONDS) -> ExecResult:
+        """
+        유휴 워커에서 code를 실행 (code는 df 변수를 읽고 다시 df에 결과를 담는 pandas 코드).
+        - 입력 기록이 실패해도 워커는 항상 유휴 큐로 돌려보냄 (돌려보내지 않으면 이후 run()이 영원히 대기)
+        - 시간 초과·비정상 종료 시 워커가 만들던 결과 공유 메모리도 이름으로 해제
+        """
+        worker = self._idle.get()
+        handle = None
+        result_name = f"sbx_{uuid.uuid4().hex[:20]}"
+        try:
+            handle = write_frame(df)
+            t0 = time.perf_counter()
+            try:
+                self._wait_ready(worker)
+                t0 = time.perf_counter()
+                worker.conn.send(("exec", code, handle, cpu_seconds, result_name))
+                if not worker.conn.poll(timeout):
+                    self._discard(worker)
+                    release_shared(result_name)
+                    worker = self._spawn()
+                    return ExecResult("timeout", message=f"{timeout:g}초 안에 끝나지 않아 중단했습니다.",
+                                      elapsed=time.perf_counter() - t0)
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError, TimeoutError) as e:
+                self._discard(worker)
+                release_shared(result_name)
+                exitcode = worker.process.exitcode
+                worker = self._spawn()
+                return ExecResult("crashed", message=f"워커가 비정상 종료되었습니다 (exitcode={exitcode}): {e}",
+                                  elapsed=time.perf_counter() - t0)
+        finally:
+            if handle is not None:
+                release_frame(handle)
+            self._idle.put(worker)
+
+        elapsed = time.perf_counter() - t0
+        if status == "ok":
+            return ExecResult("ok", read_frame(payload), elapsed=elapsed)
+        return ExecResult(status, message=payload, elapsed=elapsed)
+
+    def shutdown(self):
+        with self._lock:
+            workers = list(self._all)
+        for worker in workers:
+            try:
+                worker.conn.send(("stop",))
+            except (OSError, BrokenPipeError):
+                pass
+            self._discard(worker)
+
+
+_pool: SandboxPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """프로세스 전역 풀 (첫 호출 시 기동, Streamlit 세션 간 공유)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def run_in_sandbox(code: str, df: pd.DataFrame, timeout: float = SANDBOX_TIMEOUT) -> ExecResult:
+    return get_sandbox_pool().run(code, df, timeout=timeout)
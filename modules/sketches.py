@@ -0,0 +1,319 @@
+# modules/sketches.py
+import math
+
+import numpy as np
+import pandas as pd
+
+from modules.fingerprint import hash_values, row_fingerprints
+
+# ==========================================================
+# 🔢 0️⃣ 비트 연산 유틸
+# ==========================================================
+def _leading_zeros64(x: np.ndarray) -> np.ndarray:
+    """uint64 배열의 선행 0비트 개수 (32비트씩 나눠 float 정밀도 문제 없이 계산)"""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        lz_hi = 31 - np.floor(np.log2(hi))
+        lz_lo = 63 - np.floor(np.log2(lo))
+    out = np.where(hi > 0, lz_hi, np.where(lo > 0, lz_lo, 64))
+    return out.astype(np.uint8)
+
+
+# ==========================================================
+# 🧮 1️⃣ HyperLogLog (고유값 개수 추정)
+# ==========================================================
+class HyperLogLog:
+    """
+    고유값 개수 추정 스케치. 상대 표준오차 ≈ 1.04 / sqrt(2^p).
+    - 같은 p끼리 merge() 가능 → 파티션별로 따로 만든 뒤 합칠 수 있음
+    """
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @classmethod
+    def for_error(cls, rel_error: float) -> "HyperLogLog":
+        p = math.ceil(math.log2((1.04 / rel_error) ** 2))
+        return cls(p=min(max(p, 4), 18))
+
+    @property
+    def rel_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        shift = np.uint64(64 - self.p)
+        idx = (hashes >> shift).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        rho = np.minimum(_leading_zeros64(rest) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("정밀도(p)가 다른 HyperLogLog는 병합할 수 없습니다.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        est = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)  # 작은 카디널리티 보정 (linear counting)
+        return int(round(est))
+
+
+# ==========================================================
+# 🎲 2️⃣ 저수지 샘플링 (대표 샘플 행)
+# ==========================================================
+class ReservoirSample:
+    """
+    스트림 전체에서 균등하게 k개를 뽑는 샘플 (Algorithm R, 배치 단위 벡터화).
+    - merge()는 두 스트림 크기에 비례해 합집합에서 다시 균등 추출
+    """
+
+    def __init__(self, k: int, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.items: list = []
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, batch_len: int, take):
+        """
+        batch_len개 원소가 들어왔을 때 샘플에 들어갈 위치를 고르고 take(positions)로 실제 값을 가져옴.
+        (행 전체를 매번 만들지 않고 선택된 위치만 꺼내기 위함)
+        """
+        if batch_len == 0:
+            return
+        fill = max(0, min(self.k - len(self.items), batch_len))
+        picks: list[tuple[int, int]] = [(len(self.items) + i, i) for i in range(fill)]
+        self.items.extend([None] * fill)
+
+        if batch_len > fill:
+            seen = self.n + np.arange(fill, batch_len)  # 각 원소 이전까지 본 원소 수
+            r = (self.rng.random(len(seen)) * (seen + 1)).astype(np.int64)
+            hit = np.flatnonzero(r < self.k)
+            # 같은 슬롯이 여러 번 선택되면 마지막 원소가 남음 (순차 처리와 동일)
+            last = {}
+            for pos, slot in zip(hit + fill, r[hit]):
+                last[int(slot)] = int(pos)
+            picks.extend(last.items())
+
+        self.n += batch_len
+        if picks:
+            slots, positions = zip(*picks)
+            values = take(list(positions))
+            for slot, value in zip(slots, values):
+                self.items[slot] = value
+
+    def merge(self, other: "ReservoirSample"):
+        total = self.n + other.n
+        k = min(self.k, len(self.items) + len(other.items))
+        if total == 0 or k == 0:
+            self.n = total
+            return
+        from_self = int(self.rng.hypergeometric(self.n, other.n, k)) if self.n and other.n else (k if self.n else 0)
+        from_self = min(from_self, len(self.items))
+        from_other = min(k - from_self, len(other.items))
+        mine = self.rng.choice(len(self.items), from_self, replace=False) if from_self else []
+        theirs = self.rng.choice(len(other.items), from_other, replace=False) if from_other else []
+        self.items = [self.items[i] for i in mine] + [other.items[i] for i in theirs]
+        self.n = total
+
+
+# ==========================================================
+# 📊 3️⃣ KLL 분위수 스케치 (숫자 컬럼)
+# ==========================================================
+class KLLSketch:
+    """
+    스트리밍 분위수 스케치. 순위 오차 ≈ 1.7 / k.
+    - 레벨 h의 원소는 가중치 2^h를 가지며, 용량을 넘으면 정렬 후 절반만 상위 레벨로 올림
+    - merge()는 레벨별로 이어 붙인 뒤 다시 압축
+    """
+
+    C = 2 / 3
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, rank_error: float, seed: int | None = None) -> "KLLSketch":
+        return cls(k=max(8, math.ceil(1.7 / rank_error)), seed=seed)
+
+    @property
+    def rank_error(self) -> float:
+        return 1.7 / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * self.C ** depth))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            buf = self.levels[level]
+            if len(buf) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buf = np.sort(buf)
+                keep = buf[-1:] if len(buf) % 2 else buf[:0]  # 홀수 개면 하나는 현재 레벨에 남김
+                pairs = buf[: len(buf) - len(keep)]
+                promoted = pairs[int(self.rng.integers(2))::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                level = 0  # 레벨 수가 늘면 하위 용량이 바뀌므로 처음부터 재확인
+                continue
+            level += 1
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, buf in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self.n += other.n
+        self._compress()
+
+    def quantiles(self, qs) -> list[float | None]:
+        if self.n == 0:
+            return [None for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(b), 2.0 ** h) for h, b in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum = values[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cum[-1]
+        idx = np.minimum(np.searchsorted(cum, ranks, side="left"), len(values) - 1)
+        return [float(v) for v in values[idx]]
+
+
+# ==========================================================
+# 🧾 4️⃣ 테이블 단위 스케치 (청크/파티션 병합 가능)
+# ==========================================================
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class TableSketch:
+    """
+    청크 단위로 update()하거나 파티션별 스케치를 merge()해 테이블 요약을 근사 계산.
+    - 결측 수/행 수/최소·최대는 정확값, 고유값은 HLL, 분위수는 KLL, 샘플 행은 저수지 샘플링
+    """
+
+    def __init__(self, error: float = 0.01, sample_size: int = 3, seed: int | None = None):
+        self.error = error
+        self.seed = seed
+        self.rows = 0
+        self.columns: list = []
+        self.dtypes: dict = {}
+        self.missing: dict = {}
+        self.hll: dict = {}
+        self.row_hll = HyperLogLog.for_error(error)  # 행 지문 → 고유 행 수 (중복 행 추정)
+        self.kll: dict = {}
+        self.min: dict = {}
+        self.max: dict = {}
+        self.samples = ReservoirSample(sample_size, seed=seed)
+
+    def _ensure_column(self, col, dtype):
+        if col in self.dtypes:
+            if self.dtypes[col] != dtype:
+                self.dtypes[col] = np.result_type(self.dtypes[col], dtype) if (
+                    isinstance(dtype, np.dtype) and isinstance(self.dtypes[col], np.dtype)
+                ) else np.dtype(object)
+            return
+        self.columns.append(col)
+        self.dtypes[col] = dtype
+        self.missing[col] = 0
+        self.hll[col] = HyperLogLog.for_error(self.error)
+
+    def update(self, chunk: pd.DataFrame):
+        for col in chunk.columns:
+            s = chunk[col]
+            self._ensure_column(col, s.dtype)
+            notna = s.notna()
+            self.missing[col] += int(len(s) - notna.sum())
+            values = s[notna]
+            self.hll[col].add_hashes(hash_values(values))
+
+            if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype) and len(values):
+                arr = values.to_numpy(dtype=np.float64)
+                self.kll.setdefault(col, KLLSketch.for_error(self.error, seed=self.seed)).add(arr)
+                lo, hi = float(arr.min()), float(arr.max())
+                self.min[col] = lo if col not in self.min else min(self.min[col], lo)
+                self.max[col] = hi if col not in self.max else max(self.max[col], hi)
+
+        self.row_hll.add_hashes(row_fingerprints(chunk))
+        self.samples.add(len(chunk), lambda pos: chunk.iloc[pos].to_dict(orient="records"))
+        self.rows += len(chunk)
+
+    def merge(self, other: "TableSketch"):
+        for col in other.columns:
+            self._ensure_column(col, other.dtypes[col])
+            self.missing[col] += other.missing[col]
+            self.hll[col].merge(other.hll[col])
+            if col in other.kll:
+                if col in self.kll:
+                    self.kll[col].merge(other.kll[col])
+                else:
+                    self.kll[col] = other.kll[col]
+            if col in other.min:
+                self.min[col] = min(self.min.get(col, other.min[col]), other.min[col])
+                self.max[col] = max(self.max.get(col, other.max[col]), other.max[col])
+        self.row_hll.merge(other.row_hll)
+        self.samples.merge(other.samples)
+        self.rows += other.rows
+
+    def _duplicate_range(self) -> dict:
+        """
+        중복 행 수는 '행 수 - 고유 행 추정치'라 HLL 오차(행 수 × rel_error)가 그대로 실림 →
+        점 추정치 대신 3σ 구간만 보고 (구간 하한이 0이면 중복이 있다고 단정할 수 없음)
+        """
+        estimate = max(self.rows - min(self.row_hll.estimate(), self.rows), 0)
+        bound = math.ceil(3 * self.row_hll.rel_error * self.rows)
+        return {
+            "mode": "approx",
+            "total_rows": self.rows,
+            "removed_rows_range": [max(estimate - bound, 0), min(estimate + bound, self.rows)],
+        }
+
+    def to_summary(self, name: str) -> dict:
+        """summarize_dataframe과 같은 키 구성 + 근사 정보(approx, quantiles)"""
+        unique = {}
+        for col in self.columns:
+            # 고유값은 결측 아닌 행 수를 넘을 수 없음
+            unique[col] = min(self.hll[col].estimate(), self.rows - self.missing[col])
+        some_hll = next(iter(self.hll.values()), HyperLogLog.for_error(self.error))
+        some_kll = next(iter(self.kll.values()), KLLSketch.for_error(self.error))
+        return {
+            "파일명": name,
+            "shape": (self.rows, len(self.columns)),
+            "columns": list(self.columns),
+            "types": {col: str(dt) for col, dt in self.dtypes.items()},
+            "missing_values": dict(self.missing),
+            "unique_values": unique,
+            "sample_rows": list(self.samples.items),
+            "duplicates": self._duplicate_range(),
+            "quantiles": {
+                col: dict(zip([f"p{int(q * 100)}" for q in QUANTILES], sk.quantiles(QUANTILES)))
+                for col, sk in self.kll.items()
+            },
+            "approx": {
+                "mode": "approx",
+                "unique_values_rel_error": round(some_hll.rel_error, 4),
+                "quantiles_rank_error": round(some_kll.rank_error, 4),
+                "sample_rows": f"reservoir (n={self.samples.n})",
+            },
+        }
@@ -0,0 +1,250 @@
+# modules/table_history.py
+import os
+import itertools
+import threading
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+TABLE_HISTORY_MAX_VERSIONS = int(os.getenv("TABLE_HISTORY_MAX_VERSIONS", 50))  # 테이블당 보관할 버전 수
+
+
+# ==========================================================
+# 🧩 1️⃣ 버전 = 컬럼 참조 목록
+# ==========================================================
+@dataclass
+class Version:
+    """
+    테이블 버전 하나. 데이터는 갖지 않고 공유 컬럼 저장소의 ID만 참조.
+    - columns: [(컬럼명, 컬럼 ID)] (순서 유지, 중복 컬럼명 허용)
+    - changed / added / removed: 직전 버전 대비 바뀐·추가된·삭제된 컬럼명
+    - added_bytes: 이 버전에서 새로 저장한 컬럼·인덱스 바이트
+    """
+    label: str
+    columns: list
+    index_id: int
+    column_index: pd.Index | None = None   # 원래 컬럼 Index (dtype·이름 유지)
+    attrs: dict = field(default_factory=dict)
+    shape: tuple = (0, 0)
+    changed: list = field(default_factory=list)
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    rows_changed: bool = False
+    reordered: bool = False
+    added_bytes: int = 0
+
+    def summary(self) -> str:
+        parts = []
+        if self.rows_changed:
+            parts.append("행 변경")
+        if self.added:
+            parts.append(f"추가 {', '.join(map(str, self.added))}")
+        if self.removed:
+            parts.append(f"삭제 {', '.join(map(str, self.removed))}")
+        if self.changed:
+            parts.append(f"수정 {', '.join(map(str, self.changed))}")
+        if self.reordered:
+            parts.append("컬럼 순서 변경")
+        return " / ".join(parts) or "변경 없음"
+
+
+def _array_bytes(values) -> int:
+    return int(pd.Series(values, copy=False).memory_usage(index=False, deep=True))
+
+
+def _same_values(a, b) -> bool:
+    """dtype과 값(결측 위치 포함)이 모두 같은지"""
+    if a is b:
+        return True
+    if len(a) != len(b) or a.dtype != b.dtype:
+        return False
+    return pd.Series(a, copy=False).equals(pd.Series(b, copy=False))
+
+
+# ==========================================================
+# 🕰️ 2️⃣ 컬럼 단위 copy-on-write 버전 기록
+# ==========================================================
+class TableHistory:
+    """
+    테이블 하나의 단계별 버전 기록 (undo / redo / 임의 버전 이동).
+    - 전체 복사본을 쌓지 않고 컬럼(배열) 단위로 저장: 새 버전은 직전 버전과 값이 같은 컬럼·인덱스를 그대로 참조하고
+      실제로 바뀐 컬럼만 새로 보관 → 메모리는 '명령이 바꾼 컬럼 크기'만큼만 증가
+    - 결과 프레임은 샌드박스에서 새 객체로 돌아오므로 참조 비교가 아니라 이름·dtype·값 비교로 재사용 여부 판단
+    - 행이 바뀐 명령(필터, 정렬 등)은 인덱스와 모든 컬럼이 달라지므로 해당 버전은 사실상 전체 저장
+    - 기록은 바깥 프레임과 버퍼를 공유하지 않음: 새 컬럼은 복사해 저장하고 materialize()는 복사본을 반환하므로
+      commit에 넘긴 프레임이나 꺼낸 프레임을 제자리 수정해도 기록은 그대로 (pandas 전역 옵션과 무관)
+    """
+
+    def __init__(self, df: pd.DataFrame, label: str = "원본", max_versions: int = TABLE_HISTORY_MAX_VERSIONS):
+        self.max_versions = max(1, max_versions)
+        self._columns: dict[int, pd.Series] = {}  # 컬럼 ID → 컬럼 값
+        self._indexes: dict[int, pd.Index] = {}
+        self._sizes: dict[int, int] = {}         # 컬럼·인덱스 ID → 바이트 (저장 시 한 번만 계산)
+        self._ids = itertools.count()
+        self._versions: list[Version] = []
+        self._cursor = -1
+        self._lock = threading.RLock()
+        self.commit(df, label)
+
+    # ----- 저장 -----
+    def _store(self, pool: dict, value, nbytes: int) -> int:
+        key = next(self._ids)
+        pool[key] = value
+        self._sizes[key] = nbytes
+        return key
+
+    def commit(self, df: pd.DataFrame, label: str = "") -> pd.DataFrame:
+        """
+        df를 현재 버전 다음 버전으로 기록하고 현재 버전으로 이동 → df (기록은 복사본을 보관하므로 그대로 사용 가능).
+        - 현재 버전이 최신이 아니면(undo 후) 그 뒤 버전들은 버림
+        """
+        with self._lock:
+            parent = self.current_version
+            added_bytes = 0
+
+            index_id = parent.index_id if parent is not None else None
+            rows_changed = index_id is None or not df.index.equals(self._indexes[index_id]) \
+                or type(df.index) is not type(self._indexes[index_id])
+            if rows_changed:
+                index_id = self._store(self._indexes, df.index, int(df.index.memory_usage(deep=True)))
+                added_bytes += self._sizes[index_id]
+
+            # 직전 버전의 같은 이름 컬럼 (중복 컬럼명은 같은 순번끼리 비교)
+            candidates: dict = {}
+            if parent is not None and not rows_changed:
+                for name, col_id in parent.columns:
+                    candidates.setdefault(name, []).append(col_id)
+            parent_names = [name for name, _ in parent.columns] if parent is not None else []
+
+            columns, changed, added, seen = [], [], [], {}
+            for i, name in enumerate(df.columns):
+                column = df.iloc[:, i]
+                values = column.array
+                nth = seen[name] = seen.get(name, -1) + 1
+                same_name = candidates.get(name, [])
+                if nth < len(same_name) and _same_values(values, self._columns[same_name[nth]].array):
+                    columns.append((name, same_name[nth]))
+                    continue
+                # 같은 이름의 다른 자리 컬럼과 값이 같으면(중복 컬럼명 자리 바꿈) 저장은 재사용하고 수정으로 기록
+                col_id = next((c for c in same_name if _same_values(values, self._columns[c].array)), None)
+                if col_id is None:
+                    col_id = self._store(self._columns, column.copy(), _array_bytes(values))
+                    added_bytes += self._sizes[col_id]
+                (changed if name in parent_names else added).append(name)
+                columns.append((name, col_id))
+
+            names = set(df.columns)
+            removed = [name for name in dict.fromkeys(parent_names) if name not in names]
+            kept = [name for name in dict.fromkeys(df.columns) if name in parent_names]
+            reordered = kept != [name for name in dict.fromkeys(parent_names) if name in names]
+
+            version = Version(
+                label=label, columns=columns, index_id=index_id, column_index=df.columns,
+                attrs=dict(df.attrs), shape=df.shape,
+                changed=changed if parent is not None else [], added=added if parent is not None else [],
+                removed=removed, rows_changed=rows_changed and parent is not None,
+                reordered=reordered and parent is not None, added_bytes=added_bytes,
+            )
+            del self._versions[self._cursor + 1:]
+            self._versions.append(version)
+            self._cursor = len(self._versions) - 1
+            self._prune()
+            return df
+
+    def _prune(self):
+        """최대 버전 수를 넘으면 가장 오래된 버전부터 버리고 더 이상 참조되지 않는 컬럼·인덱스 해제"""
+        excess = len(self._versions) - self.max_versions
+        if excess <= 0:
+            return
+        del self._versions[:excess]
+        self._cursor = max(0, self._cursor - excess)
+        self._collect()
+
+    def _collect(self):
+        used_columns = {col_id for v in self._versions for _, col_id in v.columns}
+        used_indexes = {v.index_id for v in self._versions}
+        for key in [k for k in self._columns if k not in used_columns]:
+            del self._columns[key], self._sizes[key]
+        for key in [k for k in self._indexes if k not in used_indexes]:
+            del self._indexes[key], self._sizes[key]
+
+    def drop_oldest(self) -> int:
+        """
+        현재 버전이 아닌 가장 오래된 버전 하나를 버림 (메모리 한도 관리용) → 해제된 바이트.
+        - 현재 버전이 첫 버전이면 가장 마지막(redo) 버전을 버림
+        """
+        with self._lock:
+            if len(self._versions) <= 1:
+                return 0
+            before = sum(self._sizes.values())
+            if self._cursor > 0:
+                del self._versions[0]
+                self._cursor -= 1
+            else:
+                del self._versions[-1]
+            self._collect()
+            return before - sum(self._sizes.values())
+
+    # ----- 조회 / 이동 -----
+    def materialize(self, number: int) -> pd.DataFrame:
+        """버전 번호 → DataFrame (기록과 버퍼를 공유하지 않는 복사본)"""
+        with self._lock:
+            version = self._versions[number]
+            index = self._indexes[version.index_id]
+            df = pd.DataFrame(
+                {i: self._columns[col_id].set_axis(index, copy=False)
+                 for i, (_, col_id) in enumerate(version.columns)},
+                index=index, copy=True,
+            )
+            df.columns = version.column_index
+            df.attrs = dict(version.attrs)
+            return df
+
+    @property
+    def current_version(self) -> Version | None:
+        return self._versions[self._cursor] if self._versions else None
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    def current(self) -> pd.DataFrame:
+        return self.materialize(self._cursor)
+
+    def checkout(self, number: int) -> pd.DataFrame:
+        """임의 버전으로 이동 (이후 버전은 유지되어 redo 가능)"""
+        with self._lock:
+            if not 0 <= number < len(self._versions):
+                raise IndexError(f"존재하지 않는 버전입니다: {number} (0~{len(self._versions) - 1})")
+            self._cursor = number
+            return self.materialize(number)
+
+    @property
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._versions) - 1
+
+    def undo(self) -> pd.DataFrame:
+        return self.checkout(max(0, self._cursor - 1))
+
+    def redo(self) -> pd.DataFrame:
+        return self.checkout(min(len(self._versions) - 1, self._cursor + 1))
+
+    def versions(self) -> list[Version]:
+        return list(self._versions)
+
+    def stats(self) -> dict:
+        """버전 수, 실제 보관 중인 바이트(공유 컬럼은 한 번만 계산), 버전별 전체 크기 합(전체 복사 시 필요량)"""
+        with self._lock:
+            sizes = self._sizes
+            full = sum(sizes[v.index_id] + sum(sizes[c] for _, c in v.columns) for v in self._versions)
+            return {
+                "versions": len(self._versions),
+                "cursor": self._cursor,
+                "stored_bytes": sum(sizes.values()),
+                "full_copy_bytes": full,
+                "columns": len(self._columns),
+            }
@@ -0,0 +1,369 @@
+# modules/table_store.py
+import os
+import time
+import uuid
+import pickle
+import shutil
+import tempfile
+import threading
+import weakref
+from collections.abc import MutableMapping
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from modules.fingerprint import table_fingerprint
+from modules.parse_cache import estimate_df_bytes
+
+TABLE_STORE_SESSION_BYTES = int(os.getenv("TABLE_STORE_SESSION_BYTES", 512 * 1024 * 1024))   # 세션당 상주 한도
+TABLE_STORE_GLOBAL_BYTES = int(os.getenv("TABLE_STORE_GLOBAL_BYTES", 2 * 1024 * 1024 * 1024))  # 프로세스 전체 상주 한도
+TABLE_STORE_SPILL_DIR = os.getenv("TABLE_STORE_SPILL_DIR", os.path.join(tempfile.gettempdir(), "dq_table_store"))
+
+
+# ==========================================================
+# 💾 1️⃣ 디스크 스필 / 복원
+# ==========================================================
+def _nan_columns(df: pd.DataFrame) -> list | None:
+    """
+    Arrow 왕복 후 결측 표현을 되돌려야 할 object 컬럼 위치 목록 (Arrow는 None/NaN을 모두 null로 저장).
+    - 결측이 전부 NaN인 컬럼만 목록에 넣고, None과 NaN 등이 섞인 컬럼이 있으면 None (Arrow로 정확히 왕복 불가)
+    """
+    positions = []
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        if s.dtype != object:
+            continue
+        missing = s[s.isna()]
+        if missing.empty or all(x is None for x in missing):
+            continue
+        if all(isinstance(x, float) for x in missing):
+            positions.append(i)
+        else:
+            return None
+    return positions
+
+
+def spill_frame(df: pd.DataFrame, path_base: str) -> tuple[str, list]:
+    """
+    DataFrame을 디스크에 기록 → (파일 경로, NaN 복원 컬럼 위치).
+    - 기본은 비압축 Arrow IPC 파일(메모리 매핑으로 다시 읽음), Arrow로 정확히 왕복할 수 없는 프레임은 pickle
+    - 컬럼 이름이 문자열이 아니거나 중복되면 Arrow 왕복 시 바뀌므로 pickle
+    """
+    nan_columns = None
+    if all(isinstance(c, str) for c in df.columns) and df.columns.is_unique:
+        nan_columns = _nan_columns(df)
+    if nan_columns is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            path = path_base + ".arrow"
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            return path, nan_columns
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+    path = path_base + ".pkl"
+    with open(path, "wb") as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path, []
+
+
+def _open_arrow(path: str) -> pa.Table:
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def _restore(df: pd.DataFrame, attrs: dict | None, nan_columns: list) -> pd.DataFrame:
+    for i in nan_columns:
+        s = df.iloc[:, i]
+        df.isetitem(i, s.where(s.notna(), np.nan))
+    df.attrs = dict(attrs or {})
+    return df
+
+
+def load_frame(path: str, attrs: dict | None = None, nan_columns: list = ()) -> pd.DataFrame:
+    if path.endswith(".arrow"):
+        return _restore(_open_arrow(path).to_pandas(), attrs, nan_columns)
+    with open(path, "rb") as f:
+        df = pickle.load(f)
+    df.attrs = dict(attrs or {})
+    return df
+
+
+def load_head(path: str, n: int, attrs: dict | None = None, nan_columns: list = ()) -> pd.DataFrame:
+    """전체를 읽지 않고 앞 n행만 복원 (Arrow 파일은 메모리 매핑 후 slice)"""
+    if path.endswith(".arrow"):
+        return _restore(_open_arrow(path).slice(0, n).to_pandas(), attrs, nan_columns)
+    return load_frame(path, attrs).head(n)
+
+
+class _Entry:
+    __slots__ = ("df", "path", "nan_columns", "nbytes", "last_access", "attrs", "shape", "fingerprint")
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.path = None
+        self.nan_columns: list = []
+        self.nbytes = estimate_df_bytes(df)
+        self.last_access = time.monotonic()
+        self.attrs = dict(df.attrs)
+        self.shape = df.shape
+        self.fingerprint = None  # 스필할 때 계산 (디스크의 내용은 바뀌지 않으므로 재사용)
+
+
+# ==========================================================
+# 🗄️ 2️⃣ 세션 단위 테이블 저장소
+# ==========================================================
+class TableStore(MutableMapping):
+    """
+    테이블명 → DataFrame 매핑 (dict처럼 사용) + 메모리 한도 기반 디스크 스필.
+    - 세션 한도(session_bytes)나 프로세스 전체 한도(TABLE_STORE_GLOBAL_BYTES)를 넘으면
+      가장 오래 사용하지 않은 테이블부터 로컬 디스크(Arrow IPC / pickle)로 내리고, 다시 접근하면 자동 복원
+    - 방금 넣거나 꺼낸 테이블은 그 자리에서 스필하지 않음
+    - head()/attrs()/shape()는 스필된 테이블을 전부 올리지 않고 미리보기·메타정보만 반환
+    - peek()/fingerprint()는 스필된 테이블을 저장소에 다시 올리지 않고 읽음 (내보내기용)
+    - attach_history()로 연결한 버전 기록은 보관 중인 컬럼 전체를 상주 바이트로 더하고,
+      테이블 스필만으로 한도 안에 들지 못하면 오래된 버전부터 정리
+    """
+
+    def __init__(self, tables: dict | None = None, session_bytes: int = TABLE_STORE_SESSION_BYTES,
+                 spill_dir: str = TABLE_STORE_SPILL_DIR):
+        self.session_bytes = session_bytes
+        self.spill_dir = os.path.join(spill_dir, uuid.uuid4().hex)
+        self._entries: dict[str, _Entry] = {}
+        self._histories: dict = {}  # 테이블명 → TableHistory
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.loads = 0
+        # 세션이 끝나 저장소가 GC되면 스필 파일 정리
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+        _governor.register(self)
+        if tables:
+            self.update(tables)
+
+    # 저장소는 내용이 아니라 객체 단위로 구분 (내용 비교는 스필된 테이블까지 모두 올리게 됨)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    # ----- dict 인터페이스 -----
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries[name]
+            entry.last_access = time.monotonic()
+            if entry.df is None:
+                # 복원한 프레임은 호출 측에서 바뀔 수 있으므로 스필 파일은 지우고 다음 스필 때 새로 기록
+                entry.df = load_frame(entry.path, entry.attrs, entry.nan_columns)
+                os.remove(entry.path)
+                entry.path = None
+                self.loads += 1
+            df = entry.df
+            self._enforce(pinned=name)
+        _governor.enforce()
+        return df
+
+    def __setitem__(self, name: str, df: pd.DataFrame):
+        with self._lock:
+            self._drop(name)
+            self._entries[name] = _Entry(df)
+            self._enforce(pinned=name)
+        _governor.enforce()
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            if name not in self._entries:
+                raise KeyError(name)
+            self._drop(name)
+            self._histories.pop(name, None)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name) -> bool:
+        return name in self._entries
+
+    # ----- 로드 없이 조회 -----
+    def head(self, name: str, n: int = 5) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries[name]
+            if entry.df is not None:
+                return entry.df.head(n)
+            path, attrs, nan_columns = entry.path, entry.attrs, entry.nan_columns
+        return load_head(path, n, attrs, nan_columns)
+
+    def peek(self, name: str) -> pd.DataFrame:
+        """테이블 읽기 (스필된 테이블은 파일에서 읽기만 하고 상주시키지 않음, 다른 테이블도 스필하지 않음)"""
+        with self._lock:
+            entry = self._entries[name]
+            if entry.df is not None:
+                return entry.df
+            path, attrs, nan_columns = entry.path, entry.attrs, entry.nan_columns
+        return load_frame(path, attrs, nan_columns)
+
+    def fingerprint(self, name: str) -> str:
+        """테이블 내용 지문 (스필된 테이블은 스필 시 계산한 값)"""
+        with self._lock:
+            entry = self._entries[name]
+            if entry.df is None:
+                return entry.fingerprint
+            df = entry.df
+        return table_fingerprint(df)
+
+    def attrs(self, name: str) -> dict:
+        with self._lock:
+            entry = self._entries[name]
+            return entry.df.attrs if entry.df is not None else entry.attrs
+
+    def shape(self, name: str) -> tuple:
+        return self._entries[name].shape
+
+    def is_resident(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.df is not None
+
+    # ----- 스필 -----
+    def _drop(self, name: str):
+        entry = self._entries.pop(name, None)
+        if entry is not None and entry.path and os.path.exists(entry.path):
+            os.remove(entry.path)
+
+    def _spill(self, name: str):
+        entry = self._entries[name]
+        if entry.df is None:
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        entry.attrs = dict(entry.df.attrs)
+        entry.shape = entry.df.shape
+        entry.fingerprint = table_fingerprint(entry.df)
+        entry.path, entry.nan_columns = spill_frame(entry.df, os.path.join(self.spill_dir, uuid.uuid4().hex))
+        entry.df = None
+        self.spills += 1
+
+    # ----- 버전 기록 -----
+    def attach_history(self, name: str, history):
+        """테이블의 버전 기록(TableHistory)을 연결해 메모리 한도에 포함"""
+        with self._lock:
+            self._histories[name] = history
+            self._enforce(pinned=name)
+        _governor.enforce()
+
+    def history_bytes(self) -> int:
+        return sum(h.stats()["stored_bytes"] for h in list(self._histories.values()))
+
+    def _trim_history(self) -> int:
+        """버전이 둘 이상인 기록 중 가장 큰 것의 가장 오래된 버전 하나 정리 → 줄어든 바이트"""
+        trimmable = [h for h in self._histories.values() if len(h.versions()) > 1]
+        if not trimmable:
+            return 0
+        return max(trimmable, key=lambda h: h.stats()["stored_bytes"]).drop_oldest()
+
+    # ----- 한도 관리 -----
+    def resident_bytes(self) -> int:
+        tables = sum(e.nbytes for e in self._entries.values() if e.df is not None)
+        return tables + self.history_bytes()
+
+    def _lru_resident(self, pinned: str | None = None) -> list:
+        return sorted(
+            (e.last_access, name) for name, e in self._entries.items()
+            if e.df is not None and name != pinned
+        )
+
+    def _can_trim(self) -> bool:
+        return any(len(h.versions()) > 1 for h in self._histories.values())
+
+    def _enforce(self, pinned: str | None = None):
+        """세션 한도를 넘는 동안 LRU 테이블 스필, 그래도 넘으면 버전 기록의 오래된 버전 정리"""
+        resident = self.resident_bytes()
+        for _, name in self._lru_resident(pinned):
+            if resident <= self.session_bytes:
+                break
+            resident -= self._entries[name].nbytes
+            self._spill(name)
+        while resident > self.session_bytes and self._can_trim():
+            resident -= self._trim_history()
+
+    def spill_oldest(self) -> int:
+        """가장 오래 사용하지 않은 상주 테이블 하나를 스필(없으면 버전 기록 정리) → 줄어든 바이트 (전역 한도 관리용)"""
+        with self._lock:
+            candidates = self._lru_resident()
+            if not candidates:
+                return self._trim_history()
+            name = candidates[0][1]
+            freed = self._entries[name].nbytes
+            self._spill(name)
+            return freed
+
+    def oldest_access(self) -> float | None:
+        with self._lock:
+            candidates = self._lru_resident()
+            if candidates:
+                return candidates[0][0]
+            trimmable = [self._entries[n].last_access for n, h in self._histories.items()
+                         if n in self._entries and len(h.versions()) > 1]
+            return min(trimmable) if trimmable else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            resident = [e for e in self._entries.values() if e.df is not None]
+            spilled = [e for e in self._entries.values() if e.df is None]
+            return {
+                "tables": len(self._entries),
+                "resident": len(resident),
+                "spilled": len(spilled),
+                "resident_bytes": self.resident_bytes(),
+                "history_bytes": self.history_bytes(),
+                "spilled_bytes": sum(e.nbytes for e in spilled),
+                "session_budget": self.session_bytes,
+                "spills": self.spills,
+                "loads": self.loads,
+            }
+
+
+# ==========================================================
+# 🌐 3️⃣ 프로세스 전체 메모리 한도
+# ==========================================================
+class _StoreGovernor:
+    """모든 세션 저장소의 상주 메모리 합이 전역 한도를 넘으면 전체에서 가장 오래된 테이블부터 스필"""
+
+    def __init__(self, global_bytes: int):
+        self.global_bytes = global_bytes
+        self._stores: weakref.WeakSet = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def register(self, store: TableStore):
+        with self._lock:
+            self._stores.add(store)
+
+    def resident_bytes(self) -> int:
+        return sum(store.resident_bytes() for store in list(self._stores))
+
+    def enforce(self):
+        # 저장소 잠금을 잡은 상태에서는 호출하지 않음 (세션 간 교착 방지)
+        with self._lock:
+            resident = self.resident_bytes()
+            while resident > self.global_bytes:
+                stores = [(s.oldest_access(), s) for s in list(self._stores)]
+                stores = [(t, s) for t, s in stores if t is not None]
+                if not stores:
+                    break
+                freed = min(stores, key=lambda item: item[0])[1].spill_oldest()
+                if not freed:
+                    break
+                resident -= freed
+
+    def stats(self) -> dict:
+        stores = list(self._stores)
+        return {
+            "sessions": len(stores),
+            "resident_bytes": sum(s.resident_bytes() for s in stores),
+            "global_budget": self.global_bytes,
+        }
+
+
+_governor = _StoreGovernor(TABLE_STORE_GLOBAL_BYTES)
+
+
+def global_store_stats() -> dict:
+    return _governor.stats()
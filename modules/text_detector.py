@@ -0,0 +1,187 @@
+# modules/text_detector.py
+import csv
+import codecs
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+
+SAMPLE_BYTES = 64 * 1024
+HEADER_SAMPLE_ROWS = 6  # 헤더 판정에 쓰는 앞쪽 행 수 (첫 행 포함)
+DELIMITER_CANDIDATES = (",", "\t", ";", "|")
+ENCODING_CANDIDATES = ("utf-8", "cp949")  # cp949는 euc-kr의 상위 집합
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+try:
+    import chardet
+except ImportError:  # chardet 미설치 환경에서는 후보 인코딩만 사용
+    chardet = None
+
+
+# ==========================================================
+# 📄 1️⃣ 감지 결과
+# ==========================================================
+@dataclass(frozen=True)
+class TextFormat:
+    """CSV/TXT 파일의 인코딩 및 방언(dialect) 정보"""
+    encoding: str
+    bom: bool
+    delimiter: str
+    quotechar: str
+    has_header: bool
+    columns: int = 0  # 헤더가 없을 때 붙일 컬럼 수 (첫 행 필드 수)
+
+    def read_csv_kwargs(self, errors: str = "replace") -> dict:
+        """
+        pd.read_csv(engine="c")에 그대로 넘길 인자.
+        - errors: 디코딩 불가 바이트 처리 (기본은 파일을 버리지 않고 대체 문자로, "strict"이면 UnicodeDecodeError)
+        - 헤더가 없으면 column_1, column_2 … 문자열 이름 부여 (정수 컬럼명은 이후 전처리·내보내기 단계에서 깨짐)
+        """
+        kwargs = {
+            "engine": "c",
+            "encoding": self.encoding,
+            "encoding_errors": errors,
+            "sep": self.delimiter,
+            "quotechar": self.quotechar,
+            "header": 0,
+        }
+        if not self.has_header and self.columns:
+            kwargs.update(header=None, names=[f"column_{i}" for i in range(1, self.columns + 1)])
+        return kwargs
+
+
+# ==========================================================
+# 🔎 2️⃣ 인코딩 / 구분자 / 헤더 추정
+# ==========================================================
+def _detect_encoding(head: bytes) -> tuple[str, bool]:
+    """BOM → 후보 인코딩 순차 검증 → chardet 순으로 인코딩 추정 (샘플 끝의 잘린 멀티바이트 문자는 허용)"""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, True
+
+    for encoding in ENCODING_CANDIDATES:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding, False
+        except UnicodeDecodeError:
+            continue
+
+    if chardet is not None:
+        guess = chardet.detect(head)
+        if guess.get("encoding") and guess.get("confidence", 0) >= 0.5:
+            return guess["encoding"].lower(), False
+    return "latin-1", False
+
+
+def _detect_delimiter(lines: list[str]) -> str:
+    """
+    줄마다 구분자 개수가 일정한 후보를 선택.
+    - 첫 줄(헤더)과 데이터 줄의 개수가 같아야 하며, 그런 후보가 없으면 기존 규칙으로 대체
+    """
+    best, best_score = None, 0.0
+    for delim in DELIMITER_CANDIDATES:
+        counts = [line.count(delim) for line in lines]
+        mode, freq = Counter(counts).most_common(1)[0]
+        if mode == 0 or counts[0] != mode:
+            continue
+        score = freq / len(counts) + mode / 1000  # 일관성 우선, 동률이면 더 많이 쪼개는 쪽
+        if score > best_score:
+            best, best_score = delim, score
+    if best is not None:
+        return best
+
+    sample = "\n".join(lines)
+    return "," if "," in sample else "\t" if "\t" in sample else ";"
+
+
+def _looks_numeric(value: str) -> bool:
+    value = value.strip().strip("\"'").replace(",", "")
+    if not value:
+        return False
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _detect_header(rows: list[list[str]]) -> bool:
+    """
+    첫 행이 분명히 데이터일 때만 헤더 없음으로 판단 (기본은 read_csv처럼 첫 행 = 헤더).
+    - 첫 행에 숫자형·문자형 값이 섞여 있고, 그 숫자형 위치가 아래 모든 행과 같으면 데이터 행
+    - 모두 숫자이거나 모두 문자인 첫 행('2023,2024' 같은 연도 헤더 등)은 구분할 근거가 없으므로 헤더로 유지
+    """
+    if len(rows) < 2:
+        return True
+    patterns = [[_looks_numeric(v) for v in row] for row in rows]
+    first = patterns[0]
+    mixed = any(first) and not all(first)
+    return not (mixed and all(p == first for p in patterns[1:]))
+
+
+def _detect_format(head: bytes, truncated: bool) -> TextFormat:
+    encoding, bom = _detect_encoding(head)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(head, final=False)
+    text = text.lstrip("\ufeff")
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if truncated and len(lines) > 1:
+        lines = lines[:-1]  # 샘플 경계에서 잘린 마지막 줄 제외
+    if not lines:
+        return TextFormat(encoding, bom, ",", '"', True)
+
+    delimiter = _detect_delimiter(lines)
+    sample = "\n".join(lines)
+    try:
+        quotechar = csv.Sniffer().sniff(sample, delimiters=delimiter).quotechar or '"'
+    except csv.Error:
+        quotechar = '"'
+
+    rows = list(csv.reader(lines[:HEADER_SAMPLE_ROWS], delimiter=delimiter, quotechar=quotechar))
+    return TextFormat(encoding, bom, delimiter, quotechar, _detect_header(rows), len(rows[0]) if rows else 0)
+
+
+def fallback_formats(fmt: TextFormat) -> list[TextFormat]:
+    """
+    샘플로 정한 인코딩이 파일 뒷부분에서 맞지 않을 때 다시 시도할 후보 (앞부분은 ASCII, 뒤에 cp949가 나오는 경우 등).
+    - 파일 전체를 미리 디코딩해 검증하지 않고, 실제 파싱이 UnicodeDecodeError로 실패했을 때만 사용
+    """
+    if fmt.bom:
+        return []
+    return [replace(fmt, encoding=encoding) for encoding in ENCODING_CANDIDATES if encoding != fmt.encoding]
+
+
+# ==========================================================
+# 🗃️ 3️⃣ 파일 해시별 감지 결과 캐시
+# ==========================================================
+_FORMAT_CACHE_SIZE = 1024
+_format_cache: OrderedDict[str, TextFormat] = OrderedDict()
+_format_lock = threading.Lock()
+
+
+def detect_text_format(file_obj, content_hash: str | None = None, sample_bytes: int = SAMPLE_BYTES) -> TextFormat:
+    """
+    파일 앞부분 sample_bytes만 한 번 읽어 인코딩·BOM·구분자·따옴표·헤더 여부를 결정.
+    - content_hash가 주어지면 같은 내용의 파일은 다시 읽지 않고 캐시된 결과 반환
+    - 읽은 뒤 파일 위치는 처음으로 되돌림
+    """
+    if content_hash is not None:
+        with _format_lock:
+            fmt = _format_cache.get(content_hash)
+            if fmt is not None:
+                _format_cache.move_to_end(content_hash)
+                return fmt
+
+    head = file_obj.read(sample_bytes)
+    file_obj.seek(0)
+    fmt = _detect_format(head, truncated=len(head) == sample_bytes)
+
+    if content_hash is not None:
+        with _format_lock:
+            _format_cache[content_hash] = fmt
+            while len(_format_cache) > _FORMAT_CACHE_SIZE:
+                _format_cache.popitem(last=False)
+    return fmt
@@ -0,0 +1,58 @@
+# tests/test_async_report.py
+import asyncio
+from types import SimpleNamespace
+
+import modules.async_report as async_report
+from modules.async_report import EMPTY_SECTION_NOTE, REPORT_SECTIONS, merge_reports
+from modules.llm_cache import LLMResponseCache
+
+MESSAGES = [{"role": "user", "content": "테이블 요약"}]
+
+
+class FakeStreamClient:
+    """stream=True 응답만 흉내 내는 비동기 OpenAI 대역 (호출 수 기록)"""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, messages, stream, **params):
+        self.calls += 1
+
+        async def chunks():
+            for token in self.text.split(" "):
+                await asyncio.sleep(0.01)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token + " "))])
+        return chunks()
+
+
+def test_identical_stream_requests_are_merged(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"))
+    monkeypatch.setattr(async_report, "llm_cache", cache)
+    client = FakeStreamClient("[[1]] 개요 내용")
+    done = []
+
+    async def run():
+        semaphore = asyncio.Semaphore(4)
+        params = {"model": "m", "temperature": 0.5}
+        emit = lambda name, text, finished: finished and done.append(name)
+        return await asyncio.gather(*(
+            async_report._stream_table(client, semaphore, name, MESSAGES, params, emit) for name in ("a", "b", "c")
+        ))
+
+    assert asyncio.run(run()) == ["[[1]] 개요 내용"] * 3
+    assert client.calls == 1
+    assert cache.merged == 2
+    assert sorted(done) == ["a", "b", "c"]
+
+    assert asyncio.run(run()) == ["[[1]] 개요 내용"] * 3  # 두 번째 실행은 캐시 적중
+    assert client.calls == 1
+
+
+def test_merge_reports_fills_empty_sections():
+    report = merge_reports({"a": "[[1]] 개요 a\n[[3]] 타입 a", "b": "[[1]] 개요 b"})
+    for number, title in enumerate(REPORT_SECTIONS, 1):
+        assert f"**{number}. {title}**" in report
+    assert report.count(EMPTY_SECTION_NOTE) == len(REPORT_SECTIONS) - 2
+    assert "- **b**: 개요 b" in report
@@ -0,0 +1,17 @@
+# tests/test_batch_cleaner.py
+import pandas as pd
+
+import modules.batch_cleaner as batch_cleaner
+
+
+def test_small_batches_skip_process_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("작은 배치에서 프로세스 풀을 띄움")
+
+    monkeypatch.setattr(batch_cleaner, "ProcessPoolExecutor", no_pool)
+    tables = {f"t{i}": pd.DataFrame({"a": [" X ", None, " X "]}) for i in range(3)}
+    cleaned, summaries = batch_cleaner.clean_tables(
+        tables, {"drop_duplicates": True, "strip_strings": True}, workers=4, min_parallel_rows=10,
+    )
+    assert list(cleaned) == list(tables)
+    assert [s["rows_after"] for s in summaries] == [len(df) for df in cleaned.values()]
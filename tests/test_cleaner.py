@@ -0,0 +1,18 @@
+# tests/test_cleaner.py
+import numpy as np
+import pandas as pd
+
+from modules.cleaner import convert_date_column, count_numeric_strings
+
+MIXED = pd.Series([1, True, 1.0, "2020-01-01", None, np.nan, "2021/02/03", False, 0], dtype=object)
+
+
+def test_date_parsing_uses_each_values_string_form():
+    parsed, _ = convert_date_column(MIXED)
+    expected, _ = convert_date_column(MIXED.astype(str))
+    assert parsed.equals(expected)
+    assert pd.isna(parsed[1])  # "True"는 "1"과 다른 값
+
+
+def test_numeric_count_uses_each_values_string_form():
+    assert count_numeric_strings(pd.Series([True, 1], dtype=object)) == (1, False)
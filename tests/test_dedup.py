@@ -0,0 +1,48 @@
+# tests/test_dedup.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.dedup import drop_duplicate_rows
+from modules.fingerprint import hash_values
+
+# 문자열 표현은 같지만 종류가 다른 값 / pandas가 같은 값으로 보는 값 / 결측 종류를 섞은 값 풀
+MIXED_VALUES = [
+    1, 1.0, True, "1", "a", "A", None, np.nan, pd.NaT, pd.NA, 2, 2.0, "2", np.int64(2),
+    np.float32(2.5), 2.5, 0, False, 0.0, "", float("inf"), (1, 2),
+]
+
+
+def _random_frame(rng, n_cols: int) -> pd.DataFrame:
+    n = int(rng.integers(1, 40))
+    return pd.DataFrame({
+        f"c{j}": pd.Series([MIXED_VALUES[i] for i in rng.integers(0, len(MIXED_VALUES), n)], dtype=object)
+        for j in range(n_cols)
+    })
+
+
+def test_type_tagged_hash():
+    h = hash_values(np.array([1, 1.0, True, "1", None, np.nan], dtype=object))
+    assert h[0] == h[1] == h[2]
+    assert h[0] != h[3]
+    assert h[4] == h[5]
+
+
+@pytest.mark.parametrize("n_cols", [1, 2, 3])
+@pytest.mark.parametrize("keep", ["first", "last", False])
+def test_matches_pandas_drop_duplicates(n_cols, keep):
+    rng = np.random.default_rng(n_cols)
+    for _ in range(100):
+        df = _random_frame(rng, n_cols)
+        result, report = drop_duplicate_rows(df, keep=keep)
+        expected = df.drop_duplicates(keep=keep)
+        assert result.index.equals(expected.index)
+        assert report.removed == len(df) - len(expected)
+
+
+def test_subset_matches_pandas():
+    rng = np.random.default_rng(7)
+    for _ in range(100):
+        df = _random_frame(rng, 3)
+        result, _ = drop_duplicate_rows(df, subset=["c0", "c2"])
+        assert result.index.equals(df.drop_duplicates(subset=["c0", "c2"]).index)
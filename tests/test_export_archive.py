@@ -0,0 +1,38 @@
+# tests/test_export_archive.py
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+import modules.export_archive as export_archive
+from modules.export_archive import ExportArchiveCache
+from modules.exporters import export_filename
+
+
+def _tables():
+    return {"a": pd.DataFrame({"x": range(100)}), "b": pd.DataFrame({"y": ["v"] * 100})}
+
+
+def test_cache_hit_returns_new_handle_to_same_archive():
+    cache = ExportArchiveCache()
+    tables = _tables()
+    with cache.open(tables, "csv") as first, cache.open(tables, "csv") as second:
+        assert first.name == second.name and first is not second
+        with zipfile.ZipFile(second) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == [export_filename(name, "csv") for name in tables]
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert not os.path.exists(first.name)
+
+
+def test_failed_build_leaves_no_key_lock_or_file(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(export_archive, "build_archive", fail)
+    cache = ExportArchiveCache()
+    with pytest.raises(RuntimeError):
+        cache.open(_tables(), "csv")
+    assert cache._key_locks == {} and not cache._items
@@ -0,0 +1,19 @@
+# tests/test_exporters.py
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from modules.exporters import iter_export
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_non_string_column_names_are_exported(fmt):
+    df = pd.DataFrame({0: [1, 2], 1: ["a", None], "c": [1.5, 2.5]})
+    data = b"".join(iter_export(df, fmt))
+    table = pq.read_table(io.BytesIO(data)) if fmt == "parquet" else pa.ipc.open_file(data).read_all()
+    assert table.column_names == ["0", "1", "c"]
+    assert table.to_pandas()["1"].tolist() == ["a", None]
+    assert list(df.columns) == [0, 1, "c"]  # 원본 프레임은 그대로
@@ -0,0 +1,135 @@
+# tests/test_llm_cache.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import modules.llm_cache as llm_cache_module
+from modules.llm_cache import LLMResponseCache, cached_completion, make_request_key
+from modules.sandbox import ExecResult
+
+MESSAGES = [{"role": "user", "content": "요약해줘"}]
+
+
+class FakeClient:
+    """client.chat.completions.create만 흉내 내는 OpenAI 대역 (호출 수 기록, 응답 대기 가능)"""
+
+    def __init__(self, replies=None, gate: threading.Event | None = None):
+        self.replies = list(replies or ["응답"])
+        self.gate = gate
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **params):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        text = self.replies[min(self.calls, len(self.replies)) - 1]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f" {text} "))])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(path=str(tmp_path / "llm.sqlite"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_request_key_is_canonical():
+    a = make_request_key("m", MESSAGES, {"temperature": 0.4, "max_completion_tokens": 10})
+    b = make_request_key("m", MESSAGES, {"max_completion_tokens": 10, "temperature": 0.4})
+    assert a == b
+    assert a != make_request_key("m", MESSAGES, {"temperature": 0.5, "max_completion_tokens": 10})
+
+
+def test_second_call_hits_cache(cache):
+    client = FakeClient()
+    assert cached_completion(client, "m", MESSAGES, cache=cache, temperature=0.4) == ("응답", False)
+    assert cached_completion(client, "m", MESSAGES, cache=cache, temperature=0.4) == ("응답", True)
+    assert client.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_errors_are_not_cached(cache):
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert cache.get_or_compute("k", lambda: "ok") == ("ok", False)
+
+
+def test_ttl_expiry(tmp_path, clock):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), ttl=60)
+    cache.put("k", "v")
+    clock[0] += 30
+    assert cache.get("k") == "v"
+    clock[0] += 31  # 생성 후 61초
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), max_bytes=30)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 10)
+        clock[0] += 1
+    assert cache.get("a") == "x" * 10  # a를 최근 사용으로 갱신
+    clock[0] += 1
+    cache.put("d", "x" * 10)
+    assert cache.get("b") is None
+    assert all(cache.get(key) for key in ("a", "c", "d"))
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_value_is_not_stored(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), max_bytes=5)
+    cache.put("k", "x" * 6)
+    assert cache.get("k") is None
+
+
+def test_concurrent_identical_requests_are_merged(cache):
+    gate = threading.Event()
+    client = FakeClient(gate=gate)
+    results = []
+
+    def worker():
+        results.append(cached_completion(client, "m", MESSAGES, cache=cache))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.merged < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert client.calls == 1
+    assert cache.merged == 3
+    assert sorted(cached for _, cached in results) == [False, True, True, True]
+    assert {text for text, _ in results} == {"응답"}
+
+
+def test_failed_generated_code_is_discarded(cache, monkeypatch):
+    from modules import ai_agent
+
+    monkeypatch.setattr(llm_cache_module, "llm_cache", cache)
+    outcomes = iter([ExecResult("error", message="NameError"), ExecResult("ok", pd.DataFrame({"a": [2]}))])
+    monkeypatch.setattr(ai_agent, "run_in_sandbox", lambda code, df: next(outcomes))
+    client = FakeClient(replies=["df = broken", "df = df * 2"])
+    df = pd.DataFrame({"a": [1]})
+
+    _, result = ai_agent.run_data_processing(client, df, "두 배로")
+    assert result is None  # 실패한 명령은 결과 없음 (버전 기록에 남기지 않음)
+    assert cache.stats()["entries"] == 0
+
+    _, result = ai_agent.run_data_processing(client, df, "두 배로")
+    assert client.calls == 2  # 실패한 코드를 재사용하지 않고 새로 생성
+    assert result["a"].tolist() == [2]
+    assert cache.stats()["entries"] == 1
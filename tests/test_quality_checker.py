@@ -0,0 +1,16 @@
+import pandas as pd
+
+from modules.quality_checker import summarize_dataframe
+
+
+def test_summary_includes_all_profile_metrics():
+    df = pd.DataFrame({"n": [1, 2, None], "s": ["1", "2", "3"], "t": ["a", "b", "a"]})
+    summary = summarize_dataframe(df, "t", with_timings=True)
+
+    assert summary["missing_values"] == {"n": 1, "s": 0, "t": 0}
+    assert summary["unique_values"] == {"n": 2, "s": 3, "t": 2}
+    assert summary["min"] == {"n": 1.0} and summary["max"] == {"n": 2.0}
+    assert summary["type_mismatches"]["s"]["inferred"] == "numeric"
+    assert "t" not in summary["type_mismatches"]
+    # 결측·고유값은 한 패스로 함께 구하므로 소요 시간도 하나로 보고
+    assert set(summary["timings"]) == {"missing+unique", "minmax", "type_mismatch"}
@@ -0,0 +1,49 @@
+# tests/test_relation_finder.py
+import numpy as np
+import pandas as pd
+
+from modules.relation_finder import discover_relations
+
+
+def _tables(seed: int, coverage: float = 0.98):
+    rng = np.random.default_rng(seed)
+    customers = pd.DataFrame({
+        "customer_id": np.arange(1, 2001),
+        "name": [f"고객 {i}" for i in range(1, 2001)],
+        "amt": rng.random(2000) * 1000,
+    })
+    ids = rng.choice(customers["customer_id"], 500, replace=False)
+    orphans = int(len(ids) * (1 - coverage))
+    ids[:orphans] = rng.choice(np.arange(10_001, 1_000_000), orphans, replace=False)  # PK에 없는 값
+    orders = pd.DataFrame({
+        "order_id": np.arange(len(ids) * 2),
+        "customer_id": np.repeat(ids, 2),
+        "memo": ["배송 전에 연락 부탁드립니다"] * (len(ids) * 2),
+    })
+    return {"customers": customers, "orders": orders}
+
+
+def _fk(relations, from_column, to_column):
+    return [r for r in relations if r["type"] == "FK"
+            and r["from_column"] == from_column and r["to_column"] == to_column]
+
+
+def test_partial_coverage_fk_is_found_reliably():
+    found = sum(bool(_fk(discover_relations(_tables(seed)), "customer_id", "customer_id")) for seed in range(100))
+    assert found == 100
+
+
+def test_float_and_free_text_columns_are_not_keys():
+    relations = discover_relations(_tables(0))
+    pk_columns = {tuple(r["columns"]) for r in relations if r["type"] == "PK"}
+    assert ("amt",) not in pk_columns
+    assert ("name",) not in pk_columns
+    assert not [r for r in relations if r["type"] == "FK" and "amt" in (r["from_column"], r["to_column"])]
+
+
+def test_nullable_integer_fk_read_as_float_is_found():
+    tables = _tables(0, coverage=1.0)
+    orders = tables["orders"]
+    orders["customer_id"] = orders["customer_id"].astype("float64")
+    orders.loc[0, "customer_id"] = np.nan
+    assert _fk(discover_relations(tables), "customer_id", "customer_id")
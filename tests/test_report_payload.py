@@ -0,0 +1,15 @@
+# tests/test_report_payload.py
+import pandas as pd
+
+from modules.quality_checker import summarize_dataframe
+from modules.report_payload import build_report_payload, column_anomaly_score
+
+
+def test_clean_text_columns_are_healthy():
+    df = pd.DataFrame({"name": list("abcd"), "code": ["1", "2", "3", "4"], "n": [1, 2, None, 4]})
+    payload, _ = build_report_payload({"t": summarize_dataframe(df, "t")}, [])
+    table = payload["table_summaries"][0]
+
+    assert table["healthy_columns"]["names"] == ["name"]
+    assert [item["column"] for item in table["anomalous_columns"]] == ["code", "n"]
+    assert column_anomaly_score(4, 0, 4) == 0.0
@@ -0,0 +1,33 @@
+# tests/test_sandbox.py
+import pandas as pd
+import pytest
+
+import modules.sandbox as sandbox
+from modules.sandbox import SandboxPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SandboxPool(workers=1, memory_mb=0)
+    yield pool
+    pool.shutdown()
+
+
+def test_failed_input_write_returns_worker(pool, monkeypatch):
+    def broken_write(df, shm_name=None):
+        raise OSError("공유 메모리 부족")
+
+    monkeypatch.setattr(sandbox, "write_frame", broken_write)
+    for _ in range(2):  # 워커를 돌려주지 않으면 두 번째 호출이 영원히 대기
+        with pytest.raises(OSError):
+            pool.run("df = df * 2", pd.DataFrame({"a": [1]}))
+    assert pool._idle.qsize() == 1
+
+
+def test_timeout_replaces_worker(pool):
+    result = pool.run("import time\ntime.sleep(10)", pd.DataFrame({"a": [1]}), timeout=1, cpu_seconds=None)
+    assert result.status == "timeout"
+
+    result = pool.run("df = df * 2", pd.DataFrame({"a": [1]}), timeout=60)
+    assert result.ok
+    assert result.dataframe["a"].tolist() == [2]
@@ -0,0 +1,43 @@
+# tests/test_table_history.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.table_history import TableHistory
+
+
+@pytest.fixture(params=[True, False], ids=["cow", "no-cow"])
+def copy_on_write(request):
+    with pd.option_context("mode.copy_on_write", request.param):
+        yield request.param
+
+
+def test_in_place_edits_do_not_change_history(copy_on_write):
+    df = pd.DataFrame({"a": np.arange(4), "s": list("abcd"), "i": pd.array([1, None, 3, 4], dtype="Int64")})
+    original = df.copy()
+    history = TableHistory(df)
+    doubled = history.commit(df.assign(a=df["a"] * 2), "a 두배")
+
+    undone = history.undo()
+    undone.loc[0, "a"] = -1
+    undone.loc[1, "s"] = "Z"
+    undone.loc[2, "i"] = 9
+    doubled.loc[3, "s"] = "Z"
+    df.loc[0, "s"] = "Z"
+
+    assert history.materialize(0).equals(original)
+    assert history.materialize(1).equals(original.assign(a=original["a"] * 2))
+    assert history.stats()["stored_bytes"] < history.stats()["full_copy_bytes"]
+
+
+def test_swapped_duplicate_name_columns_are_reported():
+    df = pd.DataFrame([[1, 2, 3]], columns=["x", "x", "y"])
+    history = TableHistory(df)
+
+    swapped = history.commit(df.iloc[:, [1, 0, 2]], "x 자리 바꿈")
+    assert history.current_version.summary() == "수정 x, x"
+    assert swapped.values.tolist() == [[2, 1, 3]]
+    assert history.stats()["columns"] == 3  # 값은 그대로라 새로 저장하지 않음
+
+    history.commit(swapped[["y", "x"]], "순서 변경")
+    assert history.current_version.summary() == "컬럼 순서 변경"
@@ -0,0 +1,50 @@
+# tests/test_table_store.py
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from modules.export_archive import archive_key, build_archive
+from modules.exporters import export_filename
+from modules.table_history import TableHistory
+from modules.table_store import TableStore
+
+
+def _frame(seed: int, rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"a": rng.integers(0, 100, rows), "b": rng.random(rows).astype(str)})
+
+
+def test_export_reads_spilled_tables_without_restoring(tmp_path):
+    tables = {f"t{i}": _frame(i) for i in range(3)}
+    store = TableStore(tables, session_bytes=1, spill_dir=str(tmp_path))
+    assert store.stats()["spilled"] == 2
+
+    assert archive_key(store, "csv") == archive_key(tables, "csv")
+    with zipfile.ZipFile(build_archive(store, "csv")) as zf:
+        for name, df in tables.items():
+            exported = pd.read_csv(io.BytesIO(zf.read(export_filename(name, "csv"))))
+            assert exported["a"].tolist() == df["a"].tolist()
+    assert store.stats()["spilled"] == 2
+    assert store.loads == 0
+
+
+def test_history_bytes_count_toward_budget(tmp_path):
+    df = _frame(0)
+    store = TableStore({"t": df, "other": _frame(1)}, spill_dir=str(tmp_path))
+    history = TableHistory(df)
+    for i in range(5):
+        store["t"] = history.commit(df.assign(a=df["a"] + i), f"a + {i}")
+    store.attach_history("t", history)
+
+    stats = store.stats()
+    assert stats["history_bytes"] == history.stats()["stored_bytes"]
+    assert stats["resident_bytes"] == stats["history_bytes"] + sum(e.nbytes for e in store._entries.values())
+
+    # 한도를 낮추면 테이블을 먼저 스필하고, 그래도 넘으면 오래된 버전부터 정리
+    store.session_bytes = history.stats()["stored_bytes"] // 2
+    store._enforce()
+    assert not store.is_resident("other") and not store.is_resident("t")
+    assert store.resident_bytes() <= store.session_bytes or len(history.versions()) == 1
+    assert store["t"].equals(history.current())
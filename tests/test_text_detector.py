@@ -0,0 +1,56 @@
+# tests/test_text_detector.py
+import io
+
+from modules.loader import parse_file_to_df
+from modules.text_detector import SAMPLE_BYTES, detect_text_format
+
+
+def _ascii_head_then(tail: bytes) -> bytes:
+    rows = "".join(f"{i},abc\n" for i in range(SAMPLE_BYTES // 8))
+    return ("id,name\n" + rows).encode() + tail
+
+
+class CountingReader(io.BytesIO):
+    """read()로 읽은 바이트 수를 기록하는 파일 대역"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_detection_reads_only_the_sample():
+    f = CountingReader(_ascii_head_then("99999,홍길동\n".encode("cp949")))
+    assert detect_text_format(f).encoding == "utf-8"
+    assert f.bytes_read == SAMPLE_BYTES
+
+
+def test_encoding_retried_past_sample():
+    data = _ascii_head_then("99999,홍길동\n".encode("cp949"))
+    assert len(data) > SAMPLE_BYTES
+    df = parse_file_to_df(io.BytesIO(data), "late_cp949.csv")
+    assert df is not None
+    assert df.iloc[-1].tolist() == [99999, "홍길동"]
+
+
+def test_utf8_file_keeps_utf8():
+    data = _ascii_head_then("99999,홍길동\n".encode("utf-8"))
+    assert detect_text_format(io.BytesIO(data)).encoding == "utf-8"
+
+
+def test_numeric_looking_header_is_kept():
+    df = parse_file_to_df(io.BytesIO(b"2023,2024\n1,2\n3,4\n"), "years.csv")
+    assert list(df.columns) == ["2023", "2024"]
+    assert len(df) == 2
+
+
+def test_headerless_file_gets_string_column_names():
+    data = b"kim,30,seoul\nlee,25,busan\npark,40,daegu\n"
+    assert not detect_text_format(io.BytesIO(data)).has_header
+    df = parse_file_to_df(io.BytesIO(data), "people.csv")
+    assert list(df.columns) == ["column_1", "column_2", "column_3"]
+    assert df["column_1"].tolist() == ["kim", "lee", "park"]